@@ -0,0 +1,279 @@
+import os
+
+import librosa
+import numpy as np
+
+from audio_loader import load_audio
+from feature_cache import FeatureCache, file_key
+from instrumentation import count, span
+
+## @package audio_features
+#  Gürültü azaltma ve MFCC öznitelik çıkarma fonksiyonları
+#
+#  Eğitim betiği (main.py) ve paralel toplu çıkarma (batch_extract.py) aynı
+#  fonksiyonları kullanır; bu modül içe aktarıldığında eğitim çalışmaz.
+#
+#  Öznitelik vektörünün içeriği bir FeatureSpec ile tanımlanır (MFCC sayısı,
+#  türev derecesi, havuzlama istatistikleri). Tanım öznitelik parametrelerinin
+#  bir parçası olarak model dosyasına yazılır; tahmin tarafı aynı tanımı model
+#  dosyasından okuduğu için eğitim ve tahmin öznitelikleri birbirinden
+#  ayrışamaz.
+
+# Öznitelik parametreleri (önbellek anahtarının ve model dosyasının parçasıdır)
+# Tüm sesler eğitimde ve tahminde bu kanonik orana yeniden örneklenir.
+SAMPLE_RATE = int(os.environ.get("SES_SAMPLE_RATE", "22050"))
+RES_TYPE = 'soxr_hq'
+TOP_DB = 30
+N_MFCC = 10
+
+# Parametre kaydı olmayan eski model dosyaları (model, scaler) bu ayarlarla eğitilmiştir
+LEGACY_FEATURE_PARAMS = {'sample_rate': 22050, 'res_type': 'kaiser_fast', 'top_db': 30, 'n_mfcc': 10}
+
+# Öznitelik vektörleri için disk önbelleği
+feature_cache = FeatureCache()
+
+# Türevler librosa.feature.delta ile aynı Savitzky-Golay penceresiyle hesaplanır
+DELTA_WIDTH = 9
+
+
+## Öznitelik vektörünün bildirimsel tanımı
+#
+#  MFCC matrisi bir kez hesaplanır; istenen türevler aynı matristen alınıp
+#  alt alta eklenir ve tüm havuzlama istatistikleri bu birleşik matris
+#  üzerinde tek geçişte hesaplanır. Çıktı, pooling sırasıyla her istatistiğin
+#  (katsayı, türev) değerlerinin art arda eklenmesidir. Varsayılan tanım
+#  (10 MFCC, türev yok, yalnızca ortalama) eski modellerin öznitelikleridir.
+class FeatureSpec:
+    STATISTICS = ('mean', 'std', 'min', 'max')
+
+    ## @param n_mfcc MFCC katsayı sayısı
+    #  @param deltas Türev derecesi: 0 (yok), 1 (delta) veya 2 (delta ve delta-delta)
+    #  @param pooling Havuzlama istatistikleri: 'mean', 'std', 'min', 'max' veya yüzdelik ('p10', 'p90'...)
+    def __init__(self, n_mfcc=N_MFCC, deltas=0, pooling=('mean',)):
+        if deltas not in (0, 1, 2):
+            raise ValueError(f"Türev derecesi 0, 1 veya 2 olmalı: {deltas}")
+        pooling = tuple(pooling)
+        if not pooling:
+            raise ValueError("En az bir havuzlama istatistiği gerekli")
+        for name in pooling:
+            if name not in self.STATISTICS and not _percentile(name):
+                raise ValueError(f"Bilinmeyen havuzlama istatistiği: {name}")
+        self.n_mfcc = int(n_mfcc)
+        self.deltas = int(deltas)
+        self.pooling = pooling
+
+    ## Öznitelik parametrelerinden (model dosyası) tanımı okur
+    #  Tanım alanları olmayan eski parametreler varsayılan tanıma karşılık gelir.
+    @classmethod
+    def from_params(cls, params):
+        params = params or {}
+        return cls(params.get('n_mfcc', N_MFCC), params.get('deltas', 0), params.get('pooling', ('mean',)))
+
+    ## Virgülle ayrılmış havuzlama listesinden tanım oluşturur (ör. "mean,std,p10,p90")
+    @classmethod
+    def parse(cls, pooling, n_mfcc=N_MFCC, deltas=0):
+        return cls(n_mfcc, deltas, [name.strip() for name in pooling.split(',') if name.strip()])
+
+    ## Model dosyasına ve önbellek anahtarına yazılan alanlar
+    def params(self):
+        return {'n_mfcc': self.n_mfcc, 'deltas': self.deltas, 'pooling': list(self.pooling)}
+
+    ## Öznitelik vektörünün boyutu
+    @property
+    def dim(self):
+        return self.n_mfcc * (1 + self.deltas) * len(self.pooling)
+
+    def __eq__(self, other):
+        return isinstance(other, FeatureSpec) and self.params() == other.params()
+
+    def __hash__(self):
+        return hash((self.n_mfcc, self.deltas, self.pooling))
+
+    def __repr__(self):
+        return f"FeatureSpec(n_mfcc={self.n_mfcc}, deltas={self.deltas}, pooling={self.pooling})"
+
+    ## MFCC matrisinden öznitelik vektörünü hesaplar
+    #  @param mfcc (n_mfcc, çerçeve) boyutlu MFCC matrisi
+    #  @return dim uzunluğunda öznitelik vektörü
+    def pool(self, mfcc):
+        # (çerçeve, kanal) düzeninde: her istatistik tek bir eksen indirgemesidir
+        frames = mfcc[:self.n_mfcc].T
+        if self.deltas:
+            frames = np.hstack([frames] + [_delta(frames, order) for order in range(1, self.deltas + 1)])
+        percentiles = [_percentile(name) for name in self.pooling if _percentile(name)]
+        # Tüm yüzdelikler tek bir sıralamayla hesaplanır
+        quantiles = dict(zip(percentiles, np.percentile(frames, percentiles, axis=0))) if percentiles else {}
+        parts = []
+        for name in self.pooling:
+            if name == 'mean':
+                parts.append(np.mean(frames, axis=0))
+            elif name == 'std':
+                parts.append(np.std(frames, axis=0))
+            elif name == 'min':
+                parts.append(np.min(frames, axis=0))
+            elif name == 'max':
+                parts.append(np.max(frames, axis=0))
+            else:
+                parts.append(quantiles[_percentile(name)])
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+
+def _percentile(name):
+    if len(name) > 1 and name[0] == 'p' and name[1:].replace('.', '', 1).isdigit():
+        value = float(name[1:])
+        return value if 0 <= value <= 100 else None
+    return None
+
+
+## Zaman eksenindeki türev; çerçeve sayısı pencereden kısaysa pencere daraltılır
+def _delta(frames, order):
+    n_frames = frames.shape[0]
+    width = min(DELTA_WIDTH, n_frames if n_frames % 2 else n_frames - 1)
+    if width <= order:
+        return np.zeros_like(frames)
+    return librosa.feature.delta(frames, width=width, order=order, axis=0)
+
+
+DEFAULT_SPEC = FeatureSpec()
+
+
+## Model dosyasına kaydedilen öznitelik parametreleri
+#  @param spec Öznitelik tanımı (None ise DEFAULT_SPEC)
+def feature_params(sample_rate=SAMPLE_RATE, spec=None):
+    return {'sample_rate': sample_rate, 'res_type': RES_TYPE, 'top_db': TOP_DB,
+            **(spec or DEFAULT_SPEC).params()}
+
+
+## Model dosyasındaki öznitelik parametreleri
+#  @param artifact joblib ile yüklenen (model, scaler[, parametreler]) demeti
+def artifact_feature_params(artifact):
+    return dict(artifact[2]) if len(artifact) > 2 else dict(LEGACY_FEATURE_PARAMS)
+
+
+## Gürültü azaltma için bir fonksiyon
+#  @param audio Ses verisi
+#  @param sr Örnekleme oranı
+#  @return Gürültüsü azaltılmış ses verisi
+def reduce_noise(audio, sr):
+    with span("reduce_noise"):
+        return librosa.effects.remix(audio, intervals=librosa.effects.split(audio, top_db=TOP_DB))
+
+
+## Bir ses kaydının spektral analizi
+#
+#  Güç spektrogramı ve mel filtre bankası çıktısı klip başına bir kez
+#  hesaplanır; MFCC vektörü ve dB ölçekli mel spektrogramı bunlardan türetilir.
+class SpectralAnalysis:
+    def __init__(self, audio, sample_rate, n_fft=2048, hop_length=512, n_mels=128):
+        self.audio = audio
+        self.sample_rate = sample_rate
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.n_mels = n_mels
+        self._power = None
+        self._mel = None
+
+    ## Güç spektrogramı |STFT|^2
+    @property
+    def power(self):
+        if self._power is None:
+            self._power = np.abs(librosa.stft(self.audio, n_fft=self.n_fft, hop_length=self.hop_length)) ** 2
+        return self._power
+
+    ## Mel spektrogramı (güç ölçeğinde)
+    @property
+    def mel(self):
+        if self._mel is None:
+            self._mel = librosa.feature.melspectrogram(S=self.power, sr=self.sample_rate, n_mels=self.n_mels)
+        return self._mel
+
+    ## MFCC matrisi; librosa.feature.mfcc(y=...) ile aynı sonucu verir
+    def mfcc(self, n_mfcc=N_MFCC):
+        return librosa.feature.mfcc(S=librosa.power_to_db(self.mel), n_mfcc=n_mfcc)
+
+    ## Zaman ekseninde ortalaması alınmış MFCC öznitelik vektörü
+    def mfcc_mean(self, n_mfcc=N_MFCC):
+        return self.features(FeatureSpec(n_mfcc))
+
+    ## Tanıma göre öznitelik vektörü (MFCC matrisi bir kez hesaplanır)
+    #  @param spec Öznitelik tanımı (None ise DEFAULT_SPEC)
+    def features(self, spec=None):
+        spec = spec or DEFAULT_SPEC
+        # STFT ve mel spektrogramı ilk kullanımda hesaplandığı için bu aşamaya dahildir
+        with span("mfcc"):
+            return spec.pool(self.mfcc(spec.n_mfcc))
+
+    ## Çizim için en yüksek değere göre dB ölçekli mel spektrogramı
+    def mel_db(self):
+        return librosa.power_to_db(self.mel, ref=np.max)
+
+
+## Gürültüsü azaltılmış ses için spektral analiz nesnesi oluşturur
+#  @param audio Ses verisi
+#  @param sample_rate Örnekleme oranı
+#  @return SpectralAnalysis nesnesi
+def analyze_audio(audio, sample_rate):
+    return SpectralAnalysis(reduce_noise(audio, sample_rate), sample_rate)
+
+
+## Dosyadan öznitelik çıkartır, hata durumunda istisna fırlatır
+#  @param file_path Ses dosyasının yolu
+#  @param sample_rate Sesin yeniden örnekleneceği oran (modelin eğitildiği oran)
+#  @param spec Öznitelik tanımı (None ise DEFAULT_SPEC)
+#  @return Öznitelik vektörü, spektral analiz nesnesi, örnekleme oranı
+#  Öznitelikler önbellekte varsa ses çözülmez ve analiz nesnesi None döner.
+def load_features(file_path, sample_rate=SAMPLE_RATE, spec=None):
+    key = file_key(file_path, feature_params(sample_rate, spec))
+    mfccs_mean = feature_cache.get(key)
+    if mfccs_mean is not None:
+        count("feature_cache.hit")
+        return mfccs_mean, None, sample_rate
+    count("feature_cache.miss")
+    audio, sample_rate = load_audio(file_path, sample_rate)
+    analysis = analyze_audio(audio, sample_rate)
+    mfccs_mean = analysis.features(spec)
+    feature_cache.put(key, mfccs_mean)
+    return mfccs_mean, analysis, sample_rate
+
+
+## Öznitelik çıkartmak için bir fonksiyon
+#  @param file_path Ses dosyasının yolu
+#  @param spec Öznitelik tanımı (None ise DEFAULT_SPEC)
+#  @return Öznitelik vektörü, ses verisi, örnekleme oranı
+def extract_features(file_path, spec=None):
+    try:
+        mfccs_mean, analysis, sample_rate = load_features(file_path, spec=spec)
+        return mfccs_mean, analysis.audio if analysis is not None else None, sample_rate
+    except Exception as e:
+        print(f"Error encountered while parsing file: {file_path}")
+        return None, None, None
+
+
+## Bellekteki ses verisinden öznitelik çıkartır
+#  @param audio Ses verisi
+#  @param sample_rate Örnekleme oranı
+#  @param spec Öznitelik tanımı (None ise DEFAULT_SPEC)
+#  @return Öznitelik vektörü
+def extract_features_from_audio(audio, sample_rate, spec=None):
+    try:
+        # Bellekteki sesler tekrar gelmediği için disk önbelleğine yazılmaz
+        return analyze_audio(audio, sample_rate).features(spec)
+    except Exception as e:
+        print("Error encountered while extracting features from audio")
+        return None
+
+
+## Öznitelik vektörünü ve çizimlerde kullanılacak analiz nesnesini birlikte döndürür
+#  @param audio Ses verisi
+#  @param sample_rate Örnekleme oranı
+#  @param spec Öznitelik tanımı (None ise DEFAULT_SPEC)
+#  @return Öznitelik vektörü ve SpectralAnalysis nesnesi (hata durumunda None, None)
+def extract_features_and_analysis(audio, sample_rate, spec=None):
+    try:
+        analysis = analyze_audio(audio, sample_rate)
+        # Bellekteki sesler (mikrofon, yüklenen dosya, servis istekleri) tekrar gelmediği için
+        # disk önbelleğine yazılmaz; önbellek dosya tabanlı çıkarma (eğitim, toplu işler) içindir
+        return analysis.features(spec), analysis
+    except Exception as e:
+        print("Error encountered while extracting features from audio")
+        return None, None
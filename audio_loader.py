@@ -0,0 +1,186 @@
+import struct
+
+import numpy as np
+
+from instrumentation import timed
+
+## @package audio_loader
+#  Kanonik örnekleme oranında, sınırlı bellekle ses yükleme
+#
+#  PCM ve float WAV dosyaları belleğe eşlenir (np.memmap) ve parça parça
+#  okunur; diğer biçimler soundfile ile bloklar hâlinde çözülür. Her parça
+#  tek kanala indirilip soxr akış yeniden örnekleyicisinden geçirilir ve
+#  önceden ayrılmış çıktı dizisine yazılır. Özgün orandaki sinyalin tamamı
+#  hiçbir zaman belleğe alınmaz; tepe bellek çıktı dizisi ile bir parçadır.
+
+# Parça başına özgün orandaki kare sayısı
+CHUNK_FRAMES = 1 << 16
+# soxr kalitesi (librosa'nın varsayılan 'soxr_hq' yeniden örneklemesiyle aynı)
+RESAMPLE_QUALITY = 'HQ'
+
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_IEEE_FLOAT = 0x0003
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+# (biçim, örnek başına bayt) -> numpy veri tipi; 8 ve 24 bit soundfile ile çözülür
+_WAV_DTYPES = {
+    (_WAVE_FORMAT_PCM, 2): '<i2',
+    (_WAVE_FORMAT_PCM, 4): '<i4',
+    (_WAVE_FORMAT_IEEE_FLOAT, 4): '<f4',
+    (_WAVE_FORMAT_IEEE_FLOAT, 8): '<f8',
+}
+
+
+## WAV başlığını okur
+#  @param f İkili kipte açılmış dosya nesnesi
+#  @return (örnekleme oranı, kanal sayısı, veri tipi, veri ofseti, kare sayısı); desteklenmiyorsa None
+def _wav_layout(f):
+    f.seek(0, 2)
+    file_size = f.tell()
+    f.seek(0)
+    header = f.read(12)
+    if len(header) < 12 or header[:4] != b'RIFF' or header[8:12] != b'WAVE':
+        return None
+    fmt = None
+    while True:
+        chunk = f.read(8)
+        if len(chunk) < 8:
+            return None
+        chunk_id, size = struct.unpack('<4sI', chunk)
+        if chunk_id == b'fmt ':
+            data = f.read(size + (size & 1))
+            tag, channels, sample_rate = struct.unpack('<HHI', data[:8])
+            block_align, bits = struct.unpack('<HH', data[12:16])
+            if tag == _WAVE_FORMAT_EXTENSIBLE and len(data) >= 26:
+                tag = struct.unpack('<H', data[24:26])[0]
+            fmt = (tag, channels, sample_rate, block_align, bits)
+        elif chunk_id == b'data':
+            if fmt is None:
+                return None
+            tag, channels, sample_rate, block_align, bits = fmt
+            dtype = _WAV_DTYPES.get((tag, bits // 8))
+            if dtype is None or block_align != channels * (bits // 8):
+                return None
+            offset = f.tell()
+            # Akış sırasında yazılan dosyalarda boyut alanı hatalı olabilir
+            frames = min(size, file_size - offset) // block_align
+            return sample_rate, channels, np.dtype(dtype), offset, frames
+        else:
+            f.seek(size + (size & 1), 1)
+
+
+## WAV verisini kopyalamadan (kare, kanal) boyutlu dizi olarak açar
+#  @param file Dosya yolu veya bellekteki dosya nesnesi (ör. Streamlit yüklemesi)
+#  @return (dizi, örnekleme oranı); biçim desteklenmiyorsa (None, None)
+def open_wav(file):
+    if isinstance(file, (str, bytes)) or hasattr(file, '__fspath__'):
+        with open(file, 'rb') as f:
+            layout = _wav_layout(f)
+        if layout is None:
+            return None, None
+        sample_rate, channels, dtype, offset, frames = layout
+        if frames == 0:
+            return np.zeros((0, channels), dtype=dtype), sample_rate
+        return np.memmap(file, dtype=dtype, mode='r', offset=offset, shape=(frames, channels)), sample_rate
+    if hasattr(file, 'getbuffer'):
+        file.seek(0)
+        layout = _wav_layout(file)
+        file.seek(0)
+        if layout is None:
+            return None, None
+        sample_rate, channels, dtype, offset, frames = layout
+        data = np.frombuffer(file.getbuffer(), dtype=dtype, count=frames * channels, offset=offset)
+        return data.reshape(frames, channels), sample_rate
+    return None, None
+
+
+def _to_mono_float(block):
+    if block.dtype.kind == 'i':
+        block = block.astype(np.float32) * np.float32(1.0 / (1 << (8 * block.dtype.itemsize - 1)))
+    else:
+        block = block.astype(np.float32, copy=False)
+    return block.mean(axis=1, dtype=np.float32) if block.shape[1] > 1 else block[:, 0]
+
+
+def _array_blocks(array, chunk_frames):
+    for start in range(0, len(array), chunk_frames):
+        yield _to_mono_float(array[start:start + chunk_frames])
+
+
+def _soundfile_blocks(f, chunk_frames):
+    with f:
+        for block in f.blocks(blocksize=chunk_frames, dtype='float32', always_2d=True):
+            yield _to_mono_float(block)
+
+
+## Dosyayı özgün oranında tek kanallı float32 parçalar hâlinde açar
+#  @return (örnekleme oranı, kare sayısı, parça üreteci)
+def _open_native(file, chunk_frames):
+    array, sample_rate = open_wav(file)
+    if array is not None:
+        return sample_rate, len(array), _array_blocks(array, chunk_frames)
+
+    import soundfile as sf
+
+    if hasattr(file, 'seek'):
+        file.seek(0)
+    try:
+        f = sf.SoundFile(file)
+    except (sf.LibsndfileError, RuntimeError):
+        # soundfile'ın çözemediği biçimler (ör. m4a) audioread ile bir kerede çözülür
+        import librosa
+
+        if hasattr(file, 'seek'):
+            file.seek(0)
+        audio, sample_rate = librosa.load(file, sr=None, mono=True)
+        return sample_rate, len(audio), _array_blocks(audio[:, np.newaxis], chunk_frames)
+    return f.samplerate, f.frames, _soundfile_blocks(f, chunk_frames)
+
+
+## Sesi parça parça çözen ve hedef orana akış hâlinde yeniden örnekleyen okuyucu
+class AudioStream:
+    ## @param file Dosya yolu veya dosya nesnesi
+    #  @param sample_rate Hedef örnekleme oranı (None ise özgün oran)
+    #  @param chunk_frames Parça başına özgün orandaki kare sayısı
+    def __init__(self, file, sample_rate=None, chunk_frames=CHUNK_FRAMES):
+        self.native_rate, self.native_frames, self._blocks = _open_native(file, chunk_frames)
+        self.sample_rate = int(sample_rate or self.native_rate)
+
+    ## Hedef orandaki tahmini kare sayısı
+    @property
+    def frames(self):
+        return -(-self.native_frames * self.sample_rate // self.native_rate)
+
+    ## Hedef orandaki tek kanallı float32 parçaları üretir
+    def __iter__(self):
+        if self.sample_rate == self.native_rate:
+            yield from self._blocks
+            return
+
+        import soxr
+
+        resampler = soxr.ResampleStream(self.native_rate, self.sample_rate, 1, dtype='float32',
+                                        quality=RESAMPLE_QUALITY)
+        for block in self._blocks:
+            out = resampler.resample_chunk(block)
+            if len(out):
+                yield out
+        tail = resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True)
+        if len(tail):
+            yield tail
+
+
+## Sesi kanonik örnekleme oranında tek kanallı float32 dizi olarak yükler
+#  @param file Dosya yolu veya dosya nesnesi
+#  @param sample_rate Hedef örnekleme oranı (None ise özgün oran)
+#  @return Ses verisi, örnekleme oranı
+@timed("decode")
+def load_audio(file, sample_rate=None, chunk_frames=CHUNK_FRAMES):
+    stream = AudioStream(file, sample_rate, chunk_frames)
+    audio = np.empty(stream.frames, dtype=np.float32)
+    filled = 0
+    for block in stream:
+        if filled + len(block) > len(audio):
+            audio = np.resize(audio, filled + len(block))
+        audio[filled:filled + len(block)] = block
+        filled += len(block)
+    return audio[:filled], stream.sample_rate
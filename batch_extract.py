@@ -0,0 +1,108 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from audio_features import SAMPLE_RATE, load_features
+
+## @package batch_extract
+#  Ekransız (headless) paralel toplu öznitelik çıkarma
+#
+#  Dosyalar bir süreç havuzuna dağıtılır, sonuçlar girdi sırasıyla döner.
+#  Hatalı dosyalar ekrana yazılmak yerine bir rapora eklenir. Çizim modu:
+#  "off" (çizim yok), "file" (PNG dosyalarına yaz), "show" (ekranda göster,
+#  yalnızca seri çalışır).
+
+PLOT_MODES = ("off", "file", "show")
+
+
+def _plot_paths(plot_dir, index, file_path):
+    name = f"{index:05d}_{os.path.splitext(os.path.basename(file_path))[0]}"
+    return (os.path.join(plot_dir, name + "_histogram.png"),
+            os.path.join(plot_dir, name + "_mel.png"))
+
+
+def _plot(features, analysis, label, file_path, index, plots, plot_dir):
+    if plots == "file":
+        import matplotlib
+        matplotlib.use("Agg")
+    from plotting import plot_histogram, plot_mel_spectrogram
+
+    histogram_path, mel_path = _plot_paths(plot_dir, index, file_path) if plots == "file" else (None, None)
+    plot_histogram(features, label, save_path=histogram_path)
+    # Önbellekten gelen kayıtlarda ses çözülmediği için spektrogram çizilmez
+    if analysis is not None:
+        plot_mel_spectrogram(analysis, file_path, save_path=mel_path)
+
+
+## Dosyadan öznitelik çıkartır, hatayı istisna yerine mesaj olarak döndürür
+#  (süreç havuzunda çalışır; yalnızca öznitelik vektörü geri taşınır)
+#  @param sample_rate Sesin yeniden örnekleneceği oran
+#  @param spec Öznitelik tanımı (None ise DEFAULT_SPEC)
+#  @return (öznitelik vektörü, hata mesajı)
+def safe_load_features(file_path, sample_rate=SAMPLE_RATE, spec=None):
+    try:
+        features, _, _ = load_features(file_path, sample_rate, spec)
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+    return features, None
+
+
+## Tek bir dosyayı işler (süreç havuzunda çalışır)
+#  @return (sıra, öznitelik vektörü, hata mesajı)
+def _extract_one(task):
+    index, file_path, label, plots, plot_dir, spec = task
+    if plots == "off":
+        return (index,) + safe_load_features(file_path, spec=spec)
+    try:
+        features, analysis, _ = load_features(file_path, spec=spec)
+    except Exception as e:
+        return index, None, f"{type(e).__name__}: {e}"
+    try:
+        _plot(features, analysis, label, file_path, index, plots, plot_dir)
+    except Exception as e:
+        return index, features, f"plot: {type(e).__name__}: {e}"
+    return index, features, None
+
+
+## Dosya listesinden paralel öznitelik çıkarma
+#  @param file_paths Ses dosyalarının yolları
+#  @param labels Her dosyanın konuşmacı etiketi
+#  @param workers İşçi süreç sayısı (None ise çekirdek sayısı)
+#  @param plots Çizim modu: "off", "file" veya "show"
+#  @param plot_dir "file" modunda grafiklerin yazılacağı dizin
+#  @param report_path Verilirse hata raporu bu JSON dosyasına yazılır
+#  @param spec Öznitelik tanımı (None ise DEFAULT_SPEC)
+#  @return (sonuçlar, rapor); sonuçlar girdi sırasıyla (dosya, etiket, öznitelik) üçlüleridir
+def extract_batch(file_paths, labels, workers=None, plots="off", plot_dir="plots", report_path=None,
+                  spec=None):
+    if plots not in PLOT_MODES:
+        raise ValueError(f"Geçersiz çizim modu: {plots}")
+    if plots == "file":
+        os.makedirs(plot_dir, exist_ok=True)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if plots == "show":
+        workers = 1
+
+    tasks = [(index, file_path, label, plots, plot_dir, spec)
+             for index, (file_path, label) in enumerate(zip(file_paths, labels))]
+    if workers <= 1 or len(tasks) <= 1:
+        outputs = [_extract_one(task) for task in tasks]
+    else:
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            outputs = list(executor.map(_extract_one, tasks, chunksize=chunksize))
+
+    results = []
+    report = []
+    for (index, features, error), (_, file_path, label, _, _, _) in zip(outputs, tasks):
+        if error is not None:
+            report.append({"index": index, "file": file_path, "label": label, "error": error})
+        if features is not None:
+            results.append((file_path, label, features))
+
+    if report_path is not None:
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump({"total": len(tasks), "succeeded": len(results), "failures": report},
+                      f, ensure_ascii=False, indent=2)
+    return results, report
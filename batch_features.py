@@ -0,0 +1,147 @@
+import librosa
+import numpy as np
+import scipy.fftpack
+
+from audio_features import N_MFCC, TOP_DB
+
+## @package batch_features
+#  Birçok klip için vektörize gürültü azaltma ve MFCC çıkarma
+#
+#  Klipler sıfırla doldurulmuş 2 boyutlu bir dizi ve uzunluk vektörü olarak
+#  verilir. Sessizlik maskeleri, STFT'ler ve maskeli MFCC ortalamaları tüm
+#  toplu iş için tek seferde NumPy işlemleriyle hesaplanır. Sonuçlar klip
+#  başına extract_features_from_audio ile sayısal olarak eşdeğerdir:
+#  librosa.effects.split'in çerçeve enerjisi eşiği, remix'in sıfır geçişine
+#  hizalanması ve mfcc'nin power_to_db(top_db=80) kırpması klip başına
+#  aynen uygulanır.
+
+N_FFT = 2048
+HOP_LENGTH = 512
+N_MELS = 128
+
+
+## Klip listesini sıfırla doldurulmuş 2 boyutlu diziye çevirir
+#  @param clips Bir boyutlu ses dizileri
+#  @return (toplu dizi, uzunluklar)
+def pad_batch(clips, dtype=np.float32):
+    lengths = np.array([len(clip) for clip in clips], dtype=np.int64)
+    batch = np.zeros((len(clips), lengths.max() if len(clips) else 0), dtype=dtype)
+    for row, clip in zip(batch, clips):
+        row[:len(clip)] = clip
+    return batch, lengths
+
+
+## Çerçeve başına ortalama enerji (center=True çerçeveleme ile aynı)
+#  Pencereler kopyalanmaz: enerji, karelerin kümülatif toplamının çerçeve
+#  sınırlarındaki farkıdır. Kareler doldurulmuş tek bir float64 diziye yazılıp
+#  yerinde toplanır; ek bellek girdinin iki katı kadardır.
+def _frame_energy(batch, frame_length, hop_length):
+    n_rows, width = batch.shape
+    # center=True ile aynı: her iki yana frame_length // 2 sıfır, başa kümülatif toplam için bir sıfır
+    cumulative = np.zeros((n_rows, width + 2 * (frame_length // 2) + 1))
+    np.square(batch, out=cumulative[:, 1 + frame_length // 2:1 + frame_length // 2 + width], dtype=np.float64)
+    np.cumsum(cumulative, axis=1, out=cumulative)
+    starts = np.arange(0, cumulative.shape[1] - frame_length, hop_length)
+    return (cumulative[:, starts + frame_length] - cumulative[:, starts]) / frame_length
+
+
+## Klip başına sessiz olmayan çerçeve maskesi (librosa.effects.split ile aynı)
+def _nonsilent_frames(batch, lengths, top_db):
+    mse = _frame_energy(batch, N_FFT, HOP_LENGTH)
+    n_frames = 1 + lengths // HOP_LENGTH
+    valid = np.arange(mse.shape[1])[None, :] < n_frames[:, None]
+    ref = np.max(np.where(valid, mse, 0), axis=1, keepdims=True)
+    db = 10.0 * np.log10(np.maximum(1e-10, mse)) - 10.0 * np.log10(np.maximum(1e-10, ref))
+    return (db > -top_db) & valid
+
+
+## Klip başına sıfır geçişi olayları; son sütun klip sonunu temsil eder
+def _zero_crossing_events(batch, lengths):
+    n_rows, width = batch.shape
+    thresholded = np.where(np.abs(batch) <= 1e-10, 0, batch)
+    signs = np.signbit(thresholded)
+    events = np.zeros((n_rows, width + 1), dtype=bool)
+    events[:, 0] = True
+    events[:, 1:width] = signs[:, 1:] != signs[:, :-1]
+    positions = np.arange(width + 1)[None, :]
+    events &= positions < lengths[:, None]
+    events[np.arange(n_rows), lengths] = True
+    return events
+
+
+## Sessizlik kırpma maskesini ve kırpılmış klipleri hesaplar
+#  @param batch (klip, örnek) boyutlu toplu ses dizisi
+#  @param lengths Klip uzunlukları
+#  @param top_db Sessizlik eşiği (dB)
+#  @return (kırpılmış toplu dizi, yeni uzunluklar, örnek maskesi)
+def trim_silence_batch(batch, lengths, top_db=TOP_DB):
+    batch = np.asarray(batch)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    n_rows, width = batch.shape
+    nonsilent = _nonsilent_frames(batch, lengths, top_db)
+
+    # Aralık sınırları: çerçeve durumunun değiştiği noktalar (örnek cinsinden, klip sonuna kırpılmış)
+    edges = np.diff(np.pad(nonsilent.astype(np.int8), ((0, 0), (1, 1))), axis=1)
+    start_rows, start_frames = np.nonzero(edges == 1)
+    end_rows, end_frames = np.nonzero(edges == -1)
+    starts = np.minimum(start_frames * HOP_LENGTH, lengths[start_rows])
+    ends = np.minimum(end_frames * HOP_LENGTH, lengths[end_rows])
+
+    # remix(align_zeros=True): her sınırı en yakın sıfır geçişine taşı, eşitlikte sağdakini seç
+    events = _zero_crossing_events(batch, lengths)
+    positions = np.arange(width + 1)
+    next_zero = np.minimum.accumulate(np.where(events, positions, width + 1)[:, ::-1], axis=1)[:, ::-1]
+    prev_zero = np.maximum.accumulate(np.where(events, positions, -1), axis=1)
+    prev_zero = np.pad(prev_zero[:, :-1], ((0, 0), (1, 0)), constant_values=-1)
+
+    def snap(rows, points):
+        after = next_zero[rows, points]
+        before = prev_zero[rows, points]
+        use_before = (before >= 0) & (points - before < after - points)
+        return np.where(use_before, before, after)
+
+    coverage = np.zeros((n_rows, width + 1), dtype=np.int32)
+    np.add.at(coverage, (start_rows, snap(start_rows, starts)), 1)
+    np.add.at(coverage, (end_rows, snap(end_rows, ends)), -1)
+    mask = np.cumsum(coverage, axis=1)[:, :width] > 0
+
+    # Korunan örnekleri sırası bozulmadan sola yasla
+    order = np.argsort(~mask, axis=1, kind='stable')
+    trimmed = np.take_along_axis(batch, order, axis=1)
+    new_lengths = mask.sum(axis=1)
+    trimmed[np.arange(width)[None, :] >= new_lengths[:, None]] = 0
+    return trimmed, new_lengths, mask
+
+
+## Kırpılmış klipler için maskeli MFCC ortalamaları
+#  @param batch Sola yaslanmış, sıfırla doldurulmuş toplu ses dizisi
+#  @param lengths Klip uzunlukları
+#  @return (klip, n_mfcc) boyutlu öznitelik matrisi; boş klipler NaN
+def mfcc_mean_batch(batch, lengths, sample_rate, n_mfcc=N_MFCC):
+    lengths = np.asarray(lengths, dtype=np.int64)
+    power = np.abs(librosa.stft(batch, n_fft=N_FFT, hop_length=HOP_LENGTH)) ** 2
+    mel = librosa.feature.melspectrogram(S=power, sr=sample_rate, n_mels=N_MELS)
+
+    n_frames = 1 + lengths // HOP_LENGTH
+    valid = np.arange(mel.shape[-1])[None, :] < n_frames[:, None]
+
+    # power_to_db(ref=1.0, top_db=80): kırpma eşiği klip başına geçerli çerçevelerden hesaplanır
+    log_mel = 10.0 * np.log10(np.maximum(1e-10, mel))
+    peak = np.max(np.where(valid[:, None, :], log_mel, -np.inf), axis=(1, 2))
+    log_mel = np.maximum(log_mel, (peak - 80.0)[:, None, None])
+
+    mfccs = scipy.fftpack.dct(log_mel, axis=-2, type=2, norm='ortho')[:, :n_mfcc, :]
+    means = np.sum(mfccs * valid[:, None, :], axis=-1) / n_frames[:, None]
+    means[lengths == 0] = np.nan
+    return means
+
+
+## Toplu iş için gürültü azaltma + MFCC ortalaması
+#  @param audio_batch (klip, örnek) boyutlu, sıfırla doldurulmuş ses dizisi
+#  @param lengths Klip uzunlukları
+#  @param sample_rate Örnekleme oranı (tüm klipler için ortak)
+#  @return (klip, n_mfcc) boyutlu öznitelik matrisi
+def extract_features_batch(audio_batch, lengths, sample_rate, n_mfcc=N_MFCC, top_db=TOP_DB):
+    trimmed, new_lengths, _ = trim_silence_batch(audio_batch, lengths, top_db=top_db)
+    width = max(int(new_lengths.max()) if len(new_lengths) else 0, 1)
+    return mfcc_mean_batch(trimmed[:, :width], new_lengths, sample_rate, n_mfcc=n_mfcc)
@@ -0,0 +1,159 @@
+import argparse
+import csv
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from audio_features import FeatureSpec
+from batch_extract import safe_load_features
+from compact_model import load_artifact
+
+## @package batch_score
+#  Dizinler veya dosya listeleri üzerinde toplu konuşmacı tahmini
+#
+#  Model bir kez yüklenir, öznitelikler süreç havuzunda paralel çıkarılır ve
+#  her toplu iş için tek bir scaler.transform + predict + decision_function
+#  çağrısı yapılır. Sonuçlar JSONL dosyasına akış hâlinde yazılır; çıktıda
+#  zaten bulunan dosyalar atlandığı için yarıda kalan işler ucuzca devam
+#  ettirilebilir. Çıktıda her dosyanın tek kaydı vardır: --retry-failed
+#  hatalı kayıtları yeni sonuçlar eklenmeden önce çıktıdan siler.
+#
+#  Kullanım: python batch_score.py ARSIV_DIZINI --output sonuclar.jsonl
+
+AUDIO_EXTENSIONS = ('.wav', '.mp3', '.m4a', '.flac', '.ogg')
+
+
+## Dizindeki ses dosyalarını (alt dizinler dahil) sıralı olarak listeler
+def iter_directory(directory, extensions=AUDIO_EXTENSIONS):
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(extensions):
+                yield os.path.join(root, name)
+
+
+## Dosya listesini (her satırda bir yol veya CSV'nin ilk sütunu) okur
+def iter_manifest(manifest_path):
+    with open(manifest_path, newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            if row and row[0].strip() and not row[0].startswith('#'):
+                yield row[0].strip()
+
+
+## Girdi bir dizinse dizini, dosyaysa listeyi tarar
+def iter_inputs(source):
+    return iter_directory(source) if os.path.isdir(source) else iter_manifest(source)
+
+
+## Çıktıda zaten bulunan dosyaları okur; yarım kalmış son satırı kırpar
+#  @param retry_failed True ise hatalı kayıtlar çıktıdan silinir (dosya atomik olarak yeniden
+#         yazılır) ve bu dosyalar tekrar işlenir; böylece her dosyanın tek bir kaydı olur
+def load_completed(output_path, retry_failed=False):
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path, 'rb+') as f:
+        data = f.read()
+        if data and not data.endswith(b'\n'):
+            f.truncate(data.rfind(b'\n') + 1)
+            data = data[:data.rfind(b'\n') + 1]
+    kept = []
+    for line in data.splitlines():
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if retry_failed and 'error' in record:
+            continue
+        completed.add(record['file'])
+        kept.append(line)
+    if retry_failed and len(kept) != len(data.splitlines()):
+        _rewrite(output_path, kept)
+    return completed
+
+
+def _rewrite(output_path, lines):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(output_path)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.writelines(line + b'\n' for line in lines)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _batches(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+## Bir toplu işin özniteliklerini sınıflandırır ve JSONL kayıtlarını üretir
+def score_batch(model, scaler, file_paths, outputs):
+    records = []
+    scores_by_file = {}
+    scored = [(path, features) for path, (features, _) in zip(file_paths, outputs) if features is not None]
+    if scored:
+        X = scaler.transform(np.vstack([features for _, features in scored]))
+        predictions = model.predict(X)
+        decisions = model.decision_function(X)
+        classes = [str(label) for label in model.classes_]
+        for (path, _), prediction, decision in zip(scored, predictions, decisions):
+            if np.ndim(decision) == 0:
+                scores = {'score': float(decision)}
+            else:
+                scores = {label: float(value) for label, value in zip(classes, decision)}
+            scores_by_file[path] = {'file': path, 'speaker': str(prediction), 'scores': scores}
+    for path, (features, error) in zip(file_paths, outputs):
+        records.append(scores_by_file[path] if features is not None else {'file': path, 'error': error})
+    return records
+
+
+## Toplu tahmin işini çalıştırır
+#  @return (işlenen dosya sayısı, girdide olup çıktıda zaten bulunduğu için atlanan dosya sayısı)
+def run(source, output_path, model_path='VoiceRecognizeModel.joblib', workers=None,
+        batch_size=256, retry_failed=False):
+    model, scaler, params = load_artifact(model_path)
+    # Öznitelikler modelin eğitildiği oranda ve tanımla çıkarılır
+    load = partial(safe_load_features, sample_rate=params['sample_rate'], spec=FeatureSpec.from_params(params))
+    completed = load_completed(output_path, retry_failed)
+    inputs = list(iter_inputs(source))
+    pending = [path for path in inputs if path not in completed]
+    workers = workers or os.cpu_count() or 1
+
+    processed = 0
+    with open(output_path, 'a', encoding='utf-8') as out, \
+            ProcessPoolExecutor(max_workers=workers) as executor:
+        for batch in _batches(pending, batch_size):
+            chunksize = max(1, len(batch) // (workers * 4))
+            outputs = list(executor.map(load, batch, chunksize=chunksize))
+            for record in score_batch(model, scaler, batch, outputs):
+                out.write(json.dumps(record, ensure_ascii=False) + '\n')
+            out.flush()
+            processed += len(batch)
+    return processed, len(inputs) - len(pending)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ses dosyaları için toplu konuşmacı tahmini")
+    parser.add_argument("source", help="Ses dosyalarının bulunduğu dizin veya dosya listesi (txt/csv)")
+    parser.add_argument("--output", default="scores.jsonl", help="Sonuçların yazılacağı JSONL dosyası")
+    parser.add_argument("--model", default="VoiceRecognizeModel.joblib", help="Model dosyası")
+    parser.add_argument("--workers", type=int, default=None, help="İşçi süreç sayısı")
+    parser.add_argument("--batch-size", type=int, default=256, help="Toplu iş başına dosya sayısı")
+    parser.add_argument("--retry-failed", action="store_true", help="Önceki çalıştırmada hata veren dosyaları tekrar dene")
+    args = parser.parse_args()
+
+    processed, skipped = run(args.source, args.output, args.model, args.workers,
+                             args.batch_size, args.retry_failed)
+    print(f"İşlenen dosya: {processed}, önceden tamamlanmış: {skipped}")
@@ -0,0 +1,343 @@
+import argparse
+import itertools
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+
+import audio_features
+from audio_features import N_MFCC, analyze_audio, load_features, reduce_noise
+from feature_cache import FeatureCache
+
+## @package benchmark
+#  Ses → öznitelik → tahmin sıcak yolları için performans ölçümü
+#
+#  Belirlenen uzunluk ve örnekleme oranlarında deterministik sentetik konuşma
+#  benzeri ses üretilir; her aşama tekrar tekrar çalıştırılarak p50/p95
+#  gecikme ve çıktı hızı (işlenen ses saniyesi / duvar saati saniyesi veya
+#  çağrı/sn) ölçülür. Sonuçlar, sürümler arasında karşılaştırılabilmesi için
+#  ortam bilgisiyle birlikte JSON dosyasına yazılır.
+#
+#  Kullanım:
+#    python benchmark.py --durations 1 5 30 --output bench.json
+#    python benchmark.py --output yeni.json --compare bench.json
+
+STAGES = ("reduce_noise", "features", "features_cached", "predict", "predict_batch", "predict_compact",
+          "predict_compact_batch", "spectrogram", "emotion")
+DEFAULT_DURATIONS = (1.0, 5.0, 30.0)
+DEFAULT_SAMPLE_RATES = (audio_features.SAMPLE_RATE,)
+
+_EMOTION_TEXTS = [
+    "Bugün harika bir gün, çok mutluyum.",
+    "I am really disappointed with how the meeting went.",
+    "This is the best news I have heard all year!",
+    "Sunum beklediğimden uzun sürdü ama sonuç iyiydi.",
+]
+
+
+## Konuşmaya benzeyen sentetik ses üretir
+#  Hece benzeri genlik zarflı harmonik tonlar, aralarda sessizlik ve düşük
+#  seviyeli gürültü içerir; böylece reduce_noise gerçekçi miktarda kırpma yapar.
+#  @param seconds Süre (saniye)
+#  @param sample_rate Örnekleme oranı
+#  @param seed Rastgelelik tohumu (aynı tohum aynı sesi üretir)
+def synthetic_audio(seconds, sample_rate, seed=0):
+    rng = np.random.default_rng(seed)
+    n = int(seconds * sample_rate)
+    audio = rng.normal(0, 1e-3, n).astype(np.float32)
+    position = 0
+    while position < n:
+        length = int(rng.uniform(0.15, 0.4) * sample_rate)
+        t = np.arange(min(length, n - position)) / sample_rate
+        f0 = rng.uniform(90, 250)
+        syllable = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 6))
+        envelope = np.sin(np.pi * t / (length / sample_rate)) ** 2
+        audio[position:position + len(t)] += (rng.uniform(0.1, 0.5) * envelope * syllable).astype(np.float32)
+        position += length + int(rng.uniform(0.02, 0.3) * sample_rate)
+    return audio
+
+
+## Fonksiyonu tekrar tekrar çalıştırıp süre istatistiklerini döndürür
+#  @param fn Ölçülecek fonksiyon
+#  @param repeat Ölçülen çalıştırma sayısı
+#  @param warmup Ölçülmeyen ısınma çalıştırması sayısı (JIT, önbellekler)
+#  @param setup Her çalıştırmadan önce çağrılan, süreye dahil edilmeyen fonksiyon
+def measure(fn, repeat=20, warmup=2, setup=None):
+    for _ in range(warmup):
+        if setup is not None:
+            setup()
+        fn()
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    timings = np.array(timings)
+    return {
+        'runs': repeat,
+        'mean_ms': float(timings.mean() * 1000),
+        'p50_ms': float(np.percentile(timings, 50) * 1000),
+        'p95_ms': float(np.percentile(timings, 95) * 1000),
+        'min_ms': float(timings.min() * 1000),
+    }
+
+
+def _with_throughput(stats, seconds=None, items=1):
+    p50 = stats['p50_ms'] / 1000
+    if seconds is not None:
+        # Gerçek zamandan kaç kat hızlı (ses saniyesi / işlem saniyesi)
+        stats['realtime_factor'] = seconds / p50 if p50 > 0 else float('inf')
+    stats['items_per_s'] = items / p50 if p50 > 0 else float('inf')
+    return stats
+
+
+## Ölçümde kullanılan SVC modeli ve scaler (sentetik konuşmacı öznitelikleriyle eğitilir)
+def _synthetic_model(n_speakers=4, clips_per_speaker=8, seed=0):
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.svm import SVC
+
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(0, 20, (n_speakers, N_MFCC))
+    X = np.vstack([center + rng.normal(0, 5, (clips_per_speaker, N_MFCC)) for center in centers])
+    y = np.repeat([f"konusmaci{i + 1}" for i in range(n_speakers)], clips_per_speaker)
+    scaler = StandardScaler().fit(X)
+    return SVC(kernel='linear').fit(scaler.transform(X), y), scaler, X
+
+
+def _emotion_batcher():
+    try:
+        import transformers  # noqa: F401
+    except ImportError:
+        return None, "transformers yüklü değil"
+    import model_registry
+
+    return model_registry.get("emotion_batcher"), None
+
+
+def _bench_reduce_noise(audio, sample_rate, repeat, warmup, context):
+    return measure(lambda: reduce_noise(audio, sample_rate), repeat, warmup)
+
+
+def _bench_features(audio, sample_rate, repeat, warmup, context):
+    return measure(lambda: analyze_audio(audio, sample_rate).features(), repeat, warmup)
+
+
+def _bench_features_cached(audio, sample_rate, repeat, warmup, context):
+    import soundfile as sf
+    # Önbellek isabetinin maliyeti: dosya özeti + önbellekten okuma (ses çözülmez)
+    path = os.path.join(context['work_dir'], f"features_{sample_rate}_{len(audio)}.wav")
+    sf.write(path, audio, sample_rate)
+    load_features(path, sample_rate)
+    return measure(lambda: load_features(path, sample_rate), repeat, warmup)
+
+
+def _bench_spectrogram(audio, sample_rate, repeat, warmup, context):
+    import matplotlib
+    matplotlib.use("Agg")
+    from plotting import plot_mel_spectrogram
+
+    # Arayüzdeki gibi mel spektrogramı öznitelik çıkarırken hesaplanmıştır;
+    # ölçülen kısım dB dönüşümü ve PNG'ye çizimdir
+    analysis = analyze_audio(audio, sample_rate)
+    analysis.mel  # mel spektrogramını önceden hesapla
+    path = os.path.join(context['work_dir'], "mel.png")
+    return measure(lambda: plot_mel_spectrogram(analysis, "benchmark", save_path=path), repeat, warmup)
+
+
+def _bench_predict(repeat, warmup, context):
+    model, scaler, X = context['model']
+    features = X[:1]
+    return measure(lambda: (model.predict(scaler.transform(features)),
+                            model.decision_function(scaler.transform(features))), repeat, warmup)
+
+
+def _bench_predict_batch(repeat, warmup, context, batch_size=256):
+    model, scaler, X = context['model']
+    features = np.resize(X, (batch_size, X.shape[1]))
+    return measure(lambda: (model.predict(scaler.transform(features)),
+                            model.decision_function(scaler.transform(features))), repeat, warmup)
+
+
+def _bench_emotion(repeat, warmup, context):
+    batcher, reason = _emotion_batcher()
+    if batcher is None:
+        return None, reason
+    counter = itertools.count()
+    text = [None]
+
+    # Önbelleğe düşmemesi için her çalıştırmada farklı bir metin sınıflandırılır
+    def next_text():
+        i = next(counter)
+        text[0] = f"{_EMOTION_TEXTS[i % len(_EMOTION_TEXTS)]} ({i})"
+
+    return measure(lambda: batcher.classify(text[0]), repeat, warmup, setup=next_text), None
+
+
+def _bench_predict_compact(repeat, warmup, context, batch_size=1):
+    from compact_model import LinearPredictor
+
+    model, scaler, X = context['model']
+    predictor = LinearPredictor.from_sklearn(model, scaler)
+    features = np.resize(X, (batch_size, X.shape[1]))
+    return measure(lambda: (predictor.predict(features), predictor.decision_function(features)), repeat, warmup)
+
+
+def _bench_predict_compact_batch(repeat, warmup, context):
+    return _bench_predict_compact(repeat, warmup, context, batch_size=256)
+
+
+_AUDIO_STAGES = {
+    "reduce_noise": _bench_reduce_noise,
+    "features": _bench_features,
+    "features_cached": _bench_features_cached,
+    "spectrogram": _bench_spectrogram,
+}
+_MODEL_STAGES = {
+    "predict": (_bench_predict, 1),
+    "predict_batch": (_bench_predict_batch, 256),
+    "predict_compact": (_bench_predict_compact, 1),
+    "predict_compact_batch": (_bench_predict_compact_batch, 256),
+}
+
+
+## Seçilen aşamaları ölçer
+#  @param stages Ölçülecek aşamalar (STAGES alt kümesi)
+#  @param durations Sentetik ses süreleri (saniye)
+#  @param sample_rates Örnekleme oranları
+#  @return Sonuç kayıtları listesi
+def run(stages=STAGES, durations=DEFAULT_DURATIONS, sample_rates=DEFAULT_SAMPLE_RATES, repeat=20, warmup=2,
+        seed=0, log=print):
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        raise ValueError(f"Bilinmeyen aşama: {', '.join(sorted(unknown))}")
+    results = []
+    original_cache = audio_features.feature_cache
+    with tempfile.TemporaryDirectory(prefix="ses-benchmark-") as work_dir:
+        # Ölçüm kullanıcının öznitelik önbelleğini kirletmemeli
+        audio_features.feature_cache = FeatureCache(os.path.join(work_dir, "cache"))
+        context = {'work_dir': work_dir}
+        try:
+            for sample_rate in sample_rates:
+                for seconds in durations:
+                    audio = synthetic_audio(seconds, sample_rate, seed)
+                    for stage in stages:
+                        if stage in _AUDIO_STAGES:
+                            stats = _AUDIO_STAGES[stage](audio, sample_rate, repeat, warmup, context)
+                            results.append(_record(stage, seconds, sample_rate, stats))
+                            log(_format(results[-1]))
+            for stage in stages:
+                if stage in _MODEL_STAGES:
+                    if 'model' not in context:
+                        context['model'] = _synthetic_model(seed=seed)
+                    bench, items = _MODEL_STAGES[stage]
+                    results.append(_record(stage, None, None, bench(repeat, warmup, context), items=items))
+                elif stage == "emotion":
+                    stats, reason = _bench_emotion(repeat, warmup, context)
+                    results.append(_record(stage, None, None, stats) if stats is not None
+                                   else {'stage': stage, 'skipped': reason})
+                else:
+                    continue
+                log(_format(results[-1]))
+        finally:
+            audio_features.feature_cache = original_cache
+    return results
+
+
+def _record(stage, seconds, sample_rate, stats, items=1):
+    record = {'stage': stage, 'duration_s': seconds, 'sample_rate': sample_rate}
+    record.update(_with_throughput(stats, seconds, items))
+    return record
+
+
+def _format(record):
+    if 'skipped' in record:
+        return f"{record['stage']:<16} atlandı: {record['skipped']}"
+    label = record['stage']
+    if record['duration_s'] is not None:
+        label += f" {record['duration_s']:g}s@{record['sample_rate']}"
+    line = f"{label:<32} p50 {record['p50_ms']:9.2f} ms  p95 {record['p95_ms']:9.2f} ms"
+    if 'realtime_factor' in record:
+        line += f"  {record['realtime_factor']:8.1f}x gerçek zaman"
+    else:
+        line += f"  {record['items_per_s']:10.1f} öğe/sn"
+    return line
+
+
+## Sonuçların yorumlanabilmesi için ortam bilgisi
+def environment():
+    import librosa
+    import sklearn
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    return {
+        'commit': commit or None,
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'librosa': librosa.__version__,
+        'sklearn': sklearn.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+## İki ölçümü karşılaştırır
+#  @param current Yeni ölçüm sonuçları
+#  @param baseline Karşılaştırılacak eski sonuçlar
+#  @param threshold p50 oranı bunu aşarsa gerileme sayılır
+#  @return (aşama etiketi, eski p50, yeni p50, oran, gerileme mi) listesi
+def compare(current, baseline, threshold=1.10):
+    def key(record):
+        return record['stage'], record.get('duration_s'), record.get('sample_rate')
+
+    old = {key(record): record for record in baseline if 'p50_ms' in record}
+    rows = []
+    for record in current:
+        if 'p50_ms' not in record or key(record) not in old:
+            continue
+        ratio = record['p50_ms'] / old[key(record)]['p50_ms']
+        rows.append((key(record), old[key(record)]['p50_ms'], record['p50_ms'], ratio, ratio > threshold))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ses tanıma sıcak yollarının performans ölçümü")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES), help="Ölçülecek aşamalar")
+    parser.add_argument("--durations", nargs="+", type=float, default=list(DEFAULT_DURATIONS),
+                        help="Sentetik ses süreleri (saniye)")
+    parser.add_argument("--sample-rates", nargs="+", type=int, default=list(DEFAULT_SAMPLE_RATES),
+                        help="Örnekleme oranları")
+    parser.add_argument("--repeat", type=int, default=20, help="Aşama başına ölçülen çalıştırma sayısı")
+    parser.add_argument("--warmup", type=int, default=2, help="Ölçülmeyen ısınma çalıştırması sayısı")
+    parser.add_argument("--seed", type=int, default=0, help="Sentetik ses tohumu")
+    parser.add_argument("--output", default="benchmark_results.json", help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--compare", default=None, metavar="JSON", help="Karşılaştırılacak önceki sonuç dosyası")
+    parser.add_argument("--threshold", type=float, default=1.10,
+                        help="p50 bu oranda yavaşlarsa gerileme sayılır (varsayılan: 1.10)")
+    args = parser.parse_args()
+
+    results = run(args.stages, args.durations, args.sample_rates, args.repeat, args.warmup, args.seed)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'environment': environment(), 'results': results}, f, ensure_ascii=False, indent=2)
+    print(f"Sonuçlar yazıldı: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        rows = compare(results, baseline, args.threshold)
+        for (stage, seconds, sample_rate), old_ms, new_ms, ratio, regressed in rows:
+            label = stage if seconds is None else f"{stage} {seconds:g}s@{sample_rate}"
+            print(f"{label:<32} {old_ms:9.2f} -> {new_ms:9.2f} ms  x{ratio:.2f}{'  GERİLEME' if regressed else ''}")
+        if any(row[-1] for row in rows):
+            raise SystemExit(1)
@@ -0,0 +1,224 @@
+import json
+import os
+import struct
+import sys
+import tempfile
+
+import numpy as np
+
+## @package compact_model
+#  Ölçekleyicisi ağırlıklara katlanmış, belleğe eşlenebilir doğrusal model
+#
+#  Doğrusal çekirdekli SVC (veya SGDClassifier, LinearSVC gibi doğrusal
+#  sınıflandırıcılar) ve öznitelik başına doğrusal ölçekleyici
+#  (StandardScaler, RobustScaler, MinMaxScaler...) tek bir ağırlık matrisine
+#  indirgenir: w·(s ⊙ x + c) + b = (w ⊙ s)·x + (b + w·c). Ağırlıklar
+#  float32 olarak, başlıkta (JSON) öznitelik parametreleri, etiketler ve
+#  sürüm bilgisiyle birlikte yazılır. Tahmin yalnızca NumPy ile, tek bir
+#  matris çarpımı ve birebir (one-vs-one, SVC) oylamayla ya da bire-karşı-hepsi
+#  (one-vs-rest) en yüksek skorla yapılır; sklearn veya pickle gerekmez ve
+#  dosya np.memmap ile kopyalanmadan açılır.
+#
+#  Dosya düzeni: MAGIC | uint32 sürüm | uint32 başlık uzunluğu | JSON başlık |
+#  (ALIGN baytlık hizalanmış) float32 diziler.
+#
+#  Dönüştürme: python compact_model.py VoiceRecognizeModel.joblib
+
+MAGIC = b"SESMODEL"
+FORMAT_VERSION = 1
+ALIGN = 64
+_PREFIX = struct.Struct("<8sII")
+
+
+## joblib model dosyasının yanındaki küçük model dosyasının yolu
+def compact_path(model_path):
+    return os.path.splitext(model_path)[0] + '.compact.bin'
+
+
+## Ölçekleme ağırlıklara katlandığı için girdiyi değiştirmeyen ölçekleyici
+#  ((model, scaler) arayüzünü bekleyen kodla uyumluluk için)
+class FoldedScaler:
+    def transform(self, X):
+        return np.asarray(X, dtype=np.float32)
+
+
+class LinearPredictor:
+    ## @param weights (sınıflandırıcı, öznitelik) boyutlu katlanmış ağırlıklar
+    #  @param bias Sınıflandırıcı başına sabit terim
+    #  @param labels Sınıf etiketleri (sklearn classes_ sırasıyla)
+    #  @param feature_params Modelin eğitildiği öznitelik parametreleri
+    #  @param scheme 'ovo' (SVC birebir oylama) veya 'ovr' (sınıf başına bir skor)
+    def __init__(self, weights, bias, labels, feature_params=None, scheme='ovo'):
+        if scheme not in ('ovo', 'ovr'):
+            raise ValueError(f"Bilinmeyen çok sınıflı şema: {scheme}")
+        self.weights = weights
+        self.bias = bias
+        self.labels = np.asarray(labels)
+        self.feature_params = dict(feature_params or {})
+        self.scheme = scheme
+        n_classes = len(self.labels)
+        # Birebir sınıflandırıcıların (i, j) sırası sklearn/libsvm ile aynıdır
+        pairs = [(i, j) for i in range(n_classes) for j in range(i + 1, n_classes)]
+        # Oylama ve güven toplamları için (sınıflandırıcı, sınıf) gösterim matrisleri
+        self._first = np.zeros((len(pairs), n_classes), dtype=np.float32)
+        self._second = np.zeros((len(pairs), n_classes), dtype=np.float32)
+        for k, (i, j) in enumerate(pairs):
+            self._first[k, i] = 1
+            self._second[k, j] = 1
+        expected = 1 if n_classes == 2 else len(pairs) if scheme == 'ovo' else n_classes
+        if weights.shape[0] != expected or len(bias) != expected:
+            raise ValueError(f"{n_classes} sınıf için {expected} sınıflandırıcı beklenirken {weights.shape[0]} bulundu")
+
+    ## Doğrusal sınıflandırıcı ve ölçekleyiciden katlanmış model oluşturur
+    #  @param scaler Öznitelik başına doğrusal dönüşüm yapan ölçekleyici (None ise ölçekleme yok)
+    @classmethod
+    def from_sklearn(cls, model, scaler=None, feature_params=None):
+        if getattr(model, 'kernel', 'linear') != 'linear' or not hasattr(model, 'coef_'):
+            raise ValueError("Yalnızca doğrusal çekirdekli modeller dışa aktarılabilir")
+        # libsvm tabanlı SVC birebir, diğer doğrusal sınıflandırıcılar bire-karşı-hepsi çalışır
+        scheme = 'ovo' if hasattr(model, 'dual_coef_') else 'ovr'
+        weights = np.asarray(model.coef_, dtype=np.float64)
+        bias = np.asarray(model.intercept_, dtype=np.float64)
+        if scaler is not None:
+            # Dönüşüm s ⊙ x + c biçimindedir; s ve c sıfır ve birim girdilerden okunur
+            n_features = weights.shape[1]
+            offset = np.asarray(scaler.transform(np.zeros((1, n_features))), dtype=np.float64)[0]
+            scale = np.asarray(scaler.transform(np.ones((1, n_features))), dtype=np.float64)[0] - offset
+            bias = bias + weights @ offset
+            weights = weights * scale
+        return cls(weights.astype(np.float32), bias.astype(np.float32), model.classes_, feature_params, scheme)
+
+    @property
+    def classes_(self):
+        return self.labels
+
+    ## Birebir sınıflandırıcıların ham skorları, (sorgu, sınıflandırıcı) boyutlu
+    def pairwise_scores(self, X):
+        X = np.asarray(X, dtype=np.float32).reshape(-1, self.weights.shape[1])
+        return X @ self.weights.T + self.bias
+
+    ## sklearn SVC.decision_function ile aynı biçimde skorlar
+    #  (iki sınıfta bir boyutlu, aksi hâlde oylar + normalize güvenler)
+    def decision_function(self, X):
+        scores = self.pairwise_scores(X)
+        if len(self.labels) == 2:
+            return scores[:, 0]
+        if self.scheme == 'ovr':
+            return scores
+        votes, confidences = self._votes(scores)
+        return votes + confidences / (3 * (np.abs(confidences) + 1))
+
+    ## En çok oy alan (ovr: en yüksek skorlu) sınıf (eşitlikte küçük indeks, libsvm gibi)
+    def predict(self, X):
+        scores = self.pairwise_scores(X)
+        if len(self.labels) == 2:
+            return self.labels[(scores[:, 0] > 0).astype(np.intp)]
+        if self.scheme == 'ovr':
+            return self.labels[np.argmax(scores, axis=1)]
+        votes, _ = self._votes(scores)
+        return self.labels[np.argmax(votes, axis=1)]
+
+    def _votes(self, scores):
+        positive = (scores > 0).astype(np.float32)
+        votes = positive @ self._first + (1 - positive) @ self._second
+        confidences = scores @ (self._first - self._second)
+        return votes, confidences
+
+    ## Modeli atomik olarak dosyaya yazar
+    def save(self, path):
+        arrays = {'weights': np.ascontiguousarray(self.weights, dtype='<f4'),
+                  'bias': np.ascontiguousarray(self.bias, dtype='<f4')}
+        header = {
+            'version': FORMAT_VERSION,
+            'kind': f'linear_{self.scheme}',
+            'labels': [str(label) for label in self.labels],
+            'feature_params': self.feature_params,
+            'arrays': {},
+        }
+        # Ofsetler başlık uzunluğuna bağlı olduğundan başlık sabitlenene kadar yeniden hesaplanır
+        header_size = 0
+        while True:
+            offset = _align(_PREFIX.size + header_size)
+            for name, array in arrays.items():
+                header['arrays'][name] = {'offset': offset, 'shape': list(array.shape), 'dtype': '<f4'}
+                offset = _align(offset + array.nbytes)
+            encoded = json.dumps(header, ensure_ascii=False).encode('utf-8')
+            if len(encoded) == header_size:
+                break
+            header_size = len(encoded)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, len(encoded)))
+                f.write(encoded)
+                for name, array in arrays.items():
+                    f.write(b"\0" * (header['arrays'][name]['offset'] - f.tell()))
+                    f.write(array.tobytes())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    ## Dosyayı açar; ağırlıklar kopyalanmadan belleğe eşlenir
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            magic, version, header_size = _PREFIX.unpack(f.read(_PREFIX.size))
+            if magic != MAGIC:
+                raise ValueError(f"Geçersiz model dosyası: {path}")
+            if version > FORMAT_VERSION:
+                raise ValueError(f"Desteklenmeyen model dosyası sürümü: {version}")
+            header = json.loads(f.read(header_size).decode('utf-8'))
+        arrays = {name: np.memmap(path, dtype=spec['dtype'], mode='r', offset=spec['offset'],
+                                  shape=tuple(spec['shape']))
+                  for name, spec in header['arrays'].items()}
+        scheme = header.get('kind', 'linear_ovo').rsplit('_', 1)[-1]
+        return cls(arrays['weights'], arrays['bias'], header['labels'], header.get('feature_params'), scheme)
+
+
+def _align(offset):
+    return -(-offset // ALIGN) * ALIGN
+
+
+## Model dosyasını (model, scaler, öznitelik parametreleri) olarak yükler
+#  Küçük model dosyası varsa ve joblib dosyasından eski değilse o kullanılır;
+#  bu durumda sklearn içe aktarılmaz.
+#  @param model_path joblib model dosyası (veya doğrudan küçük model dosyası)
+def load_artifact(model_path):
+    path = model_path if model_path.endswith('.compact.bin') else compact_path(model_path)
+    if os.path.exists(path) and (path == model_path or not os.path.exists(model_path)
+                                 or os.path.getmtime(path) >= os.path.getmtime(model_path)):
+        predictor = LinearPredictor.load(path)
+        return predictor, FoldedScaler(), predictor.feature_params
+
+    import joblib
+    from audio_features import artifact_feature_params
+
+    artifact = joblib.load(model_path)
+    return artifact[0], artifact[1], artifact_feature_params(artifact)
+
+
+## Eğitilmiş modeli küçük biçimde dışa aktarır (doğrusal olmayan modellerde bir şey yazmaz)
+#  @return Yazılan dosya yolu veya None
+def export(model, scaler, feature_params, model_path):
+    try:
+        predictor = LinearPredictor.from_sklearn(model, scaler, feature_params)
+    except ValueError:
+        return None
+    path = compact_path(model_path)
+    predictor.save(path)
+    return path
+
+
+if __name__ == "__main__":
+    import joblib
+    from audio_features import artifact_feature_params
+
+    source = sys.argv[1] if len(sys.argv) > 1 else 'VoiceRecognizeModel.joblib'
+    artifact = joblib.load(source)
+    path = export(artifact[0], artifact[1], artifact_feature_params(artifact), source)
+    if path is None:
+        raise SystemExit("Model doğrusal değil; küçük model dosyası oluşturulamadı")
+    print(f"{path}: {os.path.getsize(path)} bayt (joblib: {os.path.getsize(source)} bayt)")
@@ -0,0 +1,202 @@
+import contextlib
+import csv
+import fnmatch
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from audio_features import SAMPLE_RATE
+from batch_extract import safe_load_features
+from batch_score import iter_directory
+
+## @package dataset
+#  Konuşmacı dizinlerinden veya CSV listesinden veri seti ve bellek dışı eğitim
+#
+#  Veri seti (dosya, etiket) çiftlerinden oluşur: bir kök dizin altındaki her
+#  alt dizin bir konuşmacıdır (speaker1/, speaker4/ ...) veya CSV dosyasının
+#  her satırı "yol,etiket" içerir. Öznitelikler sabit boyutlu parçalar hâlinde
+#  süreç havuzunda çıkarılır; bellekte aynı anda yalnızca bir parçanın
+#  öznitelikleri bulunur. Bellek dışı eğitimde ölçekleyici ilk geçişte
+#  StandardScaler.partial_fit ile, doğrusal SVM (SGDClassifier, hinge kaybı)
+#  sonraki turlarda partial_fit ile karıştırılmış parçalar üzerinde eğitilir.
+#  Tekrar geçişlerde öznitelikler disk önbelleğinden gelir, ses yeniden
+#  çözülmez. Bellekte yalnızca dosya yolları ve etiketler tutulur.
+
+DEFAULT_CHUNK_SIZE = 1024
+DEFAULT_EPOCHS = 5
+DEFAULT_VALIDATION = 0.1
+# Süreç havuzuna tek seferde gönderilen dosya sayısı
+_MAP_CHUNKSIZE = 8
+
+
+## Kök dizindeki her alt dizini bir konuşmacı olarak tarar
+#  @param root Kök dizin
+#  @param pattern Yalnızca adı bu kalıba uyan alt dizinler (ör. "speaker*"); None ise hepsi
+#  @return (dosya, etiket) üreteci; etiket alt dizinin adıdır
+def scan_directory(root, pattern=None):
+    for name in sorted(os.listdir(root)):
+        speaker_dir = os.path.join(root, name)
+        if not os.path.isdir(speaker_dir) or name.startswith('.'):
+            continue
+        if pattern is not None and not fnmatch.fnmatch(name, pattern):
+            continue
+        for file_path in iter_directory(speaker_dir):
+            yield file_path, name
+
+
+## CSV listesini okur: her satırda "yol,etiket"; göreli yollar listenin dizinine göre çözülür
+#  İlk satır "path,label" başlığı olabilir; boş ve # ile başlayan satırlar atlanır.
+def read_manifest(manifest_path):
+    base = os.path.dirname(os.path.abspath(manifest_path))
+    with open(manifest_path, newline='', encoding='utf-8') as f:
+        for line, row in enumerate(csv.reader(f), start=1):
+            if not row or not row[0].strip() or row[0].startswith('#'):
+                continue
+            if line == 1 and row[0].strip().lower() in ('path', 'file', 'dosya'):
+                continue
+            if len(row) < 2 or not row[1].strip():
+                raise ValueError(f"{manifest_path}:{line}: etiket sütunu eksik")
+            yield os.path.join(base, row[0].strip()), row[1].strip()
+
+
+## Kaynak bir dizinse konuşmacı dizinlerini, dosyaysa CSV listesini okur
+def iter_entries(source, pattern=None):
+    return scan_directory(source, pattern) if os.path.isdir(source) else read_manifest(source)
+
+
+## (dosya, etiket) çiftlerini parça parça özniteliklere çevirir
+#  @param entries (dosya, etiket) çiftleri
+#  @param executor Süreç havuzu (None ise seri çalışır)
+#  @return (X, y, hatalar) üreteci; hatalar (dosya, hata mesajı) listesidir
+def iter_feature_chunks(entries, chunk_size=DEFAULT_CHUNK_SIZE, executor=None, sample_rate=SAMPLE_RATE,
+                        spec=None):
+    load = partial(safe_load_features, sample_rate=sample_rate, spec=spec)
+    chunk = []
+    for entry in entries:
+        chunk.append(entry)
+        if len(chunk) == chunk_size:
+            yield _extract_chunk(chunk, load, executor)
+            chunk = []
+    if chunk:
+        yield _extract_chunk(chunk, load, executor)
+
+
+def _extract_chunk(chunk, load, executor):
+    paths = [path for path, _ in chunk]
+    if executor is None:
+        outputs = list(map(load, paths))
+    else:
+        outputs = list(executor.map(load, paths, chunksize=_MAP_CHUNKSIZE))
+    features = [vector for vector, _ in outputs if vector is not None]
+    labels = [label for (_, label), (vector, _) in zip(chunk, outputs) if vector is not None]
+    failures = [(path, error) for path, (vector, error) in zip(paths, outputs) if vector is None]
+    X = np.vstack(features) if features else np.zeros((0, 0))
+    return X, np.asarray(labels), failures
+
+
+## Her sınıftan verilen oranda örneği doğrulama için ayırır
+#  @return (eğitim, doğrulama) listeleri
+def split_entries(entries, validation=DEFAULT_VALIDATION, seed=0):
+    rng = np.random.default_rng(seed)
+    by_label = {}
+    for entry in entries:
+        by_label.setdefault(entry[1], []).append(entry)
+    train, held_out = [], []
+    for label in sorted(by_label):
+        items = by_label[label]
+        order = rng.permutation(len(items))
+        n_validation = int(len(items) * validation) if len(items) > 1 else 0
+        held_out.extend(items[i] for i in order[:n_validation])
+        train.extend(items[i] for i in order[n_validation:])
+    return train, held_out
+
+
+## Bellek dışı eğitim: ölçekleyici ve doğrusal SVM parça parça eğitilir
+#  @param entries (dosya, etiket) çiftleri
+#  @param epochs Eğitim turu sayısı (her tur parçaları yeniden karıştırır)
+#  @param validation Doğrulamaya ayrılan oran
+#  @param workers Öznitelik çıkarma süreç sayısı
+#  @param store Verilirse eğitim öznitelikleri bu kayıt deposunun ölçekleme istatistiklerine eklenir (EnrollmentStore)
+#  @param store_speakers True ise eğitim konuşmacıları da depoya eklenir (indeks arka ucu için)
+#  @param log İlerleme mesajlarının yazılacağı fonksiyon
+#  @return (model, scaler, rapor sözlüğü)
+def train_incremental(entries, chunk_size=DEFAULT_CHUNK_SIZE, epochs=DEFAULT_EPOCHS, validation=DEFAULT_VALIDATION,
+                      workers=None, sample_rate=SAMPLE_RATE, spec=None, seed=0, alpha=1e-4, store=None,
+                      store_speakers=False, log=print):
+    from sklearn.linear_model import SGDClassifier
+    from sklearn.metrics import classification_report, confusion_matrix
+    from sklearn.preprocessing import StandardScaler
+
+    train, held_out = split_entries(list(entries), validation, seed)
+    if not train:
+        raise ValueError("Eğitim için ses dosyası bulunamadı")
+    classes = np.array(sorted({label for _, label in train}))
+    if len(classes) < 2:
+        raise ValueError("Eğitim için en az iki konuşmacı gerekli")
+    rng = np.random.default_rng(seed)
+    scaler = StandardScaler()
+    model = SGDClassifier(loss='hinge', alpha=alpha, random_state=seed)
+    failures = {}
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+
+    def chunks(items):
+        return iter_feature_chunks(items, chunk_size, executor, sample_rate, spec)
+
+    with ProcessPoolExecutor(max_workers=workers) if workers > 1 else contextlib.nullcontext() as executor:
+        # 1. geçiş: öznitelikler çıkarılır (önbelleğe yazılır), ölçekleyici istatistikleri toplanır
+        done = 0
+        for X, y, chunk_failures in chunks(train):
+            failures.update(chunk_failures)
+            if len(X):
+                scaler.partial_fit(X)
+                if store is not None and store_speakers:
+                    for label in np.unique(y):
+                        store.add(str(label), X[y == label])
+                elif store is not None:
+                    store.observe(X)
+            done += len(X) + len(chunk_failures)
+            log(f"Öznitelik çıkarma: {done}/{len(train)} dosya")
+        if not hasattr(scaler, 'mean_'):
+            raise ValueError("Hiçbir dosyadan öznitelik çıkarılamadı")
+
+        # Sonraki turlar: karıştırılmış parçalarla SGD (öznitelikler önbellekten gelir)
+        usable = [entry for entry in train if entry[0] not in failures]
+        for epoch in range(epochs):
+            order = rng.permutation(len(usable))
+            for X, y, _ in chunks(usable[i] for i in order):
+                if len(X):
+                    model.partial_fit(scaler.transform(X), y, classes=classes)
+            log(f"Tur {epoch + 1}/{epochs} tamamlandı")
+
+        # Doğrulama: tahminler parça parça toplanır
+        y_true, y_pred = [], []
+        for X, y, chunk_failures in chunks(held_out):
+            failures.update(chunk_failures)
+            if len(X):
+                y_true.extend(y)
+                y_pred.extend(model.predict(scaler.transform(X)))
+
+    report = {
+        'n_train': len(usable),
+        'n_validation': len(y_true),
+        'class_counts': {str(label): count for label, count in sorted(Counter(label for _, label in usable).items())},
+        'epochs': epochs,
+        'chunk_size': chunk_size,
+        'seed': seed,
+        'seconds': time.perf_counter() - started,
+        'failures': [{'file': path, 'error': error} for path, error in failures.items()],
+    }
+    if y_true:
+        report['validation'] = {
+            'labels': [str(label) for label in classes],
+            'accuracy': float(np.mean(np.asarray(y_true) == np.asarray(y_pred))),
+            'classification_report': classification_report(y_true, y_pred, labels=classes, output_dict=True,
+                                                            zero_division=0),
+            'confusion_matrix': confusion_matrix(y_true, y_pred, labels=classes).tolist(),
+        }
+    return model, scaler, report
@@ -0,0 +1,88 @@
+import librosa
+import numpy as np
+
+from audio_features import DEFAULT_SPEC, RES_TYPE, extract_features_and_analysis
+from audio_loader import load_audio
+from instrumentation import span
+
+## @package decoded_audio
+#  İstek başına bir kez çözülen ses nesnesi
+#
+#  Yüklenen dosya veya mikrofon kaydı tek bir kez float32 diziye çözülür;
+#  öznitelikler, spektrogram, konuşma tanıma ve duygu analizi aynı nesneyi
+#  kullanır. Farklı örnekleme oranlarına dönüştürülmüş görünümler ve konuşma
+#  tanıma için gereken speech_recognition.AudioData nesnesi ilk kullanımda
+#  oluşturulup önbellekte tutulur.
+
+_PCM16_SCALE = np.float32(1.0 / 32768.0)
+
+
+class DecodedAudio:
+    ## @param samples Tek kanallı ses örnekleri (float32 ise kopyalanmaz)
+    #  @param sample_rate Örnekleme oranı
+    def __init__(self, samples, sample_rate, audio_data=None):
+        samples = np.asarray(samples, dtype=np.float32)
+        # Tüm tüketiciler aynı tamponu paylaştığı için salt okunur görünüm tutulur
+        self.samples = samples.view()
+        self.samples.flags.writeable = False
+        self.sample_rate = int(sample_rate)
+        self._resampled = {self.sample_rate: self.samples}
+        self._audio_data = {self.sample_rate: audio_data} if audio_data is not None else {}
+        self._features = {}
+
+    ## Dosya yolu veya dosya nesnesinden çözer
+    #  @param sample_rate Doğrudan bu orana yeniden örneklenerek çözülür (None ise özgün oran)
+    @classmethod
+    def from_file(cls, file, sample_rate=None):
+        samples, sample_rate = load_audio(file, sample_rate)
+        return cls(samples, sample_rate)
+
+    ## 16 bit PCM baytlarından tek dönüşümle float32 diziye çözer
+    @classmethod
+    def from_pcm16(cls, data, sample_rate, audio_data=None):
+        with span("decode"):
+            samples = np.frombuffer(data, dtype='<i2') * _PCM16_SCALE
+        return cls(samples, sample_rate, audio_data=audio_data)
+
+    ## speech_recognition.AudioData nesnesinden (mikrofon kaydı) çözer
+    @classmethod
+    def from_audio_data(cls, audio_data):
+        return cls.from_pcm16(audio_data.get_raw_data(convert_width=2), audio_data.sample_rate,
+                              audio_data=audio_data if audio_data.sample_width == 2 else None)
+
+    @property
+    def duration(self):
+        return len(self.samples) / self.sample_rate
+
+    ## Verilen örnekleme oranındaki görünüm (oran başına bir kez hesaplanır)
+    def resampled(self, sample_rate):
+        sample_rate = int(sample_rate)
+        if sample_rate not in self._resampled:
+            with span("resample"):
+                resampled = librosa.resample(self.samples, orig_sr=self.sample_rate, target_sr=sample_rate,
+                                             res_type=RES_TYPE)
+            resampled.flags.writeable = False
+            self._resampled[sample_rate] = resampled
+        return self._resampled[sample_rate]
+
+    ## Konuşma tanıma için AudioData (16 bit PCM); oran verilirse yeniden örneklenir
+    def audio_data(self, sample_rate=None):
+        import speech_recognition as sr
+
+        sample_rate = int(sample_rate or self.sample_rate)
+        if sample_rate not in self._audio_data:
+            pcm = np.clip(self.resampled(sample_rate), -1.0, 32767 / 32768) * 32768
+            self._audio_data[sample_rate] = sr.AudioData(pcm.astype('<i2').tobytes(), sample_rate, 2)
+        return self._audio_data[sample_rate]
+
+    ## Öznitelik vektörü ve spektral analiz nesnesi (oran ve tanım başına bir kez hesaplanır)
+    #  @param sample_rate Modelin eğitildiği örnekleme oranı (None ise sesin kendi oranı)
+    #  @param spec Modelin öznitelik tanımı (None ise DEFAULT_SPEC)
+    def features_and_analysis(self, sample_rate=None, spec=None):
+        sample_rate = int(sample_rate or self.sample_rate)
+        key = (sample_rate, spec or DEFAULT_SPEC)
+        if key not in self._features:
+            with span("features"):
+                self._features[key] = extract_features_and_analysis(self.resampled(sample_rate),
+                                                                    sample_rate, spec)
+        return self._features[key]
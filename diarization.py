@@ -0,0 +1,243 @@
+import argparse
+import collections
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from audio_features import TOP_DB, analyze_audio
+from audio_loader import AudioStream
+from batch_features import HOP_LENGTH, N_FFT
+
+## @package diarization
+#  Uzun kayıtlar için sınırlı bellekle konuşmacı zaman çizelgesi
+#
+#  Kayıt iki kez akış hâlinde okunur. İlk geçişte en yüksek çerçeve enerjisi
+#  bulunur; ikinci geçişte librosa.effects.split ile aynı eşik (en yüksek
+#  enerjiye göre top_db) uygulanarak konuşma bölgeleri çıkarılır. Her bölge
+#  (en fazla max_duration saniyelik parçalar hâlinde) süreç havuzunda
+#  eğitimdeki gibi gürültü azaltma + modelin öznitelik tanımıyla özniteliklere
+#  çevrilir ve modelle etiketlenir. Bellekte yalnızca bir okuma parçası,
+#  açık bölgenin örnekleri ve sınırlı sayıda bekleyen bölge tutulur; kayıt
+#  uzunluğundan bağımsızdır.
+#
+#  Kullanım: python diarization.py toplanti.wav --output zaman_cizelgesi.jsonl
+
+MIN_DURATION = 0.5
+MAX_DURATION = 10.0
+MERGE_GAP = 0.3
+
+
+## Akış hâlinde çerçeve enerjisi (ortalama kare), librosa'nın center=True çerçevelemesiyle aynı
+class FramePower:
+    def __init__(self, frame_length=N_FFT, hop_length=HOP_LENGTH):
+        self.frame_length = frame_length
+        self.hop_length = hop_length
+        # center=True: başa frame_length // 2 sıfır eklenir
+        self._buffer = np.zeros(frame_length // 2, dtype=np.float32)
+
+    ## Yeni örnekleri ekler
+    #  @return Tamamlanan çerçevelerin enerjileri
+    def push(self, samples):
+        self._buffer = np.concatenate([self._buffer, np.asarray(samples, dtype=np.float32)])
+        if len(self._buffer) < self.frame_length:
+            return np.zeros(0, dtype=np.float32)
+        n_frames = (len(self._buffer) - self.frame_length) // self.hop_length + 1
+        windows = np.lib.stride_tricks.sliding_window_view(self._buffer, self.frame_length)
+        power = np.mean(np.abs(windows[::self.hop_length][:n_frames]) ** 2, axis=-1)
+        self._buffer = self._buffer[n_frames * self.hop_length:]
+        return power
+
+    ## Akış sonu: sona frame_length // 2 sıfır eklenerek kalan çerçeveler hesaplanır
+    def finish(self):
+        return self.push(np.zeros(self.frame_length // 2, dtype=np.float32))
+
+
+## Kayıttaki en yüksek çerçeve enerjisi (ilk geçiş)
+def max_frame_power(blocks):
+    framer = FramePower()
+    peak = 0.0
+    for block in blocks:
+        power = framer.push(block)
+        if len(power):
+            peak = max(peak, float(power.max()))
+    power = framer.finish()
+    return max(peak, float(power.max())) if len(power) else peak
+
+
+## Konuşma bölgelerini akış hâlinde ayıran sınıf (ikinci geçiş)
+class SpeechSegmenter:
+    ## @param ref_power İlk geçişte bulunan en yüksek çerçeve enerjisi
+    #  @param sample_rate Örnekleme oranı
+    #  @param top_db Sessizlik eşiği (dB, en yüksek enerjiye göre)
+    #  @param min_duration Bundan kısa bölgeler atılır (saniye)
+    #  @param max_duration Daha uzun bölgeler bu uzunlukta parçalara bölünür (saniye)
+    #  @param merge_gap Bundan kısa sessizliklerle ayrılan bölgeler birleştirilir (saniye)
+    def __init__(self, ref_power, sample_rate, top_db=TOP_DB, min_duration=MIN_DURATION,
+                 max_duration=MAX_DURATION, merge_gap=MERGE_GAP):
+        self.ref_db = 10.0 * np.log10(max(1e-10, ref_power))
+        self.top_db = top_db
+        self.min_samples = int(min_duration * sample_rate)
+        self.max_samples = int(max_duration * sample_rate)
+        self.merge_samples = int(merge_gap * sample_rate)
+        self.hop_length = HOP_LENGTH
+        self._framer = FramePower()
+        self._frame = 0
+        self._audio = np.zeros(0, dtype=np.float32)
+        self._offset = 0  # self._audio[0]'ın kayıttaki konumu
+        self._total = 0
+        self._start = None
+        self._end = None
+
+    ## Yeni örnekleri ekler
+    #  @return Tamamlanan bölgeler: (başlangıç örneği, örnekler)
+    def push(self, samples):
+        samples = np.asarray(samples, dtype=np.float32)
+        self._audio = np.concatenate([self._audio, samples])
+        self._total += len(samples)
+        return self._process(self._framer.push(samples))
+
+    ## Akış sonu: açık bölgeyi kapatır
+    def finish(self):
+        segments = self._process(self._framer.finish())
+        if self._start is not None:
+            segments.extend(self._emit(self._start, self._end))
+            self._start = None
+        return segments
+
+    def _process(self, power):
+        db = 10.0 * np.log10(np.maximum(1e-10, power)) - self.ref_db
+        segments = []
+        for nonsilent in db > -self.top_db:
+            frame_start = self._frame * self.hop_length
+            if nonsilent:
+                if self._start is None:
+                    self._start = frame_start
+                self._end = frame_start + self.hop_length
+            elif self._start is not None and frame_start - self._end > self.merge_samples:
+                segments.extend(self._emit(self._start, self._end))
+                self._start = None
+            # Uzun bölgeler sabit uzunlukta parçalara bölünür (bellek sınırı)
+            while self._start is not None and self._end - self._start >= self.max_samples:
+                split = self._start + self.max_samples
+                segments.extend(self._emit(self._start, split))
+                self._start = split if self._end > split else None
+            self._frame += 1
+        # Artık hiçbir bölgeye girmeyecek örnekler bırakılır
+        keep = self._start if self._start is not None else self._frame * self.hop_length
+        drop = min(keep, self._total) - self._offset
+        if drop > 0:
+            self._audio = self._audio[drop:]
+            self._offset += drop
+        return segments
+
+    def _emit(self, start, end):
+        end = min(end, self._total)
+        if end - start < self.min_samples:
+            return []
+        return [(start, self._audio[start - self._offset:end - self._offset].copy())]
+
+
+## Kayıttaki konuşma bölgelerini akış hâlinde üretir
+#  @param file Ses dosyası
+#  @param sample_rate Sesin yeniden örnekleneceği oran
+#  @return (başlangıç örneği, örnekler) üreteci
+def speech_segments(file, sample_rate, top_db=TOP_DB, min_duration=MIN_DURATION,
+                    max_duration=MAX_DURATION, merge_gap=MERGE_GAP):
+    ref_power = max_frame_power(AudioStream(file, sample_rate))
+    segmenter = SpeechSegmenter(ref_power, sample_rate, top_db, min_duration, max_duration, merge_gap)
+    for block in AudioStream(file, sample_rate):
+        yield from segmenter.push(block)
+    yield from segmenter.finish()
+
+
+## Bölgenin öznitelik vektörü (süreç havuzunda çalışır)
+def _segment_features(audio, sample_rate, spec):
+    try:
+        return analyze_audio(audio, sample_rate).features(spec)
+    except Exception:
+        return None
+
+
+## Kaydı konuşmacılara göre bölütler
+#  @param model Eğitilmiş model
+#  @param scaler Öznitelik ölçekleyici
+#  @param workers İşçi süreç sayısı
+#  @param spec Modelin öznitelik tanımı (None ise DEFAULT_SPEC)
+#  @return (başlangıç sn, bitiş sn, konuşmacı) üreteci, zaman sırasında
+def diarize(file, model, scaler, sample_rate, workers=None, top_db=TOP_DB, min_duration=MIN_DURATION,
+            max_duration=MAX_DURATION, merge_gap=MERGE_GAP, spec=None):
+    workers = workers or os.cpu_count() or 1
+    # Bekleyen bölge sayısı sınırlıdır; okuma, işçilerin önüne fazla geçmez
+    max_pending = 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = collections.deque()
+        segments = speech_segments(file, sample_rate, top_db, min_duration, max_duration, merge_gap)
+        for start, audio in segments:
+            pending.append((start, len(audio), executor.submit(_segment_features, audio, sample_rate, spec)))
+            if len(pending) >= max_pending:
+                yield from _score(model, scaler, sample_rate, *pending.popleft())
+        while pending:
+            yield from _score(model, scaler, sample_rate, *pending.popleft())
+
+
+def _score(model, scaler, sample_rate, start, length, future):
+    features = future.result()
+    if features is None:
+        return
+    prediction = model.predict(scaler.transform(np.asarray(features).reshape(1, -1)))[0]
+    yield start / sample_rate, (start + length) / sample_rate, prediction
+
+
+## Aynı konuşmacının ardışık bölgelerini konuşma sıralarında birleştirir
+#  @param max_gap Birleştirilecek en uzun ara (saniye)
+def merge_turns(timeline, max_gap=1.0):
+    turn = None
+    for start, end, speaker in timeline:
+        if turn is not None and turn[2] == speaker and start - turn[1] <= max_gap:
+            turn = (turn[0], end, speaker)
+            continue
+        if turn is not None:
+            yield turn
+        turn = (start, end, speaker)
+    if turn is not None:
+        yield turn
+
+
+def _timestamp(seconds):
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(int(minutes), 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:04.1f}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Uzun kayıtlar için konuşmacı zaman çizelgesi")
+    parser.add_argument("file", help="Ses dosyası")
+    parser.add_argument("--model", default="VoiceRecognizeModel.joblib", help="Model dosyası")
+    parser.add_argument("--output", default=None, help="Zaman çizelgesinin yazılacağı JSONL dosyası")
+    parser.add_argument("--workers", type=int, default=None, help="İşçi süreç sayısı")
+    parser.add_argument("--top-db", type=float, default=TOP_DB, help="Sessizlik eşiği (dB)")
+    parser.add_argument("--min-duration", type=float, default=MIN_DURATION, help="En kısa bölge (saniye)")
+    parser.add_argument("--max-duration", type=float, default=MAX_DURATION, help="En uzun bölge (saniye)")
+    parser.add_argument("--merge-gap", type=float, default=MERGE_GAP,
+                        help="Bundan kısa sessizlikler bölgeyi bölmez (saniye)")
+    args = parser.parse_args()
+
+    from audio_features import FeatureSpec
+    from compact_model import load_artifact
+
+    model, scaler, params = load_artifact(args.model)
+    timeline = diarize(args.file, model, scaler, params['sample_rate'], args.workers, args.top_db,
+                       args.min_duration, args.max_duration, args.merge_gap, FeatureSpec.from_params(params))
+    out = open(args.output, 'w', encoding='utf-8') if args.output else None
+    try:
+        for start, end, speaker in merge_turns(timeline):
+            if out is not None:
+                out.write(json.dumps({'start': round(start, 3), 'end': round(end, 3), 'speaker': str(speaker)},
+                                     ensure_ascii=False) + '\n')
+                out.flush()
+            print(f"[{_timestamp(start)} - {_timestamp(end)}] {speaker}")
+    finally:
+        if out is not None:
+            out.close()
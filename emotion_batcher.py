@@ -0,0 +1,139 @@
+import collections
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from instrumentation import count, span
+
+## @package emotion_batcher
+#  Transformers duygu sınıflandırıcısı için dinamik toplu işleme ve önbellek
+#
+#  Eşzamanlı istekler bir kuyrukta toplanır ve en fazla max_batch_size metin
+#  veya max_wait_ms süre dolana kadar bekletilerek tek bir pipeline çağrısıyla
+#  sınıflandırılır. Sonuçlar normalize edilmiş metne göre LRU önbellekte
+#  tutulur; aynı transkriptin tekrar analizi modeli çalıştırmaz. Modelin
+#  azami uzunluğunu aşan metinler parçalara bölünür ve skorlar parça
+#  uzunluklarına göre ağırlıklı ortalanır.
+
+
+## Önbellek anahtarı olarak kullanılan normalize metin
+#  (kullanılan modeller "uncased" olduğu için büyük/küçük harf ayrımı yapılmaz)
+def normalize_text(text):
+    return " ".join(text.split()).casefold()
+
+
+class EmotionBatcher:
+    ## @param classifier transformers text-classification pipeline'ı (veya aynı arayüzde bir fonksiyon)
+    #  @param max_batch_size Bir toplu işteki en fazla metin sayısı
+    #  @param max_wait_ms İlk istekten sonra diğer istekler için beklenecek en uzun süre
+    #  @param cache_size LRU önbellekteki en fazla sonuç sayısı
+    #  @param max_tokens Parça başına en fazla token (tokenizer yoksa kelime) sayısı
+    def __init__(self, classifier, max_batch_size=16, max_wait_ms=10, cache_size=1024, max_tokens=512):
+        self.classifier = classifier
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.cache_size = cache_size
+        self.max_tokens = max_tokens
+        self._cache = collections.OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._worker = None
+
+    ## Metni sınıflandırma kuyruğuna ekler
+    #  @return Sonucu [{'label', 'score'}, ...] (skora göre azalan) olan Future
+    def submit(self, text):
+        key = normalize_text(text)
+        with self._lock:
+            if key in self._cache:
+                count("emotion.cache_hit")
+                self._cache.move_to_end(key)
+                future = Future()
+                future.set_result(self._cache[key])
+                return future
+            if key in self._pending:
+                return self._pending[key]
+            future = Future()
+            self._pending[key] = future
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="emotion-batcher", daemon=True)
+                self._worker.start()
+        self._queue.put(key)
+        return future
+
+    ## Metni sınıflandırır ve sonucu bekler
+    def classify(self, text, timeout=None):
+        return self.submit(text).result(timeout)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._process(batch)
+
+    def _process(self, keys):
+        count("emotion.batches")
+        count("emotion.texts", len(keys))
+        try:
+            with span("emotion.batch"):
+                results = self._classify_batch(keys)
+        except Exception as e:
+            with self._lock:
+                futures = [self._pending.pop(key) for key in keys]
+            for future in futures:
+                future.set_exception(e)
+            return
+        with self._lock:
+            for key, result in zip(keys, results):
+                self._cache[key] = result
+                self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            futures = [self._pending.pop(key) for key in keys]
+        for future, result in zip(futures, results):
+            future.set_result(result)
+
+    def _classify_batch(self, keys):
+        # Tüm metinlerin parçaları tek bir pipeline çağrısında sınıflandırılır
+        chunks, owners, weights = [], [], []
+        for i, key in enumerate(keys):
+            for chunk, weight in self._chunks(key):
+                chunks.append(chunk)
+                owners.append(i)
+                weights.append(weight)
+        outputs = self.classifier(chunks, top_k=None, truncation=True)
+
+        totals = [collections.defaultdict(float) for _ in keys]
+        total_weights = [0.0] * len(keys)
+        for owner, weight, output in zip(owners, weights, outputs):
+            for item in output:
+                totals[owner][item['label']] += item['score'] * weight
+            total_weights[owner] += weight
+        return [sorted(({'label': label, 'score': score / total_weights[i]} for label, score in totals[i].items()),
+                       key=lambda item: item['score'], reverse=True)
+                for i in range(len(keys))]
+
+    ## Metni modelin azami uzunluğunu aşmayacak parçalara böler
+    #  @return (parça, ağırlık) çiftleri
+    def _chunks(self, text):
+        tokenizer = getattr(self.classifier, 'tokenizer', None)
+        if tokenizer is None:
+            words = text.split() or [text]
+            return [(" ".join(words[i:i + self.max_tokens]), len(words[i:i + self.max_tokens]))
+                    for i in range(0, len(words), self.max_tokens)]
+        # Özel tokenler ([CLS], [SEP]) için yer bırak
+        limit = min(self.max_tokens, getattr(tokenizer, 'model_max_length', self.max_tokens)) - 2
+        ids = tokenizer(text, add_special_tokens=False)['input_ids']
+        if len(ids) <= limit:
+            return [(text, max(len(ids), 1))]
+        return [(tokenizer.decode(ids[i:i + limit]), len(ids[i:i + limit]))
+                for i in range(0, len(ids), limit)]
@@ -0,0 +1,134 @@
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+from audio_features import N_MFCC
+from streaming import RunningStats
+
+## @package enrollment
+#  Yeniden eğitim gerektirmeyen artımlı konuşmacı kaydı
+#
+#  Her konuşmacı için öznitelik ortalaması/varyansı ve tüm örnekler için
+#  ölçekleme (scaler) istatistikleri artımlı olarak tutulur; yeni bir örnek
+#  O(1) sürede eklenir. Tanıma, ölçeklenmiş uzayda en yakın konuşmacı
+#  merkezine göre yapılır. Kayıtlar model dosyasının yanına atomik olarak
+#  yazılır (VoiceRecognizeModel.enroll.npz).
+#
+#  Eğitim verisi depoya yalnızca ölçekleme istatistikleri olarak girer
+#  (observe); depodaki konuşmacılar sonradan kaydedilenlerdir. Eğitim
+#  konuşmacıları yalnızca indeks arka ucu için açıkça eklenir
+#  (main.py --enroll-training, bkz. speaker_index.SpeakerIdentifier).
+
+
+## Model dosyasının yanındaki kayıt dosyasının yolu
+def enrollment_path(model_path):
+    return os.path.splitext(model_path)[0] + '.enroll.npz'
+
+
+class EnrollmentStore:
+    def __init__(self, dim=N_MFCC):
+        self.dim = dim
+        self.speakers = {}
+        self.scaler_stats = RunningStats(dim)
+        self._lock = threading.Lock()
+
+    ## Eğitim verisinden kayıt deposu oluşturur
+    #  @param X Öznitelik vektörleri
+    #  @param y Konuşmacı etiketleri
+    @classmethod
+    def from_training(cls, X, y):
+        X = np.asarray(X, dtype=np.float64)
+        store = cls(X.shape[1])
+        for label in dict.fromkeys(y):
+            store._update(label, X[np.asarray(y) == label])
+        return store
+
+    ## Ölçekleme istatistiklerine örnek ekler; konuşmacı eklemez
+    #  @param features Öznitelik vektörleri (ör. eğitim verisi)
+    def observe(self, features):
+        with self._lock:
+            self.scaler_stats.update(np.asarray(features, dtype=np.float64).reshape(-1, self.dim))
+
+    @property
+    def classes_(self):
+        return np.array(list(self.speakers))
+
+    ## Bir konuşmacıya yeni örnek ekler
+    #  @param label Konuşmacı adı
+    #  @param features Öznitelik vektörü (veya vektörleri)
+    def add(self, label, features):
+        with self._lock:
+            self._update(label, np.asarray(features, dtype=np.float64).reshape(-1, self.dim))
+
+    def _update(self, label, values):
+        if label not in self.speakers:
+            self.speakers[label] = RunningStats(self.dim)
+        self.speakers[label].update(values)
+        self.scaler_stats.update(values)
+
+    ## StandardScaler ile aynı ölçekleme (sıfır varyanslı boyutlar ölçeklenmez)
+    def transform(self, X):
+        scale = np.sqrt(self.scaler_stats.variance)
+        scale[scale == 0] = 1.0
+        return (np.asarray(X, dtype=np.float64) - self.scaler_stats.mean) / scale
+
+    ## Konuşmacı etiketleri ve ölçeklenmiş merkezleri
+    def centroids(self):
+        labels = self.classes_
+        means = np.array([self.speakers[label].mean for label in labels]).reshape(-1, self.dim)
+        return labels, self.transform(means)
+
+    ## Her konuşmacı için skor (ölçeklenmiş uzayda eksi uzaklık)
+    #  @param X Ölçeklenmemiş öznitelik vektörleri
+    def decision_function(self, X):
+        _, centers = self.centroids()
+        scaled = self.transform(np.asarray(X).reshape(-1, self.dim))
+        distances = np.sum((scaled[:, None, :] - centers[None, :, :]) ** 2, axis=-1)
+        return -np.sqrt(distances)
+
+    ## En yakın konuşmacı merkezine göre tahmin
+    #  @param X Ölçeklenmemiş öznitelik vektörleri
+    def predict(self, X):
+        return self.classes_[np.argmax(self.decision_function(X), axis=1)]
+
+    ## Depoyu atomik olarak dosyaya yazar
+    def save(self, path):
+        with self._lock:
+            labels = self.classes_
+            arrays = {
+                'labels': labels.astype(str),
+                'counts': np.array([self.speakers[label].count for label in labels], dtype=np.int64),
+                'means': np.array([self.speakers[label].mean for label in labels]).reshape(-1, self.dim),
+                'm2s': np.array([self.speakers[label].m2 for label in labels]).reshape(-1, self.dim),
+                'scaler_count': np.array(self.scaler_stats.count, dtype=np.int64),
+                'scaler_mean': self.scaler_stats.mean,
+                'scaler_m2': self.scaler_stats.m2,
+            }
+            directory = os.path.dirname(os.path.abspath(path))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    np.savez(f, **arrays)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+    ## Depoyu dosyadan okur; dosya yoksa boş depo döndürür
+    @classmethod
+    def load(cls, path, dim=N_MFCC):
+        if not os.path.exists(path):
+            return cls(dim)
+        with np.load(path, allow_pickle=False) as data:
+            store = cls(data['scaler_mean'].shape[0])
+            for label, count, mean, m2 in zip(data['labels'], data['counts'], data['means'], data['m2s']):
+                stats = RunningStats(store.dim)
+                stats.count, stats.mean, stats.m2 = int(count), mean.copy(), m2.copy()
+                store.speakers[str(label)] = stats
+            store.scaler_stats.count = int(data['scaler_count'])
+            store.scaler_stats.mean = data['scaler_mean'].copy()
+            store.scaler_stats.m2 = data['scaler_m2'].copy()
+        return store
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+## @package feature_cache
+#  Öznitelik vektörleri için içerik adresli disk önbelleği
+#
+#  Anahtar, ses içeriğinin SHA-256 özeti ile öznitelik parametrelerinden
+#  (örnekleme oranı, res_type, top_db, n_mfcc) üretilir. Vektörler bellekten
+#  eşlenebilir .npy dosyaları olarak saklanır; toplam boyut sınırı aşıldığında
+#  en uzun süre kullanılmayan kayıtlar (LRU) silinir.
+
+# Varsayılan önbellek dizini ve boyut sınırı
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".feature_cache")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_CHUNK_SIZE = 1 << 20
+
+
+def _params_bytes(params):
+    return json.dumps(params, sort_keys=True).encode("utf-8")
+
+
+## Ses dosyası için önbellek anahtarı
+#  @param file_path Ses dosyasının yolu
+#  @param params Öznitelik parametreleri (sözlük)
+#  @return Onaltılık anahtar dizgisi
+def file_key(file_path, params):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    digest.update(_params_bytes(params))
+    return digest.hexdigest()
+
+
+## Bellekteki ses verisi için önbellek anahtarı
+#  @param audio Ses verisi
+#  @param sample_rate Örnekleme oranı
+#  @param params Öznitelik parametreleri (sözlük)
+#  @return Onaltılık anahtar dizgisi
+def audio_key(audio, sample_rate, params):
+    audio = np.ascontiguousarray(audio)
+    digest = hashlib.sha256()
+    digest.update(audio.dtype.str.encode("ascii"))
+    digest.update(audio.view(np.uint8).data)
+    digest.update(_params_bytes(dict(params, sample_rate=sample_rate)))
+    return digest.hexdigest()
+
+
+class FeatureCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._total_bytes = None
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".npy")
+
+    ## Önbellekteki vektörü döndürür, yoksa None
+    def get(self, key):
+        path = self._path(key)
+        try:
+            vector = np.load(path, mmap_mode="r")
+            # Windows'ta açık eşleme dosyanın silinmesini engellediği için kopyalıyoruz
+            vector = np.array(vector)
+            # LRU sırası için erişim zamanını güncelle
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return vector
+
+    ## Vektörü atomik olarak önbelleğe yazar ve gerekirse eski kayıtları siler
+    def put(self, key, vector):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.asarray(vector))
+            # Aynı anahtar yeniden yazılıyorsa toplam boyuta yalnızca fark eklenir
+            try:
+                old_size = os.path.getsize(path)
+            except OSError:
+                old_size = 0
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        if self._total_bytes is not None:
+            self._total_bytes += os.path.getsize(path) - old_size
+        self._evict()
+
+    def _entries(self):
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".npy"):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict(self):
+        # Toplam boyutu yalnızca ilk seferde diskten hesapla, sonra artımlı takip et
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, size, _ in self._entries())
+        if self._total_bytes <= self.max_bytes:
+            return
+        entries = self._entries()
+        self._total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._total_bytes -= size
+
+    ## Önbellekteki tüm kayıtları siler
+    def clear(self):
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._total_bytes = 0
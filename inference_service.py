@@ -0,0 +1,542 @@
+import argparse
+import asyncio
+import io
+import json
+import logging
+import os
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import instrumentation
+import model_registry
+from instrumentation import count, span
+from speaker_index import BACKENDS
+
+## @package inference_service
+#  Arayüzsüz (headless) asyncio HTTP çıkarım servisi
+#
+#  Konuşmacı modeli, kayıt deposu, konuşma tanıma ve duygu analizi modelleri
+#  süreç başında bir kez yüklenir. Ses çözme ve öznitelik çıkarma (CPU yoğun)
+#  bir süreç havuzunda, tahmin ana süreçte yapılır. İstekler sınırlı bir
+#  kuyruğa alınır ve sabit sayıda görev tarafından işlenir; kuyruk doluysa
+#  istek beklemeden 503 (Retry-After) ile reddedilir, böylece aşırı yükte
+#  gecikme sınırsız büyümez.
+#
+#  Uç noktalar (yanıtlar JSON):
+#  - POST /identify   gövde: ses dosyası; ?transcribe=1&emotion=1&features=1&threshold=0.5&top=3
+#                     (top: en benzer kayıtlı konuşmacılar da döner)
+#  - POST /transcribe gövde: ses dosyası
+#  - POST /emotion    gövde: metin (düz metin veya {"text": ...})
+#  - POST /enroll     gövde: ses dosyası; ?name=konuşmacı
+#  /identify ve /enroll, ses yerine daha önce çıkarılmış öznitelikleri de
+#  kabul eder (Content-Type: application/json, {"features": [...]}).
+#  - GET  /health, GET /metrics (Prometheus metin biçimi)
+#  Tanıma varsayılan olarak model dosyasındaki sınıflandırıcıyla yapılır;
+#  kayıt deposu indeksi --backend index (veya SES_SPEAKER_BACKEND=index) ile seçilir.
+#
+#  Kullanım: python inference_service.py --port 8080 --workers 4
+#  Web arayüzü SES_SERVICE_URL=http://127.0.0.1:8080 ile bu servisin istemcisi olur.
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_QUEUE_SIZE = 32
+MAX_BODY_BYTES = 32 * 1024 * 1024
+TRANSCRIPTION_SAMPLE_RATE = 16000
+
+logger = logging.getLogger("ses.service")
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            411: "Length Required", 413: "Payload Too Large", 422: "Unprocessable Entity",
+            500: "Internal Server Error", 502: "Bad Gateway", 503: "Service Unavailable",
+            504: "Gateway Timeout"}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+
+## Ses dosyasını çözer ve öznitelikleri çıkarır (süreç havuzunda çalışır)
+#  @param transcribe True ise konuşma tanıma için 16 kHz 16 bit PCM de döndürülür
+#  @return (öznitelik vektörü veya None, PCM baytları veya None)
+def _decode_and_extract(data, sample_rate, spec, features=True, transcribe=False):
+    from decoded_audio import DecodedAudio
+
+    decoded = DecodedAudio.from_file(io.BytesIO(data), sample_rate)
+    vector = decoded.features_and_analysis(spec=spec)[0] if features else None
+    pcm = decoded.audio_data(TRANSCRIPTION_SAMPLE_RATE).get_raw_data() if transcribe else None
+    return (np.asarray(vector, dtype=np.float64) if vector is not None else None), pcm
+
+
+def _flag(query, name):
+    return query.get(name, '0').lower() in ('1', 'true', 'yes', 'evet')
+
+
+class InferenceService:
+    ## @param workers Öznitelik çıkarma süreç sayısı (None ise çekirdek sayısı)
+    #  @param max_queue Bekleyebilecek en fazla istek; aşılırsa istek 503 ile reddedilir
+    #  @param concurrency Aynı anda işlenen en fazla istek (None ise 2 * workers)
+    #  @param transcription_timeout Konuşma tanıma için en uzun bekleme (saniye)
+    #  @param get Model adı -> model döndüren fonksiyon (varsayılan: model_registry.get)
+    #  @param model_path Model dosyası; kayıt deposu yanında tutulur. Varsayılan get ile verilirse
+    #         model_registry bu dosyaya yönlendirilir (model_registry.set_model_path)
+    #  @param backend Konuşmacı tanıma arka ucu, "model" veya "index" (None ise model_registry.SPEAKER_BACKEND)
+    def __init__(self, workers=None, max_queue=DEFAULT_QUEUE_SIZE, concurrency=None,
+                 transcription_timeout=15.0, max_body=MAX_BODY_BYTES, get=model_registry.get,
+                 model_path=None, backend=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.concurrency = concurrency or 2 * self.workers
+        self.transcription_timeout = transcription_timeout
+        self.max_body = max_body
+        self.get = get
+        # Kayıt deposu, modellerin yüklendiği ve izlendiği dosyanın yanına yazılır
+        if model_path is not None and get is model_registry.get:
+            model_registry.set_model_path(model_path)
+        self.model_path = model_path or model_registry.MODEL_PATH
+        self.backend = backend or model_registry.SPEAKER_BACKEND
+        self._pool = None
+        self._queue = None
+        self._tasks = []
+        self._server = None
+        self._connections = set()
+        self._enroll_lock = threading.Lock()
+        self._routes = {
+            ('POST', '/identify'): self.identify,
+            ('POST', '/transcribe'): self.transcribe,
+            ('POST', '/emotion'): self.emotion,
+            ('POST', '/enroll'): self.enroll,
+            ('GET', '/health'): self.health,
+            ('GET', '/metrics'): self.metrics,
+        }
+
+    ## Modelleri yükler, süreç havuzunu ve kuyruk görevlerini başlatır, dinlemeye başlar
+    #  @param preload Yüklenecek modeller; yüklenemeyenler (ör. transformers yoksa duygu) uyarıyla atlanır
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT, preload=("speaker_model", "transcriber",
+                                                                        "emotion_batcher")):
+        loop = asyncio.get_running_loop()
+        for name in preload:
+            try:
+                await loop.run_in_executor(None, self.get, name)
+            except Exception as e:
+                logger.warning("%s yüklenemedi: %s: %s", name, type(e).__name__, e)
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.concurrency)]
+        self._server = await asyncio.start_server(self._connection, host, port)
+        return self._server
+
+    ## Dinlenen (host, port)
+    @property
+    def address(self):
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        # Açık (keep-alive) bağlantılar ve kuyruk görevleri de kapatılır
+        tasks = self._tasks + list(self._connections)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    ## Sınırlı kuyruk: kuyruk doluysa beklemeden reddeder
+    async def _submit(self, handler, *args):
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((handler, args, future))
+        except asyncio.QueueFull:
+            count("service.rejected")
+            raise HttpError(503, "Servis aşırı yüklü, lütfen tekrar deneyin", {'Retry-After': '1'})
+        return await future
+
+    async def _work(self):
+        while True:
+            handler, args, future = await self._queue.get()
+            # İstemci bağlantıyı kapattıysa iş yapılmaz
+            if future.done():
+                continue
+            try:
+                result = await handler(*args)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+    # --- HTTP ---
+
+    async def _connection(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                keep_alive = await self._request(head, reader, writer)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            # Kapanışta iptal edilen bağlantı sessizce sonlandırılır
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _request(self, head, reader, writer):
+        lines = head.decode('latin-1').split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ", 2)
+        except ValueError:
+            self._respond(writer, 400, {'error': "Geçersiz istek satırı"}, keep_alive=False)
+            return False
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        keep_alive = version == "HTTP/1.1" and headers.get('connection', '').lower() != 'close'
+        if 'transfer-encoding' in headers:
+            self._respond(writer, 411, {'error': "Content-Length gerekli"}, keep_alive=False)
+            return False
+        length = headers.get('content-length') or '0'
+        if not (length.isascii() and length.isdigit()):
+            self._respond(writer, 400, {'error': "Geçersiz Content-Length"}, keep_alive=False)
+            return False
+        length = int(length)
+        if length > self.max_body:
+            self._respond(writer, 413, {'error': f"İstek gövdesi en fazla {self.max_body} bayt olabilir"},
+                          keep_alive=False)
+            return False
+        try:
+            body = await reader.readexactly(length) if length else b""
+        except asyncio.IncompleteReadError:
+            # Gövde Content-Length'ten kısa: istemci bağlantıyı erken kapattı
+            self._respond(writer, 400, {'error': "İstek gövdesi eksik"}, keep_alive=False)
+            return False
+
+        url = urllib.parse.urlsplit(target)
+        query = dict(urllib.parse.parse_qsl(url.query))
+        handler = self._routes.get((method, url.path))
+        if handler is None:
+            allowed = any(path == url.path for _, path in self._routes)
+            self._respond(writer, 405 if allowed else 404, {'error': f"{method} {url.path} desteklenmiyor"},
+                          keep_alive=keep_alive)
+            return keep_alive
+        try:
+            with span(f"http{url.path.replace('/', '.')}"):
+                if url.path in ('/health', '/metrics'):
+                    result = await handler(query, body, headers)
+                else:
+                    result = await self._submit(handler, query, body, headers)
+        except HttpError as e:
+            self._respond(writer, e.status, {'error': e.message}, e.headers, keep_alive)
+            return keep_alive
+        except Exception as e:
+            logger.exception("İstek işlenemedi: %s %s", method, url.path)
+            self._respond(writer, 500, {'error': f"{type(e).__name__}: {e}"}, keep_alive=keep_alive)
+            return keep_alive
+        self._respond(writer, 200, result, keep_alive=keep_alive)
+        return keep_alive
+
+    def _respond(self, writer, status, payload, headers=None, keep_alive=True):
+        if isinstance(payload, str):
+            body = payload.encode('utf-8')
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            content_type = "application/json; charset=utf-8"
+        count(f"service.status.{status}")
+        lines = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}", f"Content-Type: {content_type}",
+                 f"Content-Length: {len(body)}", f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + body)
+
+    # --- Uç noktalar ---
+
+    def _speaker_model(self):
+        from audio_features import FeatureSpec, artifact_feature_params
+
+        artifact = self.get("speaker_model")
+        params = artifact_feature_params(artifact)
+        return artifact[0], artifact[1], params['sample_rate'], FeatureSpec.from_params(params)
+
+    ## Ses dosyasından (veya JSON {"features": [...]} gövdesinden) öznitelik vektörünü alır
+    async def _extract(self, body, headers, features=True, transcribe=False):
+        if not body:
+            raise HttpError(400, "Ses dosyası gönderilmedi")
+        _, _, sample_rate, spec = self._speaker_model()
+        if headers.get('content-type', '').startswith('application/json'):
+            if transcribe:
+                raise HttpError(400, "Konuşma tanıma için ses dosyası gönderilmeli")
+            try:
+                vector = np.asarray(json.loads(body)['features'], dtype=np.float64).reshape(-1)
+            except (ValueError, KeyError, TypeError):
+                raise HttpError(400, "Geçersiz öznitelik gövdesi")
+            if len(vector) != spec.dim:
+                raise HttpError(400, f"Öznitelik vektörü {spec.dim} boyutlu olmalı")
+            return vector, None
+        loop = asyncio.get_running_loop()
+        try:
+            with span("service.extract"):
+                vector, pcm = await loop.run_in_executor(self._pool, _decode_and_extract, body, sample_rate, spec,
+                                                         features, transcribe)
+        except Exception as e:
+            raise HttpError(400, f"Ses dosyası çözülemedi: {type(e).__name__}: {e}")
+        if features and vector is None:
+            raise HttpError(422, "Öznitelik çıkarılamadı")
+        return vector, pcm
+
+    ## @param top_k En benzer kaç kayıtlı konuşmacının döneceği (0 ise hiç)
+    #  @return (tahmin, karar skorları, skor etiketleri, [(etiket, skor)] en benzerler)
+    def _identify(self, vector, threshold=None, top_k=0):
+        identifier = model_registry.speaker_identifier(self.backend, self.get)
+        features = vector.reshape(1, -1)
+        with span(f"identify.{identifier.backend}"):
+            predictions, decision, classes = identifier.identify(features, threshold)
+            matches = identifier.search(features, top_k) if top_k else []
+        return predictions[0], decision[0], classes, matches
+
+    ## Konuşma tanımayı arka planda başlatır (konuşmacı tanıma ile paralel ilerler)
+    def _start_transcription(self, pcm):
+        import speech_recognition as sr
+
+        return self.get("transcriber").submit(sr.AudioData(pcm, TRANSCRIPTION_SAMPLE_RATE, 2))
+
+    async def _transcribe(self, pcm):
+        return await self._transcription_result(self._start_transcription(pcm))
+
+    ## Başlatılmış konuşma tanımanın sonucunu bekler
+    async def _transcription_result(self, future):
+        import speech_recognition as sr
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.transcription_timeout)
+        except asyncio.TimeoutError:
+            raise HttpError(504, "Konuşma tanıma zaman aşımına uğradı")
+        except sr.UnknownValueError:
+            return ""
+        except sr.RequestError as e:
+            raise HttpError(502, f"Konuşma tanıma hizmetinden sonuç alınamadı; {e}")
+
+    async def _emotions(self, text):
+        try:
+            batcher = self.get("emotion_batcher")
+        except Exception as e:
+            raise HttpError(503, f"Duygu analizi modeli yüklenemedi: {type(e).__name__}")
+        results = await asyncio.wrap_future(batcher.submit(text))
+        return {result['label']: result['score'] * 100 for result in results}
+
+    async def identify(self, query, body, headers):
+        transcribe = _flag(query, 'transcribe')
+        try:
+            threshold = float(query['threshold']) if query.get('threshold') else None
+            top_k = int(query.get('top') or 0)
+        except ValueError:
+            raise HttpError(400, "Geçersiz threshold veya top değeri")
+        vector, pcm = await self._extract(body, headers, transcribe=transcribe)
+        text_future = self._start_transcription(pcm) if transcribe else None
+        prediction, decision, classes, matches = self._identify(vector, threshold, top_k)
+        if np.ndim(decision) == 0:
+            scores = {'score': float(decision)}
+        else:
+            scores = {str(label): float(value) for label, value in zip(classes, decision)}
+        result = {'speaker': str(prediction), 'scores': scores}
+        if top_k:
+            result['matches'] = [[str(label), score] for label, score in matches]
+        if _flag(query, 'features'):
+            result['features'] = vector.tolist()
+        if transcribe:
+            result['text'] = await self._transcription_result(text_future)
+            if _flag(query, 'emotion') and result['text']:
+                result['emotions'] = await self._emotions(result['text'])
+        return result
+
+    async def transcribe(self, query, body, headers):
+        _, pcm = await self._extract(body, headers, features=False, transcribe=True)
+        return {'text': await self._transcribe(pcm)}
+
+    async def emotion(self, query, body, headers):
+        text = body.decode('utf-8', errors='replace')
+        if text.lstrip().startswith('{'):
+            try:
+                text = json.loads(text).get('text', '')
+            except ValueError:
+                raise HttpError(400, "Geçersiz JSON")
+        if not text.strip():
+            raise HttpError(400, "Metin gönderilmedi")
+        return {'emotions': await self._emotions(text)}
+
+    async def enroll(self, query, body, headers):
+        from enrollment import enrollment_path
+
+        name = query.get('name', '').strip()
+        if not name:
+            raise HttpError(400, "Konuşmacı adı (name) gerekli")
+        vector, _ = await self._extract(body, headers)
+
+        def add():
+            # Depo dosyası tek yazıcıyla güncellenir
+            with self._enroll_lock:
+                store = self.get("enrollment")
+                store.add(name, vector)
+                store.save(enrollment_path(self.model_path))
+        await asyncio.get_running_loop().run_in_executor(None, add)
+        return {'speaker': name, 'features': vector.tolist()}
+
+    async def health(self, query, body, headers):
+        return {'status': 'ok', 'queued': self._queue.qsize(), 'max_queue': self.max_queue,
+                'concurrency': self.concurrency, 'workers': self.workers}
+
+    async def metrics(self, query, body, headers):
+        return instrumentation.prometheus_text()
+
+
+class ServiceError(Exception):
+    def __init__(self, status, message):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+        self.message = message
+
+
+def _features_body(features):
+    return json.dumps({'features': np.asarray(features, dtype=np.float64).reshape(-1).tolist()}).encode('utf-8')
+
+
+## Servisin HTTP istemcisi (web arayüzü ve yük testi kullanır)
+class ServiceClient:
+    def __init__(self, base_url, timeout=60.0):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def _call(self, path, body=None, params=None, content_type="application/octet-stream"):
+        url = self.base_url + path
+        if params:
+            url += "?" + urllib.parse.urlencode({name: value for name, value in params.items() if value is not None})
+        request = urllib.request.Request(url, data=body, method="POST" if body is not None else "GET",
+                                         headers={'Content-Type': content_type})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read().decode('utf-8'))
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read().decode('utf-8')).get('error', e.reason)
+            except ValueError:
+                message = e.reason
+            raise ServiceError(e.code, message) from None
+
+    ## @param data Ses dosyasının baytları
+    #  @param top Verilirse en benzer top kayıtlı konuşmacı da döner ('matches')
+    def identify(self, data, transcribe=False, emotion=False, features=False, threshold=None, top=None):
+        return self._call('/identify', data, {'transcribe': int(transcribe), 'emotion': int(emotion),
+                                              'features': int(features), 'threshold': threshold, 'top': top})
+
+    ## Önceden çıkarılmış öznitelik vektörüyle tanıma
+    def identify_features(self, features, threshold=None, top=None):
+        return self._call('/identify', _features_body(features), {'threshold': threshold, 'top': top},
+                          content_type="application/json")
+
+    def transcribe(self, data):
+        return self._call('/transcribe', data)['text']
+
+    def emotion(self, text):
+        return self._call('/emotion', json.dumps({'text': text}).encode('utf-8'),
+                          content_type="application/json")['emotions']
+
+    def enroll(self, name, data):
+        return self._call('/enroll', data, {'name': name})
+
+    def enroll_features(self, name, features):
+        return self._call('/enroll', _features_body(features), {'name': name}, content_type="application/json")
+
+    def health(self):
+        return self._call('/health')
+
+
+## Servisi arka plandaki bir iş parçacığında kendi olay döngüsüyle çalıştırır (testler ve yük testi için)
+#  @return (servis, taban URL, durdurma fonksiyonu)
+def run_in_thread(service, host=DEFAULT_HOST, port=0, **start_kwargs):
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    errors = []
+
+    def run():
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(service.start(host, port, **start_kwargs))
+        except Exception as e:
+            errors.append(e)
+            started.set()
+            return
+        started.set()
+        loop.run_forever()
+        loop.run_until_complete(service.close())
+        loop.close()
+
+    thread = threading.Thread(target=run, name="inference-service", daemon=True)
+    thread.start()
+    started.wait()
+    if errors:
+        raise errors[0]
+
+    def stop():
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+
+    bound_host, bound_port = service.address
+    return service, f"http://{bound_host}:{bound_port}", stop
+
+
+async def _serve(args):
+    service = InferenceService(workers=args.workers, max_queue=args.queue_size, concurrency=args.concurrency,
+                               transcription_timeout=args.transcription_timeout, backend=args.backend,
+                               model_path=args.model)
+    await service.start(args.host, args.port)
+    host, port = service.address
+    print(f"Servis http://{host}:{port} adresinde dinliyor (kuyruk: {service.max_queue}, "
+          f"eşzamanlı istek: {service.concurrency}, işçi süreç: {service.workers})")
+    try:
+        await service._server.serve_forever()
+    finally:
+        await service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Konuşmacı tanıma HTTP çıkarım servisi")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Dinlenecek adres")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Dinlenecek port")
+    parser.add_argument("--workers", type=int, default=None, help="Öznitelik çıkarma süreç sayısı")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="Bekleyebilecek en fazla istek (aşılırsa 503)")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="Aynı anda işlenen en fazla istek (varsayılan: 2 * işçi)")
+    parser.add_argument("--transcription-timeout", type=float, default=15.0,
+                        help="Konuşma tanıma için en uzun bekleme (saniye)")
+    parser.add_argument("--model", default=None,
+                        help="Model dosyası (varsayılan: VoiceRecognizeModel.joblib); kayıt deposu yanında tutulur")
+    parser.add_argument("--backend", choices=BACKENDS, default=None,
+                        help="Konuşmacı tanıma arka ucu (varsayılan: SES_SPEAKER_BACKEND veya model)")
+    parser.add_argument("--timing", action="store_true", help="Aşama sürelerini ölç (/metrics)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if args.timing:
+        instrumentation.enable()
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,211 @@
+import contextlib
+import contextvars
+import functools
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+## @package instrumentation
+#  İşlem hattı aşamaları için hafif zamanlama ölçümü
+#
+#  span("aşama") bloğun süresini, count("olay") olay sayısını kaydeder.
+#  Ölçüm kapalıyken span() paylaşılan boş bir bağlam yöneticisi döndürür ve
+#  count() hemen döner; bu yüzden ölçüm noktaları kodda kalabilir. Açmak için
+#  SES_TIMING=1 ortam değişkeni veya enable() kullanılır.
+#
+#  Çıktılar:
+#  - "ses.timing" günlüğüne satır başına bir JSON kaydı,
+#  - SES_TIMING_PROM ile verilen dosyaya Prometheus metin biçimi (her
+#    trace() sonunda atomik olarak yazılır; node_exporter textfile toplayıcısı
+#    için uygundur),
+#  - trace() ile toplanan istek başına aşama listesi (web arayüzündeki panel).
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PROMETHEUS_PATH = os.environ.get("SES_TIMING_PROM") or None
+
+logger = logging.getLogger("ses.timing")
+
+_enabled = False
+_lock = threading.Lock()
+_durations = {}  # aşama -> [sayı, toplam süre, kova sayıları]
+_counters = {}
+_trace = contextvars.ContextVar("ses_timing_trace", default=None)
+_depth = contextvars.ContextVar("ses_timing_depth", default=0)
+
+
+## Ölçümü açar veya kapatır
+def enable(enabled=True):
+    global _enabled
+    _enabled = bool(enabled)
+    if _enabled and not logger.handlers and not logging.getLogger().handlers:
+        # Uygulama günlüğü yapılandırmadıysa kayıtlar stderr'e yazılır
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+
+
+def is_enabled():
+    return _enabled
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ('name', '_start', '_token')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self._token = _depth.set(_depth.get() + 1)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self._start
+        _depth.reset(self._token)
+        _record(self.name, self._start, elapsed, _depth.get())
+        return False
+
+
+## Bloğun süresini ölçen bağlam yöneticisi
+#  @param name Aşama adı (ör. "reduce_noise", "transcription")
+def span(name):
+    return _Span(name) if _enabled else _NOOP
+
+
+## Fonksiyonun her çağrısını ölçen dekoratör
+def timed(name):
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+## Olay sayacını artırır (ör. önbellek isabeti)
+def count(name, value=1):
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def _record(name, start, elapsed, depth):
+    with _lock:
+        stats = _durations.get(name)
+        if stats is None:
+            stats = _durations[name] = [0, 0.0, [0] * len(BUCKETS)]
+        stats[0] += 1
+        stats[1] += elapsed
+        for i, bound in enumerate(BUCKETS):
+            if elapsed <= bound:
+                stats[2][i] += 1
+    spans = _trace.get()
+    if spans is not None:
+        spans.append((name, start, elapsed, depth))
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps({'span': name, 'ms': round(elapsed * 1000, 3), 'depth': depth,
+                                'thread': threading.current_thread().name}))
+
+
+## Bir isteğin aşamalarını toplar
+#  Blok içinde (ve contextvars ile bağlamı taşınan iş parçacıklarında) ölçülen
+#  aşamalar (ad, başlangıç, süre, derinlik) olarak, bitiş sırasıyla listeye
+#  eklenir. Blok bitince Prometheus dosyası güncellenir.
+@contextlib.contextmanager
+def trace(name="request"):
+    spans = []
+    token = _trace.set(spans)
+    try:
+        with span(name):
+            yield spans
+    finally:
+        _trace.reset(token)
+        if _enabled and PROMETHEUS_PATH:
+            write_prometheus(PROMETHEUS_PATH)
+
+
+## Şimdiye kadarki ölçümlerin kopyası
+#  @return {'durations': {aşama: {'count', 'sum', 'buckets'}}, 'counters': {olay: sayı}}
+def snapshot():
+    with _lock:
+        return {
+            'durations': {name: {'count': stats[0], 'sum': stats[1], 'buckets': list(stats[2])}
+                          for name, stats in _durations.items()},
+            'counters': dict(_counters),
+        }
+
+
+## trace() listesini başlangıç sırasıyla, girintili metin satırlarına çevirir
+def format_trace(spans):
+    if not spans:
+        return []
+    origin = min(start for _, start, _, _ in spans)
+    return [f"{(start - origin) * 1000:8.1f} ms  {'  ' * depth}{name:<{28 - 2 * depth}} {elapsed * 1000:9.1f} ms"
+            for name, start, elapsed, depth in sorted(spans, key=lambda item: (item[1], item[3]))]
+
+
+def reset():
+    with _lock:
+        _durations.clear()
+        _counters.clear()
+
+
+def _label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+## Ölçümleri Prometheus metin biçiminde döndürür
+def prometheus_text():
+    data = snapshot()
+    lines = ["# HELP ses_stage_duration_seconds İşlem hattı aşamalarının süresi",
+             "# TYPE ses_stage_duration_seconds histogram"]
+    for name, stats in sorted(data['durations'].items()):
+        stage = _label(name)
+        for bound, bucket in zip(BUCKETS, stats['buckets']):
+            lines.append(f'ses_stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} {bucket}')
+        lines.append(f'ses_stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} {stats["count"]}')
+        lines.append(f'ses_stage_duration_seconds_sum{{stage="{stage}"}} {stats["sum"]:.6f}')
+        lines.append(f'ses_stage_duration_seconds_count{{stage="{stage}"}} {stats["count"]}')
+    lines += ["# HELP ses_events_total İşlem hattı olay sayaçları",
+              "# TYPE ses_events_total counter"]
+    for name, value in sorted(data['counters'].items()):
+        lines.append(f'ses_events_total{{event="{_label(name)}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+
+## Prometheus metin dosyasını atomik olarak yazar
+def write_prometheus(path):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(prometheus_text())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+if os.environ.get("SES_TIMING", "") not in ("", "0"):
+    enable()
@@ -0,0 +1,152 @@
+import argparse
+import asyncio
+import collections
+import io
+import json
+import time
+import urllib.parse
+
+import numpy as np
+
+## @package load_test
+#  Çıkarım servisi için yerel yük testi
+#
+#  Verilen sayıda eşzamanlı bağlantı (keep-alive) açılır ve her biri istek
+#  sayısı bitene kadar art arda istek gönderir. Durum kodlarının dağılımı
+#  (aşırı yükte 503 oranı), çıktı hızı ve başarılı isteklerin p50/p95/p99
+#  gecikmesi raporlanır. --spawn ile servis aynı süreçte başlatılır.
+#
+#  Kullanım:
+#    python inference_service.py --port 8080 &
+#    python load_test.py --url http://127.0.0.1:8080 --endpoint identify --concurrency 32 --requests 500
+#    python load_test.py --spawn --endpoint identify --file ornek.wav
+
+ENDPOINTS = ("identify", "transcribe", "emotion")
+
+
+## Uç nokta için istek gövdesi
+#  @param file Ses dosyası (None ise sentetik 3 saniyelik ses)
+def payload(endpoint, file=None, text="Bugün harika bir gün, çok mutluyum."):
+    if endpoint == "emotion":
+        return json.dumps({'text': text}, ensure_ascii=False).encode('utf-8')
+    if file is not None:
+        with open(file, 'rb') as f:
+            return f.read()
+    import soundfile as sf
+    from benchmark import synthetic_audio
+
+    buffer = io.BytesIO()
+    sf.write(buffer, synthetic_audio(3.0, 16000), 16000, format='WAV', subtype='PCM_16')
+    return buffer.getvalue()
+
+
+async def _read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode('latin-1').split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    headers = {name.strip().lower(): value.strip()
+               for name, value in (line.split(":", 1) for line in lines[1:] if ":" in line)}
+    await reader.readexactly(int(headers.get('content-length') or 0))
+    return status, headers.get('connection', '').lower() != 'close'
+
+
+async def _client(url, path, body, remaining, results):
+    reader = writer = None
+    request = (f"POST {path} HTTP/1.1\r\nHost: {url.hostname}\r\nContent-Length: {len(body)}\r\n"
+               f"Content-Type: application/octet-stream\r\n\r\n").encode('latin-1') + body
+    try:
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            if writer is None:
+                reader, writer = await asyncio.open_connection(url.hostname, url.port)
+            started = time.perf_counter()
+            try:
+                writer.write(request)
+                await writer.drain()
+                status, keep_alive = await _read_response(reader)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                status, keep_alive = 0, False
+            results.append((status, time.perf_counter() - started))
+            if not keep_alive:
+                writer.close()
+                writer = None
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+## Yük testini çalıştırır
+#  @param url Servisin taban adresi
+#  @param concurrency Eşzamanlı bağlantı sayısı
+#  @param requests Toplam istek sayısı
+#  @return Özet sözlüğü
+async def run(url, endpoint="identify", body=None, concurrency=16, requests=200, query=""):
+    parsed = urllib.parse.urlsplit(url)
+    path = f"/{endpoint}" + (f"?{query}" if query else "")
+    body = body if body is not None else payload(endpoint)
+    remaining = [requests]
+    results = []
+    started = time.perf_counter()
+    await asyncio.gather(*(_client(parsed, path, body, remaining, results) for _ in range(concurrency)))
+    return summarize(results, time.perf_counter() - started, concurrency)
+
+
+## Sonuçlardan durum dağılımı, çıktı hızı ve gecikme yüzdeliklerini hesaplar
+def summarize(results, elapsed, concurrency):
+    statuses = collections.Counter(status for status, _ in results)
+    latencies = np.array([latency for status, latency in results if status == 200])
+    summary = {
+        'requests': len(results),
+        'concurrency': concurrency,
+        'seconds': elapsed,
+        'statuses': {str(status): n for status, n in sorted(statuses.items())},
+        'throughput_rps': statuses.get(200, 0) / elapsed if elapsed else 0.0,
+        'rejected_ratio': statuses.get(503, 0) / len(results) if results else 0.0,
+    }
+    if len(latencies):
+        for q in (50, 95, 99):
+            summary[f'p{q}_ms'] = float(np.percentile(latencies, q) * 1000)
+    return summary
+
+
+def format_summary(summary):
+    lines = [f"{summary['requests']} istek, {summary['concurrency']} bağlantı, {summary['seconds']:.2f} sn",
+             "Durum kodları: " + ", ".join(f"{status}: {n}" for status, n in summary['statuses'].items()),
+             f"Başarılı istek/sn: {summary['throughput_rps']:.1f}, reddedilen oranı: {summary['rejected_ratio']:.1%}"]
+    if 'p50_ms' in summary:
+        lines.append(f"Gecikme p50: {summary['p50_ms']:.1f} ms, p95: {summary['p95_ms']:.1f} ms, "
+                     f"p99: {summary['p99_ms']:.1f} ms")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Çıkarım servisi için yük testi")
+    parser.add_argument("--url", default="http://127.0.0.1:8080", help="Servis adresi")
+    parser.add_argument("--spawn", action="store_true", help="Servisi bu süreçte rastgele bir portta başlat")
+    parser.add_argument("--workers", type=int, default=None, help="--spawn: öznitelik çıkarma süreç sayısı")
+    parser.add_argument("--queue-size", type=int, default=None, help="--spawn: kuyruk boyutu")
+    parser.add_argument("--endpoint", choices=ENDPOINTS, default="identify", help="Test edilecek uç nokta")
+    parser.add_argument("--file", default=None, help="Gönderilecek ses dosyası (varsayılan: sentetik ses)")
+    parser.add_argument("--query", default="", help="İsteğe eklenecek sorgu (ör. transcribe=1)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Eşzamanlı bağlantı sayısı")
+    parser.add_argument("--requests", type=int, default=200, help="Toplam istek sayısı")
+    parser.add_argument("--output", default=None, help="Özetin yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    stop = None
+    url = args.url
+    if args.spawn:
+        from inference_service import DEFAULT_QUEUE_SIZE, InferenceService, run_in_thread
+
+        service = InferenceService(workers=args.workers, max_queue=args.queue_size or DEFAULT_QUEUE_SIZE)
+        _, url, stop = run_in_thread(service)
+    try:
+        result = asyncio.run(run(url, args.endpoint, payload(args.endpoint, args.file), args.concurrency,
+                                 args.requests, args.query))
+    finally:
+        if stop is not None:
+            stop()
+    print(format_summary(result))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
@@ -1,255 +1,281 @@
-import os
-import resampy
+import argparse
 from collections import defaultdict
-import matplotlib.pyplot as plt
 import numpy as np
-import librosa
-import sounddevice as sd
-from sklearn.svm import SVC
-from sklearn.metrics import accuracy_score, classification_report, precision_score, recall_score, f1_score
-import librosa.display
 import speech_recognition as sr
-from sklearn.preprocessing import StandardScaler
-import pyaudio
-from textblob import TextBlob
-from transformers import pipeline
+import model_registry
+import compact_model
+import instrumentation
+import training
+import dataset
+from instrumentation import span, trace
+from audio_features import SAMPLE_RATE, reduce_noise, extract_features, feature_params, FeatureSpec, N_MFCC
+from batch_extract import extract_batch, PLOT_MODES
+from plotting import plot_histogram, plot_mel_spectrogram
+from streaming import MicrophoneSource, StreamingRecognizer, make_predictor
+from enrollment import EnrollmentStore, enrollment_path
+from transcription import TranscriptionTimeout
+from decoded_audio import DecodedAudio
 
 ## @package ses_tanima
 #  Ses Tanıma Projesi
 #  @version 1.0
 #  @date 2023
+#
+#  Ağır kütüphaneler (transformers, sklearn, matplotlib, pyaudio) ve modeller
+#  ilk kullanıldıkları anda yüklenir; bkz. model_registry.
 
 
-import os
-from transformers import pipeline
-
-# TensorFlow optimizasyon uyarısını kapatıyoruz
-os.environ["TF_ENABLE_ONEDNN_OPTS"] = "0"
-
-# Transformers duygu analizi modeli
-emotion_classifier = pipeline("sentiment-analysis", model="distilbert-base-uncased-finetuned-sst-2-english")
-
-# Daha fazla kod...
-
-
-# Pyaudio modülünün çalışıp çalışmadığını kontrol edin
-print(pyaudio.__version__)
-
-# Transformers duygu analizi modeli
-emotion_classifier = pipeline("sentiment-analysis")
-
-## Gürültü azaltma için bir fonksiyon
-#  @param audio Ses verisi
-#  @param sr Örnekleme oranı
-#  @return Gürültüsü azaltılmış ses verisi
-# Gürültü azaltma için bir fonksiyon tanımlayalım
-def reduce_noise(audio, sr):
-    return librosa.effects.remix(audio, intervals=librosa.effects.split(audio, top_db=30))
-
-
-## Öznitelik çıkartmak için bir fonksiyon
-#  @param file_path Ses dosyasının yolu
-#  @return Öznitelik vektörü, ses verisi, örnekleme oranı
-
-# Öznitelik çıkartmak için bir fonksiyon tanımlayalım
-def extract_features(file_path):
-    try:
-        audio, sample_rate = librosa.load(file_path, res_type='kaiser_fast')
-        audio = reduce_noise(audio, sample_rate)
-        mfccs = librosa.feature.mfcc(y=audio, sr=sample_rate, n_mfcc=10)
-        mfccs_mean = np.mean(mfccs.T, axis=0)
-        return mfccs_mean, audio, sample_rate
-    except Exception as e:
-        print(f"Error encountered while parsing file: {file_path}")
-        return None, None, None
-
-def extract_features_from_audio(audio, sample_rate):
-    try:
-        audio = reduce_noise(audio, sample_rate)
-        mfccs = librosa.feature.mfcc(y=audio, sr=sample_rate, n_mfcc=10)
-        mfccs_mean = np.mean(mfccs.T, axis=0)
-        return mfccs_mean
-    except Exception as e:
-        print("Error encountered while extracting features from audio")
-        return None
-
 def analyze_emotions_with_textblob(text):
+    from textblob import TextBlob
+
     blob = TextBlob(text)
     sentiment = blob.sentiment
     emotion = "Mutlu" if sentiment.polarity > 0 else "Üzgün/Öfkeli" if sentiment.polarity < 0 else "Nötr"
     return emotion, sentiment.polarity
 
 def analyze_emotions_with_transformers(text):
-    result = emotion_classifier(text)[0]
+    # Transformers duygu analizi modeli (ilk çağrıda yüklenir, istekler toplu işlenir ve önbelleklenir)
+    with span("emotion"):
+        result = model_registry.get("sentiment_batcher").classify(text)[0]
     return result['label'], result['score']
 
-def plot_histogram(features, speaker_label):
-    plt.figure(figsize=(10, 4))
-    plt.bar(range(len(features)), features, alpha=0.7)
-    plt.title(f"MFCC Histogram for {speaker_label}")
-    plt.xlabel("MFCC Coefficients")
-    plt.ylabel("Mean Amplitude")
-    plt.show()
-
-def plot_mel_spectrogram(audio, sr, speaker_label):
-    S = librosa.feature.melspectrogram(y=audio, sr=sr, n_mels=128)
-    S_DB = librosa.power_to_db(S, ref=np.max)
-
-    plt.figure(figsize=(10, 4))
-    librosa.display.specshow(S_DB, sr=sr, x_axis='time', y_axis='mel')
-    plt.colorbar(format='%+2.0f dB')
-    plt.title(f"Mel-Frequency Spectrogram for {speaker_label}")
-    plt.tight_layout()
-    plt.show()
-
-# Ses dosyasını metne dönüştürme
-def transcribe_speech(audio, sample_rate):
-    recognizer = sr.Recognizer()
-    with sr.AudioFile(audio) as source:
-        audio_data = recognizer.record(source)
-        try:
-            text = recognizer.recognize_google(audio_data, language='tr-TR')
-            return text
-        except sr.UnknownValueError:
-            print("Google Web Speech herhangi bir şey anlamadı")
-        except sr.RequestError as e:
-            print(f"Google Web Speech hizmetinden sonuç alınamadı; {e}")
-    return ""
-
-# Ses dosyaları ve etiketleri
-ses_dosyalari = [
-    "C:/Users/ASUS/Desktop/Project/School/ses-projesi/speaker1/omer-sound1.wav",
-    "C:/Users/ASUS/Desktop/Project/School/ses-projesi/speaker1/omer-sound2.wav",
-    "C:/Users/ASUS/Desktop/Project/School/ses-projesi/speaker2/yusuf-sound1.wav",
-    "C:/Users/ASUS/Desktop/Project/School/ses-projesi/speaker2/yusuf-sound2.wav",
-    "C:/Users/ASUS/Desktop/Project/School/ses-projesi/speaker3/berk-sound1.wav",
-    "C:/Users/ASUS/Desktop/Project/School/ses-projesi/speaker3/berk-sound2.wav",
-    "C:/Users/ASUS/Desktop/Project/School/ses-projesi/speaker4/selman1.wav",
-    "C:/Users/ASUS/Desktop/Project/School/ses-projesi/speaker4/selmen2.wav",
-]
-
-konusmaci_etiketleri = [
-    "konusmaci1", "konusmaci1",
-    "konusmaci2", "konusmaci2",
-    "konusmaci3", "konusmaci3",
-    "konusmaci4", "konusmaci4",
-]
-
-X = []  # Öznitelik vektörleri
-y = []  # Etiketler
-
-# Örnek bir döngü ile veri setini dolaşalım
-for file_path, label in zip(ses_dosyalari, konusmaci_etiketleri):
-    print("Dosya Yolu:", file_path)
-    # Öznitelikleri çıkart
-    features, audio, sample_rate = extract_features(file_path)
-    if features is not None:
-        print("Çıkarılan Öznitelikler:", features)
-        # Öznitelik vektörünü X listesine ekle
-        X.append(features)
-        # Konuşmacının etiketini y listesine ekle
-        y.append(label)
-        # Konuşmacının histogramını oluştur
-        plot_histogram(features, label)
-        # Mel frekans spektrogramını oluştur
-        plot_mel_spectrogram(audio, sample_rate, file_path)
-        print("X Listesi:", X)
-        print("y Listesi:", y)
-    print("---------------------------------")
-
-# Her sınıf için en az bir örnek gerekliliği
-test_size = max(0.2, 3 / len(y))
-
-konuşmacı_indeksleri = defaultdict(list)
-for idx, label in enumerate(konusmaci_etiketleri):
-    konuşmacı_indeksleri[label].append(idx)
-
-# Veriyi eğitim ve test setlerine ayırma
-X_train, X_test, y_train, y_test = [], [], [], []
-for konuşmacı, indeksler in konuşmacı_indeksleri.items():
-    train_size = int(len(indeksler) * (1 - test_size))
-    train_indeksler = indeksler[:train_size]
-    test_indeksler = indeksler[train_size:]
-    X_train.extend([X[i] for i in train_indeksler])
-    X_test.extend([X[i] for i in test_indeksler])
-    y_train.extend([y[i] for i in train_indeksler])
-    y_test.extend([y[i] for i in test_indeksler])
-
-# Destek Vektör Makineleri (SVM) sınıflandırıcısını seçme ve eğitme
-scaler = StandardScaler()
-X_train_scaled = scaler.fit_transform(X_train)
-X_test_scaled = scaler.transform(X_test)
-
-model = SVC(kernel='linear')
-model.fit(X_train_scaled, y_train)
-
-# Eğitim ve test setlerindeki doğruluk skorunu yazdır
-train_accuracy = model.score(X_train_scaled, y_train)
-test_accuracy = model.score(X_test_scaled, y_test)
-print(f"Training Accuracy: {train_accuracy}")
-print(f"Test Accuracy: {test_accuracy}")
-
-# Test setindeki tahminleri al
-y_pred = model.predict(X_test_scaled)
-
-# Tahminleri ve gerçek etiketleri karşılaştırın
-print(f"Gerçek Etiketler: {y_test}")
-print(f"Tahmin Edilen Etiketler: {y_pred}")
-
-# Sınıflandırma raporunu yazdırın
-print("Classification Report:")
-print(classification_report(y_test, y_pred, zero_division=0))
-
-# Modelin doğruluğunu test etme
-accuracy = accuracy_score(y_test, y_pred)
-precision = precision_score(y_test, y_pred, average='macro', zero_division=0)
-recall = recall_score(y_test, y_pred, average='macro', zero_division=0)
-f1 = f1_score(y_test, y_pred, average='macro', zero_division=0)
-print("Model Doğruluğu:", accuracy)
-print("Model Precision (Kesinlik):", precision)
-print("Model Recall (Duyarlılık):", recall)
-print("Model F1 Skoru:", f1)
+## Veri setinden öznitelikleri çıkartır
+#  @param entries (dosya, etiket) çiftleri; bkz. dataset.iter_entries
+#  @param workers İşçi süreç sayısı
+#  @param plots Çizim modu ("off", "file", "show")
+#  @param plot_dir Grafiklerin yazılacağı dizin
+#  @param report_path Hata raporunun yazılacağı dosya
+#  @param spec Öznitelik tanımı (None ise DEFAULT_SPEC)
+#  @return Öznitelik vektörleri ve etiketler
+def build_dataset(entries, workers=None, plots="show", plot_dir="plots", report_path=None, spec=None):
+    file_paths = [path for path, _ in entries]
+    labels = [label for _, label in entries]
+    results, report = extract_batch(file_paths, labels, workers=workers,
+                                    plots=plots, plot_dir=plot_dir, report_path=report_path, spec=spec)
+    X = [features for _, _, features in results]
+    y = [label for _, label, _ in results]
+    print(f"{len(X)} dosyadan öznitelik çıkarıldı ({len(set(y))} konuşmacı)")
+    if report:
+        print(f"{len(report)} dosya işlenemedi, ayrıntılar raporda: {report_path}")
+    return X, y
+
+## Modeli eğitir ve test metriklerini yazdırır
+#  @param X Öznitelik vektörleri
+#  @param y Etiketler
+#  @return Eğitilmiş model ve scaler
+def train_model(X, y):
+    from sklearn.svm import SVC
+    from sklearn.metrics import accuracy_score, classification_report, precision_score, recall_score, f1_score
+    from sklearn.preprocessing import StandardScaler
+
+    # Her sınıf için en az bir örnek gerekliliği
+    test_size = max(0.2, 3 / len(y))
+
+    konuşmacı_indeksleri = defaultdict(list)
+    for idx, label in enumerate(y):
+        konuşmacı_indeksleri[label].append(idx)
+
+    # Veriyi eğitim ve test setlerine ayırma
+    X_train, X_test, y_train, y_test = [], [], [], []
+    for konuşmacı, indeksler in konuşmacı_indeksleri.items():
+        train_size = int(len(indeksler) * (1 - test_size))
+        train_indeksler = indeksler[:train_size]
+        test_indeksler = indeksler[train_size:]
+        X_train.extend([X[i] for i in train_indeksler])
+        X_test.extend([X[i] for i in test_indeksler])
+        y_train.extend([y[i] for i in train_indeksler])
+        y_test.extend([y[i] for i in test_indeksler])
+
+    # Destek Vektör Makineleri (SVM) sınıflandırıcısını seçme ve eğitme
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train)
+    X_test_scaled = scaler.transform(X_test)
+
+    model = SVC(kernel='linear')
+    model.fit(X_train_scaled, y_train)
+
+    # Eğitim ve test setlerindeki doğruluk skorunu yazdır
+    train_accuracy = model.score(X_train_scaled, y_train)
+    test_accuracy = model.score(X_test_scaled, y_test)
+    print(f"Training Accuracy: {train_accuracy}")
+    print(f"Test Accuracy: {test_accuracy}")
+
+    # Test setindeki tahminleri al
+    y_pred = model.predict(X_test_scaled)
+
+    # Tahminleri ve gerçek etiketleri karşılaştırın
+    print(f"Gerçek Etiketler: {y_test}")
+    print(f"Tahmin Edilen Etiketler: {y_pred}")
+
+    # Sınıflandırma raporunu yazdırın
+    print("Classification Report:")
+    print(classification_report(y_test, y_pred, zero_division=0))
+
+    # Modelin doğruluğunu test etme
+    accuracy = accuracy_score(y_test, y_pred)
+    precision = precision_score(y_test, y_pred, average='macro', zero_division=0)
+    recall = recall_score(y_test, y_pred, average='macro', zero_division=0)
+    f1 = f1_score(y_test, y_pred, average='macro', zero_division=0)
+    print("Model Doğruluğu:", accuracy)
+    print("Model Precision (Kesinlik):", precision)
+    print("Model Recall (Duyarlılık):", recall)
+    print("Model F1 Skoru:", f1)
+    return model, scaler
 
 # Mikrofondan anlık konuşmayı tanımlama
-def recognize_from_microphone():
+def recognize_from_microphone(model, scaler, spec=None):
     recognizer = sr.Recognizer()
     with sr.Microphone() as source:
         print("Konuşmanızı bekliyorum...")
         audio_data = recognizer.listen(source)
-        try:
-            text = recognizer.recognize_google(audio_data, language='tr-TR')
-            print("Mikrofon Metin:", text)
-
-            # Anlık ses verisini işle
-            audio = np.frombuffer(audio_data.get_wav_data(), np.int16).astype(np.float32)
-            audio = librosa.util.buf_to_float(audio)
-            sample_rate = 16000  # Mikrofon örnekleme oranı (standart olarak 16000 Hz)
-
-            features = extract_features_from_audio(audio, sample_rate)
-            if features is not None:
-                features = np.array(features).reshape(1, -1)
+    with trace("microphone") as spans:
+        _recognize_audio_data(model, scaler, audio_data, spec)
+    if instrumentation.is_enabled():
+        print("Aşama süreleri:")
+        print("\n".join(instrumentation.format_trace(spans)))
+
+# Kaydedilen konuşmadan konuşmacıyı, metni ve duyguyu çıkarır
+def _recognize_audio_data(model, scaler, audio_data, spec=None):
+    # Konuşma tanıma arka planda çalışırken konuşmacı tanıma yapılır
+    transcriber = model_registry.get("transcriber")
+    text_future = transcriber.submit(audio_data)
+    try:
+        # Anlık ses verisini bir kez çöz, öznitelikleri eğitimdeki kanonik oranda çıkar
+        decoded = DecodedAudio.from_audio_data(audio_data)
+        features, analysis = decoded.features_and_analysis(SAMPLE_RATE, spec)
+        if features is not None:
+            features = np.array(features).reshape(1, -1)
+            with span("scaler.transform"):
                 features_scaled = scaler.transform(features)
+            with span("predict"):
                 prediction = model.predict(features_scaled)
-                print(f"Tahmin Edilen Konuşmacı: {prediction[0]}")
-                plot_histogram(features.flatten(), prediction[0])
-                plot_mel_spectrogram(audio, sample_rate, prediction[0])
 
-                # Kelime sayma
-                word_count = len(text.split())
-                print("Kelime Sayısı:", word_count)
-
-                # Duygu analizi
-                emotion, score = analyze_emotions_with_transformers(text)
-                print(f"Duygu: {emotion}, Güven: {score}")
-        except sr.UnknownValueError:
-            print("Google Web Speech herhangi bir şey anlamadı")
-        except sr.RequestError as e:
-            print(f"Google Web Speech hizmetinden sonuç alınamadı; {e}")
-
-# Anlık konuşmayı tanımla
-recognize_from_microphone()
-
-import joblib
-
-# Save the model and scaler
-joblib.dump((model, scaler), 'VoiceRecognizeModel.joblib')
+        text = transcriber.result(text_future)
+        print("Mikrofon Metin:", text)
+
+        if features is not None:
+            print(f"Tahmin Edilen Konuşmacı: {prediction[0]}")
+            plot_histogram(features.flatten(), prediction[0])
+            plot_mel_spectrogram(analysis, prediction[0])
+
+            # Kelime sayma
+            word_count = len(text.split())
+            print("Kelime Sayısı:", word_count)
+
+            # Duygu analizi
+            emotion, score = analyze_emotions_with_transformers(text)
+            print(f"Duygu: {emotion}, Güven: {score}")
+    except sr.UnknownValueError:
+        print("Konuşma tanıma herhangi bir şey anlamadı")
+    except sr.RequestError as e:
+        print(f"Konuşma tanıma hizmetinden sonuç alınamadı; {e}")
+    except TranscriptionTimeout:
+        print("Konuşma tanıma zaman aşımına uğradı")
+
+# Mikrofondan akışlı (canlı) konuşmacı tanıma
+def recognize_from_microphone_streaming(model, scaler, duration, emit_ms=500, spec=None):
+    source = MicrophoneSource(sample_rate=SAMPLE_RATE, duration=duration)
+    recognizer = StreamingRecognizer(make_predictor(model, scaler), source.sample_rate, emit_ms=emit_ms,
+                                     spec=spec)
+    print("Konuşmanızı dinliyorum...")
+    try:
+        for timestamp, prediction, latency in recognizer.run(source):
+            print(f"[{timestamp:6.2f} sn] Tahmin Edilen Konuşmacı: {prediction} (gecikme: {latency * 1000:.1f} ms)")
+    finally:
+        source.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Konuşmacı tanıma modelini eğitir")
+    parser.add_argument("--data", default=".",
+                        help="Konuşmacı alt dizinlerini içeren kök dizin veya \"yol,etiket\" satırlı CSV listesi")
+    parser.add_argument("--speaker-glob", default="speaker*",
+                        help="Kök dizinde konuşmacı sayılacak alt dizinlerin kalıbı (CSV listesinde kullanılmaz)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Öznitelik çıkarma için işçi süreç sayısı (varsayılan: çekirdek sayısı)")
+    parser.add_argument("--plots", choices=PLOT_MODES, default="show",
+                        help="Çizim modu: show (ekran), file (PNG dosyaları) veya off")
+    parser.add_argument("--plot-dir", default="plots", help="file modunda grafiklerin yazılacağı dizin")
+    parser.add_argument("--report", default="extraction_report.json", help="İşlenemeyen dosyaların raporu")
+    parser.add_argument("--no-microphone", action="store_true", help="Eğitimden sonra mikrofon testini atla")
+    parser.add_argument("--stream", type=float, default=None, metavar="SANIYE",
+                        help="Mikrofon testini verilen süre boyunca akışlı modda yap")
+    parser.add_argument("--cv", type=int, default=0, metavar="K",
+                        help="K-katlı çapraz doğrulama ile hiperparametre araması (ör. 5; varsayılan 0: "
+                             "doğrusal SVC ile tek eğitim/test bölmesi)")
+    parser.add_argument("--jobs", type=int, default=-1, help="Arama için paralel iş sayısı (-1: tüm çekirdekler)")
+    parser.add_argument("--seed", type=int, default=0, help="Çapraz doğrulama katlarının tohumu")
+    parser.add_argument("--training-report", default="training_report.json", help="Eğitim metrikleri raporu")
+    parser.add_argument("--feature-matrix", default=None,
+                        help="Öznitelik matrisinin saklanacağı .npz dosyası (aynı veriyle tekrar eğitimde okunur)")
+    parser.add_argument("--out-of-core", action="store_true",
+                        help="Öznitelikleri parça parça işleyip doğrusal SVM'i artımlı eğit (büyük veri setleri için)")
+    parser.add_argument("--chunk-size", type=int, default=dataset.DEFAULT_CHUNK_SIZE,
+                        help="--out-of-core: bellekte aynı anda tutulan dosya sayısı")
+    parser.add_argument("--epochs", type=int, default=dataset.DEFAULT_EPOCHS, help="--out-of-core: eğitim turu sayısı")
+    parser.add_argument("--validation", type=float, default=dataset.DEFAULT_VALIDATION,
+                        help="--out-of-core: doğrulamaya ayrılan oran")
+    parser.add_argument("--enroll-training", action="store_true",
+                        help="Eğitim konuşmacılarını kayıt deposuna da ekle (yalnızca SES_SPEAKER_BACKEND=index için; "
+                             "varsayılan: depoda yalnızca sonradan kaydedilen konuşmacılar olur)")
+    parser.add_argument("--n-mfcc", type=int, default=N_MFCC, help="MFCC katsayı sayısı")
+    parser.add_argument("--deltas", type=int, choices=(0, 1, 2), default=0,
+                        help="Öznitelik türevleri: 0 (yok), 1 (delta), 2 (delta ve delta-delta)")
+    parser.add_argument("--pooling", default="mean",
+                        help="Havuzlama istatistikleri, virgülle ayrılmış (mean, std, min, max, p10, p90...)")
+    parser.add_argument("--timing", action="store_true",
+                        help="Aşama sürelerini ölç (SES_TIMING=1 ile aynı; SES_TIMING_PROM dosyasına da yazar)")
+    args = parser.parse_args()
+    if args.timing:
+        instrumentation.enable()
+    # Öznitelik tanımı model dosyasına yazılır; tahmin tarafı aynı tanımı kullanır
+    spec = FeatureSpec.parse(args.pooling, args.n_mfcc, args.deltas)
+    params = feature_params(spec=spec)
+
+    entries = list(dataset.iter_entries(args.data, args.speaker_glob))
+    if not entries:
+        parser.error(f"{args.data} içinde ses dosyası bulunamadı")
+    if args.out_of_core:
+        store = EnrollmentStore(spec.dim)
+        model, scaler, training_report = dataset.train_incremental(
+            entries, chunk_size=args.chunk_size, epochs=args.epochs, validation=args.validation,
+            workers=args.workers, spec=spec, seed=args.seed, store=store, store_speakers=args.enroll_training)
+        training_report['feature_params'] = params
+        training.write_report(training_report, args.training_report)
+        validation = training_report.get('validation')
+        if validation:
+            print(f"Doğrulama doğruluğu: {validation['accuracy']:.3f}")
+    else:
+        X, y = training.load_or_extract(
+            [path for path, _ in entries], [label for _, label in entries], args.feature_matrix,
+            lambda: build_dataset(entries, workers=args.workers, plots=args.plots, plot_dir=args.plot_dir,
+                                  report_path=args.report, spec=spec),
+            params)
+        if args.cv:
+            model, scaler, training_report = training.search(X, y, folds=args.cv, n_jobs=args.jobs, seed=args.seed)
+            training_report['feature_params'] = params
+            training.write_report(training_report, args.training_report)
+            training.print_summary(training_report)
+        else:
+            model, scaler = train_model(X, y)
+        # Depo eğitim verisinin ölçekleme istatistikleriyle başlar; konuşmacılar yalnızca açıkça istenirse eklenir
+        if args.enroll_training:
+            store = EnrollmentStore.from_training(X, y)
+        else:
+            store = EnrollmentStore(len(X[0]))
+            store.observe(X)
+
+    # Anlık konuşmayı tanımla
+    if args.stream is not None:
+        recognize_from_microphone_streaming(model, scaler, args.stream, spec=spec)
+    elif not args.no_microphone:
+        recognize_from_microphone(model, scaler, spec)
+
+    import joblib
+
+    # Save the model and scaler (tahminde aynı oran ve öznitelik tanımının kullanılması için parametreleriyle)
+    joblib.dump((model, scaler, params), 'VoiceRecognizeModel.joblib')
+    # Tahmin için sklearn gerektirmeyen, scaler'ı ağırlıklara katlanmış küçük model dosyası
+    compact_model.export(model, scaler, params, 'VoiceRecognizeModel.joblib')
+    # Artımlı kayıt deposu (web arayüzü ve servis yeni konuşmacıları buna ekler)
+    store.save(enrollment_path('VoiceRecognizeModel.joblib'))
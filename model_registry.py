@@ -0,0 +1,190 @@
+import os
+import sys
+import threading
+import time
+
+## @package model_registry
+#  Modellerin tembel (lazy) yüklendiği süreç genelindeki kayıt defteri
+#
+#  Her model ilk kullanıldığında yüklenir ve süreç boyunca önbellekte tutulur.
+#  Streamlit betiği her etkileşimde yeniden çalıştırsa da içe aktarılan
+#  modüller sys.modules içinde kaldığı için önbellek yeniden çalıştırmalar
+#  arasında korunur. Ağır kütüphaneler (transformers, joblib) yükleyici
+#  fonksiyonların içinde içe aktarılır. Bir dosyaya bağlı kaydedilen modeller,
+#  dosyanın değişiklik zamanı değiştiğinde otomatik olarak yeniden yüklenir.
+
+# Varsayılan konuşmacı modeli dosyası
+MODEL_PATH = 'VoiceRecognizeModel.joblib'
+# Konuşmacı tanıma arka ucu: "model" (varsayılan) veya "index"; bkz. speaker_index.SpeakerIdentifier
+SPEAKER_BACKEND = os.environ.get("SES_SPEAKER_BACKEND", "model")
+
+_loaders = {}
+_watch_paths = {}
+_instances = {}
+_load_times = {}
+_mtimes = {}
+_locks = {}
+_registry_lock = threading.Lock()
+
+
+## Yeni bir model yükleyicisi kaydeder
+#  @param name Model adı
+#  @param loader Argümansız, modeli döndüren fonksiyon
+#  @param watch_path Verilirse bu dosya değiştiğinde model yeniden yüklenir
+def register(name, loader, watch_path=None):
+    with _registry_lock:
+        _loaders[name] = loader
+        _watch_paths[name] = watch_path
+        _locks.setdefault(name, threading.Lock())
+        _instances.pop(name, None)
+
+
+def _mtime(name):
+    path = _watch_paths.get(name)
+    if path is None:
+        return None
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+## Modeli döndürür; ilk çağrıda (veya izlenen dosya değiştiğinde) yükler
+#  @param name Model adı
+#  @return Yüklenmiş model nesnesi
+def get(name):
+    if name not in _loaders:
+        raise KeyError(f"Kayıtlı olmayan model: {name}")
+    mtime = _mtime(name)
+    if name in _instances and _mtimes.get(name) == mtime:
+        return _instances[name]
+    with _locks[name]:
+        if name not in _instances or _mtimes.get(name) != mtime:
+            started = time.perf_counter()
+            _instances[name] = _loaders[name]()
+            _load_times[name] = time.perf_counter() - started
+            _mtimes[name] = mtime
+    return _instances[name]
+
+
+## Model yüklenmiş mi?
+def is_loaded(name):
+    return name in _instances
+
+
+## Yüklenen modellerin yükleme süreleri (saniye)
+def load_times():
+    return dict(_load_times)
+
+
+## Model yükleyicisini kayıttan ve önbellekten kaldırır
+def unregister(name):
+    with _registry_lock:
+        for table in (_loaders, _watch_paths, _instances, _load_times, _mtimes, _locks):
+            table.pop(name, None)
+
+
+## Önbellekteki modeli (veya tüm modelleri) bırakır; sonraki get yeniden yükler
+def clear(name=None):
+    with _registry_lock:
+        if name is None:
+            _instances.clear()
+            _load_times.clear()
+        else:
+            _instances.pop(name, None)
+            _load_times.pop(name, None)
+
+
+## Konuşmacı modeli ve kayıt indeksinden tanıma arka ucunu kurar (ikisi de önbellekten gelir)
+#  @param backend "model" veya "index" (None ise SPEAKER_BACKEND)
+#  @param get Model adı -> model döndüren fonksiyon
+def speaker_identifier(backend=None, get=get):
+    from speaker_index import SpeakerIdentifier
+
+    model, scaler = get("speaker_model")[:2]
+    return SpeakerIdentifier(model, scaler, get("speaker_index"), backend or SPEAKER_BACKEND)
+
+
+## Konuşmacı modeli dosyasını değiştirir; model, kayıt deposu ve indeks bu dosyadan
+#  ve yanındaki kayıt dosyasından yüklenir ve izlenir (önbellekteki örnekler bırakılır)
+def set_model_path(path):
+    global MODEL_PATH
+    MODEL_PATH = path
+    _register_speaker_models()
+
+
+def _register_speaker_models():
+    enrollment_file = os.path.splitext(MODEL_PATH)[0] + '.enroll.npz'
+    register("speaker_model", _load_speaker_model, watch_path=MODEL_PATH)
+    register("enrollment", _load_enrollment_store, watch_path=enrollment_file)
+    register("speaker_index", _load_speaker_index, watch_path=enrollment_file)
+
+
+def _load_enrollment_store():
+    from enrollment import EnrollmentStore, enrollment_path
+
+    path = enrollment_path(MODEL_PATH)
+    if os.path.exists(path):
+        return EnrollmentStore.load(path)
+    # Boş depo, modelin öznitelik tanımındaki boyutla oluşturulur
+    from audio_features import FeatureSpec
+
+    return EnrollmentStore(FeatureSpec.from_params(get("speaker_model")[2]).dim)
+
+
+def _load_speaker_index():
+    from speaker_index import SpeakerIndex
+
+    return SpeakerIndex.from_store(get("enrollment"))
+
+
+# (model, scaler, öznitelik parametreleri); küçük model dosyası varsa sklearn yüklenmez
+def _load_speaker_model():
+    from compact_model import load_artifact
+
+    return load_artifact(MODEL_PATH)
+
+
+def _load_sentiment_classifier():
+    from transformers import pipeline
+
+    return pipeline("sentiment-analysis", model="distilbert-base-uncased-finetuned-sst-2-english")
+
+
+def _load_emotion_classifier():
+    from transformers import pipeline
+
+    return pipeline("text-classification", model="bhadresh-savani/distilbert-base-uncased-emotion")
+
+
+def _load_transcriber():
+    from transcription import TranscriptionExecutor, get_backend
+
+    return TranscriptionExecutor(get_backend())
+
+
+def _batcher_for(name):
+    def load():
+        from emotion_batcher import EmotionBatcher
+
+        return EmotionBatcher(get(name))
+    return load
+
+
+# TensorFlow optimizasyon uyarısını kapatıyoruz
+os.environ.setdefault("TF_ENABLE_ONEDNN_OPTS", "0")
+
+_register_speaker_models()
+register("sentiment", _load_sentiment_classifier)
+register("emotion", _load_emotion_classifier)
+register("sentiment_batcher", _batcher_for("sentiment"))
+register("emotion_batcher", _batcher_for("emotion"))
+register("transcriber", _load_transcriber)
+
+
+# Başlangıç süresini ölçmek için: python model_registry.py speaker_model emotion
+if __name__ == "__main__":
+    names = sys.argv[1:] or ["speaker_model"]
+    for model_name in names:
+        get(model_name)
+        print(f"{model_name}: {_load_times[model_name]:.3f} sn")
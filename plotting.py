@@ -0,0 +1,43 @@
+## @package plotting
+#  MFCC histogramı ve mel spektrogramı çizimleri
+#
+#  save_path verilirse grafik dosyaya yazılır, verilmezse ekranda gösterilir.
+#  matplotlib ilk çizimde içe aktarılır.
+
+
+def _finish(save_path):
+    import matplotlib.pyplot as plt
+
+    if save_path is None:
+        plt.show()
+    else:
+        plt.savefig(save_path)
+        plt.close()
+
+
+def plot_histogram(features, speaker_label, save_path=None):
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(10, 4))
+    plt.bar(range(len(features)), features, alpha=0.7)
+    plt.title(f"MFCC Histogram for {speaker_label}")
+    plt.xlabel("MFCC Coefficients")
+    plt.ylabel("Mean Amplitude")
+    _finish(save_path)
+
+
+## Mel spektrogramını çizer
+#  @param analysis audio_features.SpectralAnalysis nesnesi (mel spektrogramı yeniden hesaplanmaz)
+def plot_mel_spectrogram(analysis, speaker_label, save_path=None):
+    import librosa.display
+    import matplotlib.pyplot as plt
+
+    S_DB = analysis.mel_db()
+
+    plt.figure(figsize=(10, 4))
+    librosa.display.specshow(S_DB, sr=analysis.sample_rate, hop_length=analysis.hop_length,
+                             x_axis='time', y_axis='mel')
+    plt.colorbar(format='%+2.0f dB')
+    plt.title(f"Mel-Frequency Spectrogram for {speaker_label}")
+    plt.tight_layout()
+    _finish(save_path)
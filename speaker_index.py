@@ -0,0 +1,137 @@
+import numpy as np
+
+## @package speaker_index
+#  Binlerce konuşmacı için vektörize tanıma
+#
+#  Her konuşmacı, ölçeklenmiş uzaydaki birim uzunluklu merkez vektörüyle
+#  temsil edilir. Sorgu, normalize edilmiş öznitelik vektörü ile bu matrisin
+#  tek bir matris-vektör çarpımıdır (kosinüs benzerliği); maliyet konuşmacı
+#  sayısıyla doğrusal artar, bire-bir (one-vs-one) SVC gibi karesel değil.
+#  SVC ile aynı predict / decision_function arayüzünü sunar.
+#
+#  Varsayılan tanıma arka ucu model dosyasındaki sınıflandırıcıdır; indeks
+#  SES_SPEAKER_BACKEND=index ile açıkça seçilir (bkz. SpeakerIdentifier).
+
+UNKNOWN_SPEAKER = "bilinmeyen"
+BACKENDS = ("model", "index")
+DEFAULT_BACKEND = "model"
+# "model" arka ucunda kayıtlı bir konuşmacının seçilmesi için gereken en düşük kosinüs benzerliği
+ENROLLED_MATCH_THRESHOLD = 0.8
+
+
+def _normalize(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class SpeakerIndex:
+    ## @param labels Konuşmacı etiketleri
+    #  @param embeddings (konuşmacı, boyut) merkez vektörleri
+    #  @param transform Sorgu vektörlerine uygulanacak ölçekleme (ör. scaler.transform)
+    #  @param threshold En iyi skor bunun altındaysa "bilinmeyen" döner (None ise kapalı)
+    def __init__(self, labels, embeddings, transform=None, threshold=None, unknown_label=UNKNOWN_SPEAKER):
+        self.labels = np.asarray(labels)
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        # Boş depoda (0, boyut) biçimi korunur
+        dim = embeddings.shape[-1] if embeddings.ndim == 2 else -1
+        self.matrix = _normalize(embeddings.reshape(len(self.labels), dim))
+        self.transform = transform
+        self.threshold = threshold
+        self.unknown_label = unknown_label
+
+    ## Kayıt deposundaki konuşmacı merkezlerinden indeks oluşturur
+    @classmethod
+    def from_store(cls, store, **kwargs):
+        labels, centers = store.centroids()
+        return cls(labels, centers, transform=store.transform, **kwargs)
+
+    ## Eğitim verisi ve scaler'dan indeks oluşturur
+    @classmethod
+    def from_training(cls, X, y, scaler, **kwargs):
+        y = np.asarray(y)
+        scaled = scaler.transform(np.asarray(X))
+        labels = np.array(list(dict.fromkeys(y)))
+        centers = np.array([scaled[y == label].mean(axis=0) for label in labels])
+        return cls(labels, centers, transform=scaler.transform, **kwargs)
+
+    @property
+    def classes_(self):
+        return self.labels
+
+    def _queries(self, X):
+        X = np.asarray(X, dtype=np.float64).reshape(-1, self.matrix.shape[1])
+        if self.transform is not None:
+            X = self.transform(X)
+        return _normalize(X).astype(np.float32)
+
+    ## Her konuşmacı için kosinüs benzerliği, (sorgu, konuşmacı) boyutlu
+    def decision_function(self, X):
+        return self._queries(X) @ self.matrix.T
+
+    ## En benzer konuşmacı; eşiğin altındaki sorgular için "bilinmeyen"
+    #  @param threshold Verilirse nesnenin eşiği yerine kullanılır
+    def predict(self, X, threshold=None):
+        scores = self.decision_function(X)
+        best = np.argmax(scores, axis=1)
+        predictions = self.labels[best].astype(object)
+        threshold = self.threshold if threshold is None else threshold
+        if threshold is not None:
+            predictions[scores[np.arange(len(best)), best] < threshold] = self.unknown_label
+        return predictions
+
+    ## Tek sorgu için en benzer top_k konuşmacı
+    #  @return (etiket, skor) çiftleri, skora göre azalan sırada
+    def search(self, x, top_k=5):
+        scores = self.decision_function(x)[0]
+        top_k = min(top_k, len(scores))
+        if top_k <= 0:
+            return []
+        candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+        candidates = candidates[np.argsort(-scores[candidates])]
+        return [(self.labels[i], float(scores[i])) for i in candidates]
+
+    ## Verilen etiketler dışındaki konuşmacılardan oluşan indeks
+    def without(self, labels):
+        keep = ~np.isin(self.labels, np.asarray(labels))
+        return SpeakerIndex(self.labels[keep], self.matrix[keep], transform=self.transform,
+                            threshold=self.threshold, unknown_label=self.unknown_label)
+
+
+## Konuşmacı tanıma arka ucu
+#  "model" (varsayılan): model dosyasındaki eğitilmiş sınıflandırıcı tahmin eder; kayıt
+#  deposunda olup modelin tanımadığı (sonradan kaydedilmiş) bir konuşmacıya benzerlik
+#  enrolled_threshold değerini aşarsa o konuşmacı döner.
+#  "index": tüm konuşmacılar kayıt deposundan kurulan indeksle tanınır; eğitim
+#  konuşmacılarının depoda olması gerekir (main.py --enroll-training).
+class SpeakerIdentifier:
+    ## @param model, scaler Model dosyasındaki sınıflandırıcı ve ölçekleyici
+    #  @param index Kayıt deposundan kurulan SpeakerIndex
+    #  @param backend "model" veya "index"
+    def __init__(self, model, scaler, index, backend=DEFAULT_BACKEND, enrolled_threshold=ENROLLED_MATCH_THRESHOLD):
+        if backend not in BACKENDS:
+            raise ValueError(f"Bilinmeyen tanıma arka ucu: {backend} (seçenekler: {', '.join(BACKENDS)})")
+        self.model = model
+        self.scaler = scaler
+        self.backend = backend
+        self.enrolled_threshold = enrolled_threshold
+        self.index = index if backend == "index" else index.without(model.classes_)
+
+    ## Tahminler, karar skorları ve skorların ait olduğu etiketler
+    #  @param threshold Bilinmeyen konuşmacı eşiği (yalnızca "index" arka ucunda)
+    def identify(self, X, threshold=None):
+        if self.backend == "index":
+            return self.index.predict(X, threshold=threshold), self.index.decision_function(X), self.index.classes_
+        scaled = self.scaler.transform(X)
+        predictions = np.asarray(self.model.predict(scaled)).astype(object)
+        scores = self.model.decision_function(scaled)
+        if len(self.index.labels):
+            enrolled = self.index.decision_function(X)
+            best = np.argmax(enrolled, axis=1)
+            matched = enrolled[np.arange(len(best)), best] >= self.enrolled_threshold
+            predictions[matched] = self.index.labels[best[matched]]
+        return predictions, scores, self.model.classes_
+
+    ## Tek sorgu için en benzer top_k kayıtlı konuşmacı ("model" arka ucunda yalnızca sonradan kaydedilenler)
+    def search(self, x, top_k=5):
+        return self.index.search(x, top_k=top_k)
@@ -0,0 +1,231 @@
+import collections
+import time
+import wave
+
+import librosa
+import numpy as np
+
+from audio_features import N_MFCC, TOP_DB, FeatureSpec
+from instrumentation import span
+
+## @package streaming
+#  Mikrofondan akışlı konuşmacı tanıma
+#
+#  Ses, sabit boyutlu bloklar hâlinde bir halka tampona okunur. Tamamlanan her
+#  STFT çerçevesi için MFCC hesaplanır ve ortalama/varyans artımlı olarak
+#  güncellenir; her emit_ms milisaniyede bir, son window_ms milisaniyenin
+#  ortalamasıyla konuşmacı tahmini üretilir. Bellek ve gecikme kayıt
+#  süresinden bağımsızdır. Model ortalamadan farklı bir öznitelik tanımıyla
+#  (türevler, std/yüzdelik havuzlama) eğitildiyse pencerenin MFCC çerçeveleri
+#  tutulur ve tahmin anında aynı tanımla havuzlanır.
+
+
+## Artımlı ortalama ve varyans (Welford / Chan birleştirme)
+class RunningStats:
+    def __init__(self, dim):
+        self.count = 0
+        self.mean = np.zeros(dim)
+        self.m2 = np.zeros(dim)
+
+    ## Bir grup gözlemi ekler
+    #  @param values (n, dim) boyutlu dizi
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+        batch_mean = values.mean(axis=0)
+        batch_m2 = ((values - batch_mean) ** 2).sum(axis=0)
+        self._merge(len(values), batch_mean, batch_m2)
+
+    ## Başka bir RunningStats nesnesini bununla birleştirir
+    def merge(self, other):
+        if other.count:
+            self._merge(other.count, other.mean, other.m2)
+
+    def _merge(self, count, mean, m2):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (count / total)
+        self.m2 = self.m2 + m2 + delta ** 2 * (self.count * count / total)
+        self.count = total
+
+    @property
+    def variance(self):
+        return self.m2 / self.count if self.count else np.zeros_like(self.m2)
+
+
+## WAV dosyasını mikrofon gibi blok blok okuyan sahte ses kaynağı (testler için)
+class WavFileSource:
+    def __init__(self, path, frames_per_buffer=1024):
+        self._wav = wave.open(path, 'rb')
+        if self._wav.getsampwidth() != 2:
+            raise ValueError("Yalnızca 16 bit PCM WAV dosyaları desteklenir")
+        self.sample_rate = self._wav.getframerate()
+        self.channels = self._wav.getnchannels()
+        self.frames_per_buffer = frames_per_buffer
+
+    ## Bir blok int16 ses verisi döndürür, dosya bittiğinde boş bayt dizisi
+    def read(self, n_frames=None):
+        return self._wav.readframes(n_frames or self.frames_per_buffer)
+
+    def close(self):
+        self._wav.close()
+
+
+## PyAudio ile mikrofondan blok blok okuyan ses kaynağı
+class MicrophoneSource:
+    def __init__(self, sample_rate=16000, frames_per_buffer=1024, duration=None):
+        import pyaudio
+
+        self.sample_rate = sample_rate
+        self.channels = 1
+        self.frames_per_buffer = frames_per_buffer
+        self._remaining = int(duration * sample_rate) if duration is not None else None
+        self._audio = pyaudio.PyAudio()
+        self._stream = self._audio.open(format=pyaudio.paInt16, channels=1, rate=sample_rate,
+                                        input=True, frames_per_buffer=frames_per_buffer)
+
+    def read(self, n_frames=None):
+        n_frames = n_frames or self.frames_per_buffer
+        if self._remaining is not None:
+            if self._remaining <= 0:
+                return b""
+            n_frames = min(n_frames, self._remaining)
+            self._remaining -= n_frames
+        return self._stream.read(n_frames, exception_on_overflow=False)
+
+    def close(self):
+        self._stream.stop_stream()
+        self._stream.close()
+        self._audio.terminate()
+
+
+## Model ve scaler'dan tek vektörlük tahmin fonksiyonu oluşturur
+def make_predictor(model, scaler):
+    def predict(features):
+        return model.predict(scaler.transform(np.asarray(features).reshape(1, -1)))[0]
+    return predict
+
+
+class StreamingRecognizer:
+    ## @param predict Öznitelik vektörünü konuşmacı etiketine çeviren fonksiyon
+    #  @param sample_rate Örnekleme oranı
+    #  @param emit_ms Tahminler arasındaki süre (milisaniye)
+    #  @param window_ms Tahminde kullanılan kayan pencere süresi (None ise tüm akış)
+    #  @param spec Modelin öznitelik tanımı (None ise n_mfcc katsayının ortalaması)
+    def __init__(self, predict, sample_rate, n_mfcc=N_MFCC, n_fft=2048, hop_length=512,
+                 emit_ms=500, window_ms=3000, top_db=TOP_DB, max_block=8192, spec=None):
+        self.predict = predict
+        self.sample_rate = sample_rate
+        self.n_mfcc = spec.n_mfcc if spec is not None else n_mfcc
+        # Yalnızca ortalama kullanan tanımlarda çerçeveler tutulmaz, artımlı istatistik yeterlidir
+        self.spec = spec if spec is not None and spec != FeatureSpec(spec.n_mfcc) else None
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.top_db = top_db
+        self.emit_samples = max(hop_length, int(sample_rate * emit_ms / 1000))
+        n_windows = None if window_ms is None else max(1, int(np.ceil(window_ms / emit_ms)))
+        # Halka tampon: son STFT çerçevesinin bağlamı + bir okuma bloğu
+        self._buffer = np.zeros(n_fft + max_block, dtype=np.float32)
+        self._filled = 0
+        self._consumed = 0
+        self._since_emit = 0
+        self._max_energy = 0.0
+        # Her emit aralığının istatistikleri ayrı tutulur, pencere bunlardan birleştirilir
+        self._segments = collections.deque(maxlen=n_windows)
+        self._current = RunningStats(self.n_mfcc)
+        self.total = RunningStats(self.n_mfcc)
+        self._frames = collections.deque(maxlen=n_windows)
+        self._current_frames = []
+
+    ## Yeni ses örneklerini işler
+    #  @param samples float32 ses örnekleri
+    #  @return Bu blok sırasında üretilen (zaman_sn, tahmin) çiftleri
+    def push(self, samples):
+        predictions = []
+        samples = np.asarray(samples, dtype=np.float32)
+        capacity = len(self._buffer)
+        while len(samples):
+            n = min(len(samples), capacity - self._filled)
+            self._buffer[self._filled:self._filled + n] = samples[:n]
+            self._filled += n
+            samples = samples[n:]
+            predictions.extend(self._process())
+        return predictions
+
+    def _process(self):
+        predictions = []
+        if self._filled < self.n_fft:
+            return predictions
+        n_frames = 1 + (self._filled - self.n_fft) // self.hop_length
+        end = self.n_fft + (n_frames - 1) * self.hop_length
+        window = self._buffer[:end]
+        frames = librosa.util.frame(window, frame_length=self.n_fft, hop_length=self.hop_length)
+        with span("streaming.mfcc"):
+            mfccs = librosa.feature.mfcc(y=window, sr=self.sample_rate, n_mfcc=self.n_mfcc,
+                                         n_fft=self.n_fft, hop_length=self.hop_length, center=False)
+        # reduce_noise'a benzer şekilde en yüksek enerjiden top_db aşağıdaki çerçeveleri at
+        energy = np.mean(frames ** 2, axis=0)
+        self._max_energy = max(self._max_energy, float(energy.max()))
+        threshold = self._max_energy * 10 ** (-self.top_db / 10)
+        voiced = energy > threshold if self._max_energy > 0 else np.ones(n_frames, dtype=bool)
+
+        # Çerçeveleri bir sonraki tahmin anına kadar gruplar hâlinde istatistiğe ekle
+        start = 0
+        while start < n_frames:
+            frames_to_emit = -(-(self.emit_samples - self._since_emit) // self.hop_length)
+            stop = min(n_frames, start + frames_to_emit)
+            selected = mfccs[:, start:stop][:, voiced[start:stop]].T
+            self._current.update(selected)
+            self.total.update(selected)
+            if self.spec is not None:
+                self._current_frames.append(selected)
+            self._since_emit += (stop - start) * self.hop_length
+            if self._since_emit >= self.emit_samples:
+                self._since_emit = 0
+                prediction = self._emit()
+                if prediction is not None:
+                    timestamp = (self._consumed + stop * self.hop_length) / self.sample_rate
+                    predictions.append((timestamp, prediction))
+            start = stop
+
+        # İşlenen örnekleri at, kalan bağlamı tamponun başına kaydır
+        shift = n_frames * self.hop_length
+        self._consumed += shift
+        remaining = self._filled - shift
+        self._buffer[:remaining] = self._buffer[shift:self._filled]
+        self._filled = remaining
+        return predictions
+
+    def _emit(self):
+        self._segments.append(self._current)
+        self._current = RunningStats(self.n_mfcc)
+        window = RunningStats(self.n_mfcc)
+        for segment in self._segments:
+            window.merge(segment)
+        if self.spec is not None:
+            self._frames.append(self._current_frames)
+            self._current_frames = []
+        if window.count == 0:
+            return None
+        if self.spec is not None:
+            features = self.spec.pool(np.vstack([frames for segment in self._frames for frames in segment]).T)
+        else:
+            features = window.mean
+        with span("streaming.predict"):
+            return self.predict(features)
+
+    ## Kaynak bitene kadar okur ve tahminleri üretir
+    #  @param source read() metodu int16 bayt döndüren ses kaynağı
+    #  @return (zaman_sn, tahmin, gecikme_sn) üçlülerini üreten generator
+    def run(self, source):
+        while True:
+            data = source.read()
+            if not data:
+                break
+            started = time.perf_counter()
+            samples = np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
+            if getattr(source, 'channels', 1) > 1:
+                samples = samples.reshape(-1, source.channels).mean(axis=1)
+            for timestamp, prediction in self.push(samples):
+                yield timestamp, prediction, time.perf_counter() - started
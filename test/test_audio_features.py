@@ -0,0 +1,68 @@
+import numpy as np
+import librosa
+import pytest
+import audio_features
+from audio_features import (DEFAULT_SPEC, LEGACY_FEATURE_PARAMS, FeatureSpec, SpectralAnalysis, feature_params,
+                            reduce_noise)
+from feature_cache import FeatureCache
+
+
+def _sample_audio(sr=16000):
+    t = np.arange(sr) / sr
+    audio = 0.5 * np.sin(2 * np.pi * 300 * t) + 0.05 * np.random.RandomState(0).randn(sr)
+    return audio.astype(np.float32), sr
+
+
+def test_spectral_analysis_matches_librosa_mfcc():
+    audio, sr = _sample_audio()
+    audio = reduce_noise(audio, sr)
+    expected = np.mean(librosa.feature.mfcc(y=audio, sr=sr, n_mfcc=10).T, axis=0)
+    features = SpectralAnalysis(audio, sr).mfcc_mean(10)
+    assert np.allclose(features, expected, rtol=1e-5, atol=1e-4), "MFCC sonuçları farklı!"
+
+
+def test_spectral_analysis_mel_db_matches_librosa():
+    audio, sr = _sample_audio()
+    expected = librosa.power_to_db(librosa.feature.melspectrogram(y=audio, sr=sr, n_mels=128), ref=np.max)
+    assert np.allclose(SpectralAnalysis(audio, sr).mel_db(), expected, atol=1e-4), "Mel spektrogramı farklı!"
+
+
+def test_feature_spec_pools_deltas_and_statistics():
+    audio, sr = _sample_audio()
+    analysis = SpectralAnalysis(reduce_noise(audio, sr), sr)
+    spec = FeatureSpec(n_mfcc=13, deltas=2, pooling=('mean', 'std', 'p10', 'p90'))
+    features = analysis.features(spec)
+    assert features.shape == (spec.dim,) == (13 * 3 * 4,)
+
+    mfcc = librosa.feature.mfcc(y=analysis.audio, sr=sr, n_mfcc=13)
+    stacked = np.vstack([mfcc, librosa.feature.delta(mfcc), librosa.feature.delta(mfcc, order=2)])
+    expected = np.concatenate([stacked.mean(axis=1), stacked.std(axis=1),
+                               np.percentile(stacked, 10, axis=1), np.percentile(stacked, 90, axis=1)])
+    assert np.allclose(features, expected, rtol=1e-5, atol=1e-3), "Havuzlanmış öznitelikler farklı!"
+
+
+def test_default_spec_matches_legacy_features():
+    audio, sr = _sample_audio()
+    analysis = SpectralAnalysis(reduce_noise(audio, sr), sr)
+    assert np.array_equal(analysis.features(), np.mean(analysis.mfcc(10).T, axis=0))
+    assert FeatureSpec.from_params(LEGACY_FEATURE_PARAMS) == DEFAULT_SPEC
+
+
+def test_feature_spec_round_trips_through_params():
+    spec = FeatureSpec.parse("mean, std,p50", n_mfcc=20, deltas=1)
+    params = feature_params(16000, spec)
+    assert params['sample_rate'] == 16000
+    assert FeatureSpec.from_params(params) == spec
+    # Çok kısa kliplerde türev penceresi daraltılır
+    assert spec.pool(np.random.RandomState(0).randn(20, 3)).shape == (spec.dim,)
+    with pytest.raises(ValueError):
+        FeatureSpec(pooling=('median',))
+
+
+def test_in_memory_extraction_does_not_fill_disk_cache(tmp_path, monkeypatch):
+    cache = FeatureCache(str(tmp_path / 'cache'))
+    monkeypatch.setattr(audio_features, 'feature_cache', cache)
+    audio, sr = _sample_audio()
+    features, analysis = audio_features.extract_features_and_analysis(audio, sr)
+    assert features is not None and analysis is not None
+    assert cache._entries() == [], "Bellekteki ses disk önbelleğine yazılmamalı"
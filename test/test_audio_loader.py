@@ -0,0 +1,44 @@
+import io
+import numpy as np
+import librosa
+import soundfile as sf
+from audio_loader import load_audio, open_wav
+from audio_features import LEGACY_FEATURE_PARAMS, artifact_feature_params, feature_params
+
+
+def _stereo(sr=44100, seconds=2.0):
+    t = np.arange(int(sr * seconds)) / sr
+    return np.stack([0.3 * np.sin(2 * np.pi * 440 * t), 0.2 * np.sin(2 * np.pi * 1000 * t)], axis=1)
+
+
+def test_wav_is_memory_mapped_and_matches_librosa(tmp_path):
+    path = str(tmp_path / "ses.wav")
+    sf.write(path, _stereo(), 44100, subtype='PCM_16')
+    assert isinstance(open_wav(path)[0], np.memmap), "PCM WAV belleğe eşlenmeli"
+
+    audio, sample_rate = load_audio(path, 22050, chunk_frames=4096)
+    expected, _ = librosa.load(path, sr=22050, res_type='soxr_hq')
+    assert sample_rate == 22050 and audio.dtype == np.float32
+    assert len(audio) == len(expected), "Yeniden örneklenmiş uzunluk hatalı"
+    assert np.allclose(audio, expected, atol=1e-6), "Parçalı çözüm librosa ile uyuşmuyor"
+
+    # Bellekteki yükleme (ör. Streamlit) aynı sonucu vermeli
+    with open(path, 'rb') as f:
+        in_memory, _ = load_audio(io.BytesIO(f.read()), 22050)
+    assert np.array_equal(audio, in_memory)
+
+
+def test_compressed_formats_are_decoded_in_blocks(tmp_path):
+    path = str(tmp_path / "ses.flac")
+    sf.write(path, _stereo(48000, 1.0), 48000)
+    assert open_wav(path) == (None, None)
+    audio, sample_rate = load_audio(path, 16000, chunk_frames=1000)
+    expected, _ = librosa.load(path, sr=16000, res_type='soxr_hq')
+    assert sample_rate == 16000
+    assert np.allclose(audio, expected, atol=1e-6)
+
+
+def test_artifact_records_sample_rate():
+    params = feature_params(16000)
+    assert artifact_feature_params((None, None, params))['sample_rate'] == 16000
+    assert artifact_feature_params((None, None)) == LEGACY_FEATURE_PARAMS, "Eski model dosyaları desteklenmeli"
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+import soundfile as sf
+import audio_features
+from feature_cache import FeatureCache
+from batch_extract import extract_batch
+
+
+@pytest.fixture
+def audio_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(audio_features, 'feature_cache', FeatureCache(str(tmp_path / 'cache')))
+    sr = 16000
+    t = np.arange(sr) / sr
+    paths = []
+    for i, freq in enumerate([220, 440, 880]):
+        path = tmp_path / f"ses{i}.wav"
+        sf.write(str(path), 0.5 * np.sin(2 * np.pi * freq * t), sr)
+        paths.append(str(path))
+    bad = tmp_path / "bozuk.wav"
+    bad.write_bytes(b"bu bir ses dosyasi degil")
+    return paths[:2] + [str(bad)] + paths[2:]
+
+
+def test_extract_batch_keeps_order_and_reports_failures(audio_files):
+    labels = ['a', 'b', 'bozuk', 'c']
+    results, report = extract_batch(audio_files, labels, workers=2, plots='off')
+    assert [label for _, label, _ in results] == ['a', 'b', 'c'], "Sonuç sırası bozuldu!"
+    assert all(len(features) == 10 for _, _, features in results), "MFCC öznitelik sayısı yanlış!"
+    assert len(report) == 1 and report[0]['label'] == 'bozuk', "Hatalı dosya rapora eklenmedi!"
+
+
+def test_extract_batch_parallel_matches_serial(audio_files):
+    serial, _ = extract_batch(audio_files, ['a', 'b', 'x', 'c'], workers=1, plots='off')
+    parallel, _ = extract_batch(audio_files, ['a', 'b', 'x', 'c'], workers=2, plots='off')
+    for (_, _, f1), (_, _, f2) in zip(serial, parallel):
+        assert np.allclose(f1, f2), "Paralel ve seri sonuçlar farklı!"
+
+
+def test_extract_batch_writes_plot_files(audio_files, tmp_path):
+    plot_dir = tmp_path / 'plots'
+    extract_batch(audio_files[:1], ['a'], workers=1, plots='file', plot_dir=str(plot_dir))
+    assert len(list(plot_dir.glob('*.png'))) == 2, "Grafik dosyaları yazılmadı!"
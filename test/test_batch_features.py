@@ -0,0 +1,35 @@
+import numpy as np
+from audio_features import analyze_audio, reduce_noise
+from batch_features import pad_batch, trim_silence_batch, extract_features_batch
+
+
+def _clips(sr=16000):
+    rs = np.random.RandomState(1)
+    clips = []
+    for n in [3000, 16000, 40000, 51234]:
+        t = np.arange(n) / sr
+        audio = (0.3 * np.sin(2 * np.pi * rs.uniform(100, 800) * t) + 0.02 * rs.randn(n)).astype(np.float32)
+        if n > 10000:
+            audio[n // 4:n // 2] *= 1e-3  # Sessiz bölge
+            audio[-3000:] = 0
+        clips.append(audio)
+    return clips, sr
+
+
+def test_trim_silence_batch_matches_reduce_noise():
+    clips, sr = _clips()
+    batch, lengths = pad_batch(clips)
+    trimmed, new_lengths, _ = trim_silence_batch(batch, lengths)
+    for i, clip in enumerate(clips):
+        expected = reduce_noise(clip, sr)
+        assert np.array_equal(trimmed[i, :new_lengths[i]], expected), "Sessizlik kırpma sonucu farklı!"
+
+
+def test_extract_features_batch_matches_per_clip():
+    clips, sr = _clips()
+    batch, lengths = pad_batch(clips)
+    features = extract_features_batch(batch, lengths, sr)
+    assert features.shape == (len(clips), 10), "Öznitelik matrisi boyutu yanlış!"
+    for i, clip in enumerate(clips):
+        expected = analyze_audio(clip, sr).mfcc_mean(10)
+        assert np.allclose(features[i], expected, atol=1e-3), "Toplu MFCC ortalaması farklı!"
@@ -0,0 +1,64 @@
+import json
+import os
+import joblib
+import numpy as np
+import pytest
+import soundfile as sf
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+import audio_features
+from feature_cache import FeatureCache
+from batch_extract import safe_load_features
+import batch_score
+
+
+@pytest.fixture
+def archive(tmp_path, monkeypatch):
+    monkeypatch.setattr(audio_features, 'feature_cache', FeatureCache(str(tmp_path / 'cache')))
+    sr = 16000
+    t = np.arange(sr) / sr
+    directory = tmp_path / 'arsiv'
+    (directory / 'alt').mkdir(parents=True)
+    paths = []
+    for i, freq in enumerate([200, 300, 2000, 3000]):
+        path = directory / ('alt' if i % 2 else '.') / f"ses{i}.wav"
+        sf.write(str(path), 0.5 * np.sin(2 * np.pi * freq * t), sr)
+        paths.append(str(path))
+    (directory / 'bozuk.wav').write_bytes(b"ses degil")
+
+    X = np.vstack([safe_load_features(path)[0] for path in paths])
+    scaler = StandardScaler().fit(X)
+    model = SVC(kernel='linear').fit(scaler.transform(X), ['dusuk', 'dusuk', 'yuksek', 'yuksek'])
+    model_path = tmp_path / 'model.joblib'
+    joblib.dump((model, scaler), str(model_path))
+    return str(directory), str(model_path), str(tmp_path / 'sonuc.jsonl')
+
+
+def test_batch_score_writes_jsonl_and_resumes(archive):
+    directory, model_path, output = archive
+    processed, skipped = batch_score.run(directory, output, model_path, workers=2, batch_size=2)
+    assert (processed, skipped) == (5, 0)
+    records = [json.loads(line) for line in open(output, encoding='utf-8')]
+    assert len(records) == 5
+    assert sum('error' in record for record in records) == 1, "Hatalı dosya kaydedilmedi!"
+    assert {record['speaker'] for record in records if 'speaker' in record} == {'dusuk', 'yuksek'}
+
+    # Yarım kalmış satır kırpılmalı ve tamamlanan dosyalar atlanmalı
+    with open(output, 'a', encoding='utf-8') as f:
+        f.write('{"file": "yarim')
+    processed, skipped = batch_score.run(directory, output, model_path, workers=1)
+    assert (processed, skipped) == (0, 5), "Tamamlanan dosyalar yeniden işlendi!"
+    processed, skipped = batch_score.run(directory, output, model_path, workers=1, retry_failed=True)
+    assert (processed, skipped) == (1, 4)
+    records = [json.loads(line) for line in open(output, encoding='utf-8')]
+    files = [record['file'] for record in records]
+    assert len(files) == len(set(files)) == 5, "Her dosyanın tek kaydı olmalı!"
+
+
+def test_skipped_counts_only_current_inputs(archive, tmp_path):
+    directory, model_path, output = archive
+    batch_score.run(directory, output, model_path, workers=1)
+    manifest = tmp_path / 'liste.txt'
+    manifest.write_text(os.path.join(directory, 'ses0.wav') + "\n", encoding='utf-8')
+    processed, skipped = batch_score.run(str(manifest), output, model_path, workers=1)
+    assert (processed, skipped) == (0, 1), "Atlanan sayısı yalnızca bu girdideki dosyaları saymalı"
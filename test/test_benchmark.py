@@ -0,0 +1,31 @@
+import numpy as np
+import audio_features
+import benchmark
+
+
+def test_synthetic_audio_is_deterministic():
+    a = benchmark.synthetic_audio(2.0, 16000, seed=3)
+    assert len(a) == 32000 and a.dtype == np.float32
+    assert np.array_equal(a, benchmark.synthetic_audio(2.0, 16000, seed=3)), "Aynı tohum aynı sesi üretmeli"
+    assert len(audio_features.reduce_noise(a, 16000)) < len(a), "Sentetik seste sessizlik olmalı"
+
+
+def test_run_reports_latency_and_compares():
+    original_cache = audio_features.feature_cache
+    results = benchmark.run(stages=("reduce_noise", "features", "predict"), durations=(0.5,),
+                            sample_rates=(16000,), repeat=3, warmup=1, log=lambda line: None)
+    assert audio_features.feature_cache is original_cache, "Özgün önbellek geri yüklenmeli"
+    assert [record['stage'] for record in results] == ["reduce_noise", "features", "predict"]
+    for record in results:
+        assert record['runs'] == 3 and 0 < record['p50_ms'] <= record['p95_ms']
+    assert 'realtime_factor' in results[0] and results[0]['duration_s'] == 0.5
+
+    slower = [dict(record, p50_ms=record['p50_ms'] * 2) for record in results]
+    rows = benchmark.compare(slower, results)
+    assert len(rows) == 3 and all(regressed for *_, regressed in rows), "Gerileme algılanmadı"
+
+
+def test_cached_features_stage_reads_from_file_cache():
+    results = benchmark.run(stages=("features_cached",), durations=(0.5,), sample_rates=(16000,),
+                            repeat=2, warmup=0, log=lambda line: None)
+    assert results[0]['stage'] == "features_cached" and results[0]['runs'] == 2
@@ -0,0 +1,75 @@
+import os
+import joblib
+import numpy as np
+import pytest
+from sklearn.preprocessing import FunctionTransformer, MinMaxScaler, RobustScaler, StandardScaler
+from sklearn.linear_model import SGDClassifier
+from sklearn.svm import SVC
+from compact_model import FoldedScaler, LinearPredictor, compact_path, export, load_artifact
+
+
+def _trained(n_classes, kernel='linear', seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(0, 5, (20 * n_classes, 10)) + np.repeat(np.arange(n_classes), 20)[:, None] * 3 + 10
+    y = np.repeat([f"konusmaci{i + 1}" for i in range(n_classes)], 20)
+    scaler = StandardScaler().fit(X)
+    return SVC(kernel=kernel).fit(scaler.transform(X), y), scaler, rng.normal(0, 5, (200, 10)) + 10
+
+
+@pytest.mark.parametrize("n_classes", [2, 4])
+def test_folded_predictor_matches_sklearn(n_classes, tmp_path):
+    model, scaler, X = _trained(n_classes)
+    path = str(tmp_path / "model.compact.bin")
+    LinearPredictor.from_sklearn(model, scaler, {'sample_rate': 22050}).save(path)
+    predictor = LinearPredictor.load(path)
+    assert isinstance(predictor.weights, np.memmap) and predictor.weights.dtype == np.float32
+    assert predictor.feature_params == {'sample_rate': 22050}
+    assert list(predictor.classes_) == list(model.classes_)
+    assert np.array_equal(predictor.predict(X), model.predict(scaler.transform(X))), "Tahminler uyuşmuyor"
+    assert np.allclose(predictor.decision_function(X), model.decision_function(scaler.transform(X)), atol=1e-4)
+
+
+def test_load_artifact_prefers_compact_file(tmp_path):
+    model, scaler, X = _trained(3)
+    model_path = str(tmp_path / "VoiceRecognizeModel.joblib")
+    joblib.dump((model, scaler, {'sample_rate': 16000}), model_path)
+    assert isinstance(load_artifact(model_path)[0], SVC), "Küçük dosya yokken joblib kullanılmalı"
+
+    assert export(model, scaler, {'sample_rate': 16000}, model_path) == compact_path(model_path)
+    os.utime(model_path, (0, 0))
+    loaded, folded, params = load_artifact(model_path)
+    assert isinstance(loaded, LinearPredictor) and isinstance(folded, FoldedScaler)
+    assert params['sample_rate'] == 16000
+    assert np.array_equal(loaded.predict(folded.transform(X)), model.predict(scaler.transform(X)))
+    assert os.path.getsize(compact_path(model_path)) < os.path.getsize(model_path)
+
+
+def test_nonlinear_models_are_not_exported(tmp_path):
+    model, scaler, _ = _trained(3, kernel='rbf')
+    assert export(model, scaler, {}, str(tmp_path / "model.joblib")) is None
+
+
+@pytest.mark.parametrize("scaler", [RobustScaler(), MinMaxScaler(), FunctionTransformer()])
+def test_affine_scalers_are_folded(scaler):
+    rng = np.random.default_rng(1)
+    X = rng.normal(0, 5, (60, 10)) + np.repeat(np.arange(3), 20)[:, None] * 3 + 10
+    y = np.repeat(["konusmaci1", "konusmaci2", "konusmaci3"], 20)
+    scaler.fit(X)
+    model = SVC(kernel='linear').fit(scaler.transform(X), y)
+    predictor = LinearPredictor.from_sklearn(model, scaler)
+    assert np.array_equal(predictor.predict(X), model.predict(scaler.transform(X))), "Tahminler uyuşmuyor"
+
+
+@pytest.mark.parametrize("n_classes", [2, 3, 4])
+def test_one_vs_rest_models_are_folded(n_classes, tmp_path):
+    rng = np.random.default_rng(2)
+    X = rng.normal(0, 5, (20 * n_classes, 10)) + np.repeat(np.arange(n_classes), 20)[:, None] * 3 + 10
+    y = np.repeat([f"konusmaci{i + 1}" for i in range(n_classes)], 20)
+    scaler = StandardScaler().fit(X)
+    model = SGDClassifier(random_state=0).fit(scaler.transform(X), y)
+    path = str(tmp_path / "model.compact.bin")
+    LinearPredictor.from_sklearn(model, scaler).save(path)
+    predictor = LinearPredictor.load(path)
+    assert predictor.scheme == 'ovr'
+    assert np.array_equal(predictor.predict(X), model.predict(scaler.transform(X))), "Tahminler uyuşmuyor"
+    assert np.allclose(predictor.decision_function(X), model.decision_function(scaler.transform(X)), atol=1e-3)
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+import soundfile as sf
+import audio_features
+import compact_model
+import dataset
+from enrollment import EnrollmentStore
+from feature_cache import FeatureCache
+
+
+@pytest.fixture
+def corpus(tmp_path, monkeypatch):
+    monkeypatch.setattr(audio_features, 'feature_cache', FeatureCache(str(tmp_path / 'cache')))
+    sr = 16000
+    t = np.arange(sr // 2) / sr
+    rng = np.random.default_rng(0)
+    root = tmp_path / 'veri'
+    for speaker, base in (('speaker1', 200), ('speaker2', 900), ('speaker3', 3000)):
+        (root / speaker).mkdir(parents=True)
+        for i in range(8):
+            freq = base * (1 + 0.02 * i)
+            signal = 0.5 * np.sin(2 * np.pi * freq * t) + 0.01 * rng.standard_normal(len(t))
+            sf.write(str(root / speaker / f"ses{i}.wav"), signal, sr)
+    (root / 'notlar').mkdir()
+    (root / 'notlar' / 'oku.wav').write_bytes(b"ses degil")
+    return root
+
+
+def test_scan_directory_labels_by_subdirectory(corpus):
+    entries = list(dataset.scan_directory(str(corpus), "speaker*"))
+    assert len(entries) == 24
+    assert {label for _, label in entries} == {'speaker1', 'speaker2', 'speaker3'}
+    assert all(f"/{label}/" in path for path, label in entries), "Etiket alt dizinin adı olmalı"
+    assert len(list(dataset.scan_directory(str(corpus)))) == 25, "Kalıp verilmezse tüm alt dizinler taranmalı"
+
+
+def test_read_manifest_resolves_relative_paths(corpus):
+    manifest = corpus / 'liste.csv'
+    manifest.write_text("path,label\nspeaker1/ses0.wav,omer\n# yorum\n\nspeaker2/ses0.wav,yusuf\n", encoding='utf-8')
+    entries = list(dataset.iter_entries(str(manifest)))
+    assert entries == [(str(corpus / 'speaker1' / 'ses0.wav'), 'omer'),
+                       (str(corpus / 'speaker2' / 'ses0.wav'), 'yusuf')]
+
+    manifest.write_text("speaker1/ses0.wav\n", encoding='utf-8')
+    with pytest.raises(ValueError):
+        list(dataset.read_manifest(str(manifest)))
+
+
+def test_feature_chunks_are_bounded_and_report_failures(corpus):
+    entries = list(dataset.scan_directory(str(corpus)))
+    chunks = list(dataset.iter_feature_chunks(entries, chunk_size=10))
+    assert [len(X) + len(failures) for X, _, failures in chunks] == [10, 10, 5]
+    assert sum(len(failures) for _, _, failures in chunks) == 1, "Bozuk dosya hata olarak raporlanmalı"
+    assert all(len(X) == len(y) for X, y, _ in chunks)
+
+
+def test_train_incremental_learns_speakers(corpus, tmp_path):
+    entries = list(dataset.scan_directory(str(corpus), "speaker*"))
+    store = EnrollmentStore(audio_features.N_MFCC)
+    model, scaler, report = dataset.train_incremental(entries, chunk_size=5, epochs=10, validation=0.25, workers=2,
+                                                      store=store, log=lambda message: None)
+    assert (report['n_train'], report['n_validation']) == (18, 6)
+    assert report['validation']['accuracy'] == pytest.approx(1.0), "Doğrulama örnekleri yanlış tanındı!"
+    assert len(store.classes_) == 0, "Eğitim konuşmacıları depoya yalnızca istenirse eklenmeli"
+    assert store.scaler_stats.count == 18 and np.allclose(store.scaler_stats.mean, scaler.mean_)
+
+    path = compact_model.export(model, scaler, {'sample_rate': audio_features.SAMPLE_RATE},
+                                str(tmp_path / 'model.joblib'))
+    predictor = compact_model.LinearPredictor.load(path)
+    X, y, _ = next(dataset.iter_feature_chunks(entries, chunk_size=len(entries)))
+    assert list(predictor.predict(X)) == list(model.predict(scaler.transform(X))), \
+        "Küçük model sklearn modeliyle aynı tahmini vermeli"
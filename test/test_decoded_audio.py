@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+import speech_recognition as sr
+import audio_features
+from decoded_audio import DecodedAudio
+from feature_cache import FeatureCache
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(audio_features, 'feature_cache', FeatureCache(str(tmp_path / 'cache')))
+
+
+def _tone(sample_rate=16000, seconds=1.0):
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    return (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+
+
+def test_microphone_audio_is_decoded_without_wav_header():
+    pcm = (_tone() * 32767).astype('<i2')
+    audio_data = sr.AudioData(pcm.tobytes(), 16000, 2)
+    decoded = DecodedAudio.from_audio_data(audio_data)
+    assert len(decoded.samples) == len(pcm), "WAV başlığı örneklere karışmamalı"
+    assert np.allclose(decoded.samples, pcm / 32768.0), "PCM ölçeklemesi hatalı"
+    assert decoded.audio_data() is audio_data, "Özgün AudioData yeniden kullanılmalı"
+
+
+def test_views_are_computed_once():
+    samples = _tone(22050)
+    decoded = DecodedAudio(samples, 22050)
+    assert np.shares_memory(decoded.samples, samples), "float32 girdi kopyalanmamalı"
+    assert decoded.resampled(16000) is decoded.resampled(16000), "Yeniden örnekleme önbelleğe alınmalı"
+    audio_data = decoded.audio_data(16000)
+    assert audio_data.sample_rate == 16000 and audio_data.sample_width == 2
+    assert decoded.audio_data(16000) is audio_data, "AudioData önbelleğe alınmalı"
+    features, analysis = decoded.features_and_analysis()
+    assert features is not None and decoded.features_and_analysis()[0] is features, "Öznitelikler bir kez hesaplanmalı"
@@ -0,0 +1,46 @@
+import numpy as np
+import librosa
+import soundfile as sf
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+from audio_features import analyze_audio
+from diarization import diarize, merge_turns, speech_segments
+
+SR = 16000
+
+
+def _tone(freq, seconds):
+    t = np.arange(int(SR * seconds)) / SR
+    return (0.5 * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def _silence(seconds):
+    return np.zeros(int(SR * seconds), dtype=np.float32)
+
+
+def test_segments_match_librosa_split(tmp_path):
+    path = str(tmp_path / "kayit.wav")
+    audio = np.concatenate([_silence(0.3), _tone(300, 1.2), _silence(0.8), _tone(2000, 0.7), _silence(0.5)])
+    sf.write(path, audio, SR, subtype='FLOAT')
+    segments = list(speech_segments(path, SR, min_duration=0, max_duration=1e9, merge_gap=-1))
+    expected = librosa.effects.split(audio, top_db=30)
+    assert np.array_equal([(start, start + len(samples)) for start, samples in segments], expected), \
+        "Akış bölütleme librosa.effects.split ile uyuşmuyor"
+
+    # Uzun bölgeler sınırlı uzunlukta parçalara bölünmeli
+    segments = list(speech_segments(path, SR, max_duration=0.5))
+    assert max(len(samples) for _, samples in segments) <= SR // 2
+
+
+def test_diarize_produces_speaker_timeline(tmp_path):
+    X = np.vstack([analyze_audio(_tone(freq, 1.0), SR).mfcc_mean() for freq in [250, 300, 2000, 2500]])
+    scaler = StandardScaler().fit(X)
+    model = SVC(kernel='linear').fit(scaler.transform(X), ['dusuk', 'dusuk', 'yuksek', 'yuksek'])
+
+    path = str(tmp_path / "toplanti.wav")
+    sf.write(path, np.concatenate([_tone(270, 2.0), _silence(1.0), _tone(2200, 2.0), _silence(1.0),
+                                   _tone(270, 1.5)]), SR)
+    timeline = list(diarize(path, model, scaler, SR, workers=2, max_duration=1.0))
+    turns = list(merge_turns(timeline))
+    assert [speaker for _, _, speaker in turns] == ['dusuk', 'yuksek', 'dusuk'], "Zaman çizelgesi hatalı"
+    assert abs(turns[1][0] - 3.0) < 0.1 and abs(turns[1][1] - 5.0) < 0.1
@@ -0,0 +1,44 @@
+import threading
+from emotion_batcher import EmotionBatcher
+
+
+class FakeClassifier:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts, **kwargs):
+        self.calls.append(list(texts))
+        return [[{'label': 'joy', 'score': 0.8 if 'iyi' in text else 0.2},
+                 {'label': 'sadness', 'score': 0.2 if 'iyi' in text else 0.8}] for text in texts]
+
+
+def test_emotion_batcher_batches_concurrent_requests():
+    classifier = FakeClassifier()
+    batcher = EmotionBatcher(classifier, max_batch_size=8, max_wait_ms=200)
+    results = {}
+    texts = [f"metin {i} iyi" for i in range(8)]
+    threads = [threading.Thread(target=lambda t=t: results.__setitem__(t, batcher.classify(t, timeout=5)))
+               for t in texts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 8 and all(r[0]['label'] == 'joy' for r in results.values())
+    assert len(classifier.calls) < 8, "İstekler toplu işlenmedi!"
+
+
+def test_emotion_batcher_cache_uses_normalized_text():
+    classifier = FakeClassifier()
+    batcher = EmotionBatcher(classifier, max_wait_ms=1, cache_size=2)
+    first = batcher.classify("Bugün  çok iyi", timeout=5)
+    second = batcher.classify("bugün çok iyi ", timeout=5)
+    assert first == second and len(classifier.calls) == 1, "Aynı metin yeniden sınıflandırıldı!"
+
+
+def test_emotion_batcher_chunks_long_text():
+    classifier = FakeClassifier()
+    batcher = EmotionBatcher(classifier, max_wait_ms=1, max_tokens=10)
+    text = " ".join(["iyi"] * 10 + ["kotu"] * 30)
+    result = batcher.classify(text, timeout=5)
+    assert len(classifier.calls[0]) == 4, "Uzun metin parçalara bölünmedi!"
+    assert result[0]['label'] == 'sadness' and abs(result[0]['score'] - 0.65) < 1e-9
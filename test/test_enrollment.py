@@ -0,0 +1,66 @@
+import os
+import numpy as np
+import pytest
+from sklearn.preprocessing import StandardScaler
+import model_registry
+from enrollment import EnrollmentStore
+
+
+def _training_data():
+    rs = np.random.RandomState(0)
+    X = np.vstack([rs.randn(5, 10) + 5 * i for i in range(3)])
+    y = ['konusmaci1'] * 5 + ['konusmaci2'] * 5 + ['konusmaci3'] * 5
+    return X, y
+
+
+def test_enrollment_scaler_matches_standard_scaler():
+    X, y = _training_data()
+    store = EnrollmentStore.from_training(X, y)
+    assert np.allclose(store.transform(X), StandardScaler().fit_transform(X)), "Ölçekleme farklı!"
+    assert list(store.predict(X)) == y, "Eğitim örnekleri yanlış tanındı!"
+
+
+def test_enrollment_new_speaker_recognized(tmp_path):
+    X, y = _training_data()
+    store = EnrollmentStore.from_training(X, y)
+    new_sample = np.full(10, -20.0)
+    store.add('yeni', new_sample)
+    path = str(tmp_path / 'model.enroll.npz')
+    store.save(path)
+    loaded = EnrollmentStore.load(path)
+    assert loaded.predict(new_sample.reshape(1, -1))[0] == 'yeni', "Yeni konuşmacı tanınmadı!"
+    assert np.allclose(loaded.scaler_stats.mean, store.scaler_stats.mean)
+
+
+def test_observe_updates_scaling_without_adding_speakers(tmp_path):
+    X, y = _training_data()
+    store = EnrollmentStore(10)
+    store.observe(X)
+    assert len(store.classes_) == 0, "Eğitim verisi konuşmacı olarak eklendi!"
+    assert np.allclose(store.transform(X), StandardScaler().fit_transform(X)), "Ölçekleme farklı!"
+    store.add('yeni', np.full(10, -20.0))
+    path = str(tmp_path / 'model.enroll.npz')
+    store.save(path)
+    assert list(EnrollmentStore.load(path).classes_) == ['yeni']
+
+
+@pytest.fixture
+def watched_store(tmp_path):
+    path = str(tmp_path / 'model.enroll.npz')
+    X, y = _training_data()
+    EnrollmentStore.from_training(X, y).save(path)
+    model_registry.register('deneme_kayit', lambda: EnrollmentStore.load(path), watch_path=path)
+    yield path
+    model_registry.clear('deneme_kayit')
+    model_registry.unregister('deneme_kayit')
+
+
+def test_registry_reloads_when_watched_file_changes(watched_store):
+    path = watched_store
+    first = model_registry.get('deneme_kayit')
+    assert model_registry.get('deneme_kayit') is first
+    first.add('yeni', np.zeros(10))
+    first.save(path)
+    os.utime(path, (1, 1))
+    second = model_registry.get('deneme_kayit')
+    assert second is not first and 'yeni' in second.speakers, "Değişen dosya yeniden yüklenmedi!"
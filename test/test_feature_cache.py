@@ -0,0 +1,45 @@
+import os
+import numpy as np
+from feature_cache import FeatureCache, audio_key
+
+
+def test_feature_cache_roundtrip(tmp_path):
+    cache = FeatureCache(str(tmp_path))
+    vector = np.arange(10, dtype=np.float32)
+    key = audio_key(np.zeros(100, dtype=np.float32), 16000, {'top_db': 30, 'n_mfcc': 10})
+    assert cache.get(key) is None, "Boş önbellekten değer döndü!"
+    cache.put(key, vector)
+    assert np.array_equal(cache.get(key), vector), "Önbellekten okunan vektör farklı!"
+
+
+def test_feature_cache_key_depends_on_params():
+    audio = np.random.rand(100).astype(np.float32)
+    key_a = audio_key(audio, 16000, {'top_db': 30, 'n_mfcc': 10})
+    key_b = audio_key(audio, 16000, {'top_db': 30, 'n_mfcc': 13})
+    key_c = audio_key(audio, 22050, {'top_db': 30, 'n_mfcc': 10})
+    assert len({key_a, key_b, key_c}) == 3, "Parametreler anahtara yansımadı!"
+
+
+def test_feature_cache_lru_eviction(tmp_path):
+    vector = np.zeros(1000, dtype=np.float64)
+    cache = FeatureCache(str(tmp_path), max_bytes=2 * (vector.nbytes + 128) + 64)
+    cache.put('aa1', vector)
+    cache.put('bb2', vector)
+    # En eski kayda erişildiğinde LRU sırasında öne geçmeli
+    os.utime(os.path.join(str(tmp_path), 'aa', 'aa1.npy'), (0, 0))
+    os.utime(os.path.join(str(tmp_path), 'bb', 'bb2.npy'), (1, 1))
+    cache.get('aa1')
+    cache.put('cc3', vector)
+    assert cache.get('bb2') is None, "En az kullanılan kayıt silinmedi!"
+    assert cache.get('aa1') is not None and cache.get('cc3') is not None, "Yeni kayıtlar silindi!"
+
+
+def test_feature_cache_rewrite_does_not_inflate_size(tmp_path):
+    vector = np.zeros(1000, dtype=np.float64)
+    cache = FeatureCache(str(tmp_path), max_bytes=3 * (vector.nbytes + 128))
+    cache.put('aa1', vector)
+    cache.put('bb2', vector)
+    for _ in range(5):
+        cache.put('aa1', vector)
+    assert cache._total_bytes == sum(size for _, size, _ in cache._entries()), "Toplam boyut yanlış!"
+    assert cache.get('bb2') is not None, "Yeniden yazma gereksiz silmeye yol açtı!"
@@ -1,13 +1,22 @@
+import os
 import pytest
+import audio_features
+from feature_cache import FeatureCache
 from main import extract_features
 
-def test_extract_features_valid_file():
-    file_path = "test_audio.wav"  # Test için bir ses dosyası yolu
-    features, _, _ = extract_features(file_path)
+
+@pytest.fixture
+def test_audio(tmp_path, monkeypatch):
+    # Depodaki gerçek konuşma kaydı; yol test dosyasının dizinine göre çözülür
+    monkeypatch.setattr(audio_features, 'feature_cache', FeatureCache(str(tmp_path / 'cache')))
+    return os.path.join(os.path.dirname(__file__), 'test_audio.wav')
+
+def test_extract_features_valid_file(test_audio):
+    features, _, _ = extract_features(test_audio)
     assert features is not None, "Öznitelikler çıkartılamadı!"
     assert len(features) == 10, "MFCC öznitelik sayısı yanlış!"
 
 def test_extract_features_invalid_file():
     file_path = "invalid_file.wav"  # Geçersiz bir dosya yolu
     features, _, _ = extract_features(file_path)
-    assert features is None, "Geçersiz dosya için None döndürülmedi!"
\ No newline at end of file
+    assert features is None, "Geçersiz dosya için None döndürülmedi!"
@@ -0,0 +1,226 @@
+import asyncio
+import io
+import socket
+import threading
+import time
+import numpy as np
+import pytest
+import soundfile as sf
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+import audio_features
+from audio_features import analyze_audio, feature_params
+import load_test
+from emotion_batcher import EmotionBatcher
+from enrollment import EnrollmentStore
+from feature_cache import FeatureCache
+from inference_service import InferenceService, ServiceClient, ServiceError, run_in_thread
+from speaker_index import SpeakerIndex
+from transcription import StaticBackend, TranscriptionExecutor
+
+SR = 16000
+
+
+def _tone(frequency, seed, seconds=1.0):
+    t = np.arange(int(seconds * SR)) / SR
+    noise = 0.02 * np.random.RandomState(seed).randn(len(t))
+    return (0.5 * np.sin(2 * np.pi * frequency * t) + noise).astype(np.float32)
+
+
+def _wav_bytes(audio):
+    buffer = io.BytesIO()
+    sf.write(buffer, audio, SR, format='WAV', subtype='PCM_16')
+    return buffer.getvalue()
+
+
+class SlowClassifier:
+    def __call__(self, texts, **kwargs):
+        time.sleep(0.3)
+        return [[{'label': 'joy', 'score': 0.9 if 'iyi' in text else 0.1},
+                 {'label': 'sadness', 'score': 0.1 if 'iyi' in text else 0.9}] for text in texts]
+
+
+@pytest.fixture
+def models(tmp_path, monkeypatch):
+    # İşçi süreçler (fork) önbelleği devralır; depo dizinindeki .feature_cache'e yazılmaz
+    monkeypatch.setattr(audio_features, 'feature_cache', FeatureCache(str(tmp_path / 'cache')))
+    X = [analyze_audio(_tone(frequency, seed), SR).features() for frequency in (220, 880) for seed in range(4)]
+    y = ['konusmaci1'] * 4 + ['konusmaci2'] * 4
+    scaler = StandardScaler().fit(X)
+    store = EnrollmentStore()
+    return {
+        'speaker_model': (SVC(kernel='linear').fit(scaler.transform(X), y), scaler, feature_params(SR)),
+        'enrollment': store,
+        'transcriber': TranscriptionExecutor(StaticBackend("bugün hava çok iyi")),
+        'emotion_batcher': EmotionBatcher(SlowClassifier(), max_wait_ms=1),
+    }
+
+
+def _start(models, tmp_path, **kwargs):
+    def get(name):
+        if name == 'speaker_index':
+            return SpeakerIndex.from_store(models['enrollment'])
+        return models[name]
+    service = InferenceService(workers=2, get=get, model_path=str(tmp_path / "model.joblib"), **kwargs)
+    return run_in_thread(service)
+
+
+def test_identify_transcribe_and_emotion(models, tmp_path):
+    _, url, stop = _start(models, tmp_path)
+    try:
+        client = ServiceClient(url)
+        result = client.identify(_wav_bytes(_tone(880, 10)), transcribe=True, emotion=True, features=True)
+        assert result['speaker'] == 'konusmaci2', "Konuşmacı yanlış tanındı!"
+        assert result['text'] == "bugün hava çok iyi"
+        assert result['emotions']['joy'] == pytest.approx(90.0)
+        assert len(result['features']) == 10
+        assert client.transcribe(_wav_bytes(_tone(220, 11))) == "bugün hava çok iyi"
+        assert client.emotion("kötü bir gün")['sadness'] == pytest.approx(90.0)
+        assert client.health()['status'] == 'ok'
+        assert client.identify_features(result['features'])['speaker'] == 'konusmaci2'
+
+        with pytest.raises(ServiceError) as error:
+            client.identify(b"ses degil")
+        assert error.value.status == 400
+    finally:
+        stop()
+
+
+def test_transcription_runs_in_parallel_with_identification(models, tmp_path):
+    started = threading.Event()
+
+    def transcript(audio_data):
+        started.set()
+        return "paralel metin"
+
+    models['transcriber'] = TranscriptionExecutor(StaticBackend(transcript))
+    service, url, stop = _start(models, tmp_path)
+    identify = service._identify
+    overlapped = []
+
+    def checking_identify(*args):
+        overlapped.append(started.wait(2))
+        return identify(*args)
+
+    service._identify = checking_identify
+    try:
+        result = ServiceClient(url).identify(_wav_bytes(_tone(220, 60)), transcribe=True)
+    finally:
+        stop()
+    assert result['text'] == "paralel metin"
+    assert overlapped == [True], "Konuşma tanıma, konuşmacı tanımadan önce başlatılmalı"
+
+
+def test_enroll_adds_speaker_to_index(models, tmp_path):
+    _, url, stop = _start(models, tmp_path)
+    try:
+        client = ServiceClient(url)
+        client.enroll('yeni', _wav_bytes(_tone(220, 20)))
+        client.enroll('diger', _wav_bytes(_tone(880, 21)))
+        result = client.identify(_wav_bytes(_tone(880, 22)), top=2)
+        assert result['speaker'] == 'diger'
+        assert [label for label, _ in result['matches']] == ['diger', 'yeni'], "En benzerler tanımayla dönmeli"
+        assert 'matches' not in client.identify(_wav_bytes(_tone(880, 22))), "top verilmezse benzerler aranmamalı"
+        assert (tmp_path / "model.enroll.npz").exists(), "Kayıt deposu yazılmadı!"
+    finally:
+        stop()
+
+
+def test_default_backend_identifies_with_artifact_model(models, tmp_path):
+    # Depoda eğitim konuşmacıları karışık etiketlerle duruyor; varsayılan arka uç modeli kullanır
+    X = [analyze_audio(_tone(frequency, seed), SR).features() for frequency in (220, 880) for seed in range(4)]
+    models['enrollment'] = EnrollmentStore.from_training(X, ['konusmaci2'] * 4 + ['konusmaci1'] * 4)
+    body = _wav_bytes(_tone(880, 40))
+    _, url, stop = _start(models, tmp_path)
+    try:
+        assert ServiceClient(url).identify(body)['speaker'] == 'konusmaci2', "Varsayılan tanıma modeli kullanmadı!"
+    finally:
+        stop()
+    _, url, stop = _start(models, tmp_path, backend="index")
+    try:
+        assert ServiceClient(url).identify(body)['speaker'] == 'konusmaci1', "İndeks arka ucu seçilmedi!"
+    finally:
+        stop()
+
+
+def _raw_request(url, data, close_write=False):
+    host, port = url.rsplit("/", 1)[-1].split(":")
+    with socket.create_connection((host, int(port)), timeout=5) as sock:
+        sock.sendall(data)
+        if close_write:
+            sock.shutdown(socket.SHUT_WR)
+        response = b""
+        while chunk := sock.recv(4096):
+            response += chunk
+    return int(response.split(b" ", 2)[1])
+
+
+@pytest.mark.parametrize("length", ["abc", "-5", "1e3"])
+def test_malformed_content_length_is_rejected(models, tmp_path, length):
+    _, url, stop = _start(models, tmp_path)
+    try:
+        request = f"POST /emotion HTTP/1.1\r\nContent-Length: {length}\r\n\r\nmerhaba".encode()
+        assert _raw_request(url, request) == 400, "Geçersiz Content-Length 400 ile yanıtlanmalı"
+        assert ServiceClient(url).health()['status'] == 'ok', "Servis çalışmaya devam etmeli"
+    finally:
+        stop()
+
+
+@pytest.mark.parametrize("query", ["threshold=abc", "top=iki"])
+def test_malformed_identify_query_is_rejected(models, tmp_path, query):
+    _, url, stop = _start(models, tmp_path)
+    try:
+        with pytest.raises(ServiceError) as error:
+            ServiceClient(url)._call(f"/identify?{query}", _wav_bytes(_tone(220, 50)))
+        assert error.value.status == 400, "Geçersiz sorgu parametresi 400 ile yanıtlanmalı"
+    finally:
+        stop()
+
+
+def test_truncated_body_is_rejected(models, tmp_path):
+    _, url, stop = _start(models, tmp_path)
+    try:
+        request = b"POST /emotion HTTP/1.1\r\nContent-Length: 100\r\n\r\nkisa govde"
+        assert _raw_request(url, request, close_write=True) == 400, "Eksik gövde 400 ile yanıtlanmalı"
+        assert ServiceClient(url).health()['status'] == 'ok', "Servis çalışmaya devam etmeli"
+    finally:
+        stop()
+
+
+def test_overload_is_rejected_with_503(models, tmp_path):
+    _, url, stop = _start(models, tmp_path, concurrency=1, max_queue=1)
+    statuses = []
+    lock = threading.Lock()
+
+    def request(i):
+        try:
+            ServiceClient(url).emotion(f"metin {i}")
+            status = 200
+        except ServiceError as e:
+            status = e.status
+        with lock:
+            statuses.append(status)
+
+    try:
+        threads = [threading.Thread(target=request, args=(i,)) for i in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        stop()
+    # Biri işlenir, biri kuyrukta bekler; diğerleri beklemeden reddedilir
+    assert statuses.count(503) >= 3, f"Aşırı yükte istekler reddedilmedi: {statuses}"
+    assert statuses.count(200) >= 1
+
+
+def test_load_test_reports_throughput_and_rejections(models, tmp_path):
+    _, url, stop = _start(models, tmp_path, concurrency=2, max_queue=2)
+    try:
+        summary = asyncio.run(load_test.run(url, "identify", _wav_bytes(_tone(220, 30)), concurrency=12,
+                                            requests=48))
+    finally:
+        stop()
+    assert summary['requests'] == 48
+    assert set(summary['statuses']) <= {'200', '503'}, f"Beklenmeyen durum kodları: {summary['statuses']}"
+    assert summary['statuses'].get('200', 0) > 0 and summary['p95_ms'] > 0
@@ -0,0 +1,53 @@
+import threading
+import time
+import numpy as np
+import pytest
+import instrumentation
+from audio_features import analyze_audio
+from transcription import StaticBackend, TranscriptionExecutor
+
+
+@pytest.fixture
+def timing():
+    instrumentation.reset()
+    instrumentation.enable()
+    yield
+    instrumentation.enable(False)
+    instrumentation.reset()
+
+
+def test_disabled_spans_record_nothing():
+    instrumentation.enable(False)
+    instrumentation.reset()
+    with instrumentation.span("kapali"):
+        pass
+    instrumentation.count("kapali")
+    assert instrumentation.snapshot() == {'durations': {}, 'counters': {}}
+    assert instrumentation.span("a") is instrumentation.span("b"), "Kapalıyken paylaşılan nesne dönmeli"
+
+
+def test_trace_collects_pipeline_and_thread_stages(timing):
+    audio = np.sin(2 * np.pi * 440 * np.arange(16000) / 16000).astype(np.float32)
+    executor = TranscriptionExecutor(StaticBackend("merhaba"))
+    with instrumentation.trace("istek") as spans:
+        future = executor.submit(None)
+        analyze_audio(audio, 16000).mfcc_mean()
+        assert executor.result(future) == "merhaba"
+    stages = {name for name, *_ in spans}
+    assert {"istek", "reduce_noise", "mfcc", "transcription", "transcription.wait"} <= stages, \
+        "Aşamalar (arka plan iş parçacığı dahil) toplanmadı"
+    depths = {name: depth for name, _, _, depth in spans}
+    assert depths["istek"] == 0 and depths["mfcc"] == 1
+    assert len(instrumentation.format_trace(spans)) == len(spans)
+
+
+def test_prometheus_file(timing, tmp_path):
+    with instrumentation.span("mfcc"):
+        time.sleep(0.002)
+    instrumentation.count("feature_cache.hit", 3)
+    path = tmp_path / "ses.prom"
+    instrumentation.write_prometheus(str(path))
+    text = path.read_text(encoding='utf-8')
+    assert 'ses_stage_duration_seconds_count{stage="mfcc"} 1' in text
+    assert 'ses_stage_duration_seconds_bucket{stage="mfcc",le="+Inf"} 1' in text
+    assert 'ses_events_total{event="feature_cache.hit"} 3' in text
@@ -0,0 +1,48 @@
+import pytest
+import model_registry
+
+
+@pytest.fixture
+def registered():
+    calls = []
+    model_registry.register("deneme", lambda: calls.append(1) or object())
+    yield calls
+    model_registry.clear("deneme")
+    model_registry.unregister("deneme")
+
+
+def test_registry_loads_lazily_and_caches(registered):
+    calls = registered
+    assert not model_registry.is_loaded("deneme"), "Model kayıt sırasında yüklendi!"
+    first = model_registry.get("deneme")
+    second = model_registry.get("deneme")
+    assert first is second and len(calls) == 1, "Model önbellekten gelmedi!"
+    assert "deneme" in model_registry.load_times()
+    model_registry.clear("deneme")
+    assert model_registry.get("deneme") is not first and len(calls) == 2, "Temizlenen model yeniden yüklenmedi!"
+
+
+def test_unregister_removes_loader(registered):
+    model_registry.get("deneme")
+    model_registry.unregister("deneme")
+    assert not model_registry.is_loaded("deneme")
+    with pytest.raises(KeyError):
+        model_registry.get("deneme")
+
+
+def test_set_model_path_moves_enrollment_store(tmp_path):
+    import numpy as np
+    from enrollment import EnrollmentStore, enrollment_path
+
+    original = model_registry.MODEL_PATH
+    model_path = str(tmp_path / "ozel.joblib")
+    store = EnrollmentStore(4)
+    store.add('yeni', np.ones(4))
+    store.save(enrollment_path(model_path))
+    try:
+        model_registry.set_model_path(model_path)
+        assert list(model_registry.get("enrollment").classes_) == ['yeni'], "Kayıt deposu model yolundan okunmadı!"
+        assert list(model_registry.get("speaker_index").labels) == ['yeni']
+    finally:
+        model_registry.set_model_path(original)
+    assert not model_registry.is_loaded("enrollment"), "Eski yoldaki depo önbellekte kalmamalı"
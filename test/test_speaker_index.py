@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+from enrollment import EnrollmentStore
+from speaker_index import SpeakerIdentifier, SpeakerIndex, UNKNOWN_SPEAKER
+
+
+def _data(n_speakers, per_speaker=3, dim=10):
+    rs = np.random.RandomState(0)
+    centers = rs.randn(n_speakers, dim) * 5
+    X = np.repeat(centers, per_speaker, axis=0) + 0.1 * rs.randn(n_speakers * per_speaker, dim)
+    y = np.repeat([f"konusmaci{i}" for i in range(n_speakers)], per_speaker)
+    return X, y
+
+
+def test_speaker_index_predicts_and_searches():
+    X, y = _data(20)
+    scaler = StandardScaler().fit(X)
+    index = SpeakerIndex.from_training(X, y, scaler)
+    assert np.array_equal(index.predict(X), y), "İndeks tahminleri yanlış!"
+    assert index.decision_function(X).shape == (len(X), 20)
+    matches = index.search(X[:1], top_k=3)
+    assert matches[0][0] == y[0] and len(matches) == 3
+    assert matches[0][1] >= matches[1][1] >= matches[2][1], "Sonuçlar sıralı değil!"
+
+
+def test_speaker_index_unknown_threshold():
+    X, y = _data(5)
+    index = SpeakerIndex.from_training(X, y, StandardScaler().fit(X), threshold=0.9)
+    assert np.array_equal(index.predict(X), y), "Eşiğin üstündeki sorgular yanlış tanındı!"
+    assert all(label == UNKNOWN_SPEAKER for label in index.predict(X, threshold=1.01)), \
+        "Eşik altındaki sorgu bilinmeyen olmadı!"
+
+
+def test_speaker_index_thousands_of_speakers():
+    X, y = _data(5000, per_speaker=1)
+    index = SpeakerIndex.from_training(X, y, StandardScaler().fit(X))
+    queries = X[::500]
+    assert np.array_equal(index.predict(queries), y[::500]), "Binlerce konuşmacıda tahmin yanlış!"
+    for query, label in zip(queries, y[::500]):
+        matches = index.search(query.reshape(1, -1), top_k=5)
+        assert matches[0][0] == label and len(matches) == 5
+        assert all(a[1] >= b[1] for a, b in zip(matches, matches[1:])), "Sonuçlar sıralı değil!"
+
+
+def _identifier_parts():
+    X, y = _data(3, per_speaker=4)
+    scaler = StandardScaler().fit(X)
+    model = SVC(kernel='linear').fit(scaler.transform(X), y)
+    return X, y, scaler, model
+
+
+def test_identifier_defaults_to_artifact_model():
+    X, y, scaler, model = _identifier_parts()
+    # Depodaki merkezler etiketleri karışık: indeks yanlış, model doğru tahmin eder
+    store = EnrollmentStore.from_training(X, np.roll(y, 4))
+    identifier = SpeakerIdentifier(model, scaler, SpeakerIndex.from_store(store))
+    assert identifier.backend == "model"
+    predictions, scores, classes = identifier.identify(X)
+    assert np.array_equal(predictions, model.predict(scaler.transform(X))), "Varsayılan tanıma modeli kullanmadı!"
+    assert scores.shape == (len(X), 3) and list(classes) == list(model.classes_)
+    index_predictions = SpeakerIdentifier(model, scaler, SpeakerIndex.from_store(store), "index").identify(X)[0]
+    assert np.array_equal(index_predictions, np.roll(y, 4)), "İndeks arka ucu depoyu kullanmadı!"
+    with pytest.raises(ValueError):
+        SpeakerIdentifier(model, scaler, SpeakerIndex.from_store(store), "bilinmeyen")
+
+
+def test_identifier_recognizes_enrolled_speakers_unknown_to_model():
+    X, y, scaler, model = _identifier_parts()
+    # Depoda eğitim verisinin yalnızca ölçekleme istatistikleri ve sonradan kaydedilen konuşmacı var
+    store = EnrollmentStore(X.shape[1])
+    store.observe(X)
+    new_speaker = np.full(X.shape[1], 40.0)
+    store.add('yeni', new_speaker)
+    identifier = SpeakerIdentifier(model, scaler, SpeakerIndex.from_store(store))
+    predictions = identifier.identify(np.vstack([X, new_speaker]))[0]
+    assert list(predictions[:-1]) == list(y), "Eğitim konuşmacıları modelle tanınmalı"
+    assert predictions[-1] == 'yeni', "Sonradan kaydedilen konuşmacı tanınmadı!"
+    assert identifier.search(new_speaker.reshape(1, -1), top_k=3)[0][0] == 'yeni'
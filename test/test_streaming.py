@@ -0,0 +1,54 @@
+import numpy as np
+import librosa
+import soundfile as sf
+from audio_features import FeatureSpec
+from streaming import RunningStats, StreamingRecognizer, WavFileSource
+
+
+def test_running_stats_matches_numpy():
+    values = np.random.RandomState(0).randn(100, 10)
+    stats = RunningStats(10)
+    for chunk in np.array_split(values, 7):
+        stats.update(chunk)
+    assert np.allclose(stats.mean, values.mean(axis=0)), "Artımlı ortalama yanlış!"
+    assert np.allclose(stats.variance, values.var(axis=0)), "Artımlı varyans yanlış!"
+
+
+def test_streaming_from_wav_file(tmp_path):
+    sr = 16000
+    t = np.arange(3 * sr) / sr
+    audio = 0.5 * np.sin(2 * np.pi * 300 * t) + 0.05 * np.random.RandomState(0).randn(len(t))
+    path = tmp_path / "akis.wav"
+    sf.write(str(path), audio, sr, subtype='PCM_16')
+
+    recognizer = StreamingRecognizer(lambda features: 'konusmaci1', sr, emit_ms=500, window_ms=None)
+    source = WavFileSource(str(path), frames_per_buffer=1000)
+    predictions = list(recognizer.run(source))
+    source.close()
+
+    times = [timestamp for timestamp, _, _ in predictions]
+    assert len(predictions) >= 5, "Yeterli sayıda tahmin üretilmedi!"
+    assert all(label == 'konusmaci1' for _, label, _ in predictions)
+    assert np.all(np.diff(times) > 0.4), "Tahmin aralıkları yanlış!"
+
+    # Tüm akışın ortalaması tek seferde hesaplanan MFCC ortalamasına yakın olmalı
+    decoded, _ = librosa.load(str(path), sr=None)
+    expected = librosa.feature.mfcc(y=decoded, sr=sr, n_mfcc=10, center=False).mean(axis=1)
+    assert np.allclose(recognizer.total.mean, expected, atol=1e-2), "Akışlı MFCC ortalaması farklı!"
+
+
+def test_streaming_pools_window_frames_with_model_spec(tmp_path):
+    sr = 16000
+    t = np.arange(2 * sr) / sr
+    audio = 0.5 * np.sin(2 * np.pi * 300 * t) + 0.05 * np.random.RandomState(0).randn(len(t))
+    path = tmp_path / "akis.wav"
+    sf.write(str(path), audio, sr, subtype='PCM_16')
+
+    spec = FeatureSpec(n_mfcc=13, deltas=1, pooling=('mean', 'std'))
+    received = []
+    recognizer = StreamingRecognizer(lambda features: received.append(features) or 'konusmaci1', sr,
+                                     emit_ms=500, window_ms=1000, spec=spec)
+    source = WavFileSource(str(path), frames_per_buffer=1000)
+    predictions = list(recognizer.run(source))
+    source.close()
+    assert predictions and all(features.shape == (spec.dim,) for features in received)
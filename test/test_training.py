@@ -0,0 +1,66 @@
+import json
+import numpy as np
+import pytest
+import training
+
+
+def _dataset(per_class=6, n_classes=3, seed=0):
+    rng = np.random.default_rng(seed)
+    X = np.vstack([rng.normal(4 * i, 1, (per_class, 8)) for i in range(n_classes)])
+    y = np.repeat([f"konusmaci{i + 1}" for i in range(n_classes)], per_class)
+    return X, y
+
+
+def test_search_returns_best_model_and_report(tmp_path):
+    X, y = _dataset()
+    model, scaler, report = training.search(X, y, folds=3, C=(0.1, 1.0), n_jobs=1)
+    assert list(model.predict(scaler.transform(X))) == list(y), "Eğitim örnekleri yanlış tanındı!"
+    assert report['folds'] == 3
+    assert len(report['candidates']) == 3 * 2 * 2, "Tüm adaylar raporda olmalı"
+    assert report['candidates'][0]['rank'] == 1
+    assert report['best']['f1_macro'] == pytest.approx(1.0)
+    assert np.array(report['cross_validated']['confusion_matrix']).sum() == len(y)
+
+    path = tmp_path / "training_report.json"
+    training.write_report(report, str(path))
+    assert json.loads(path.read_text(encoding='utf-8'))['best'] == report['best']
+
+
+def test_search_is_reproducible():
+    X, y = _dataset(seed=1)
+    first = training.search(X, y, folds=3, kernels=('linear',), scalers=('standard',), n_jobs=1)[2]
+    second = training.search(X, y, folds=3, kernels=('linear',), scalers=('standard',), n_jobs=1)[2]
+    assert [c['f1_macro'] for c in first['candidates']] == [c['f1_macro'] for c in second['candidates']]
+
+
+def test_fold_count_adapts_to_smallest_class():
+    assert training.fold_count(['a'] * 10 + ['b'] * 3, folds=5) == 3
+    assert training.fold_count(['a'] * 2 + ['b'] * 2, folds=5) == 2
+    with pytest.raises(ValueError):
+        training.fold_count(['a'] * 5 + ['b'], folds=5)
+
+
+def test_feature_matrix_is_reused(tmp_path):
+    X, y = _dataset()
+    calls = []
+
+    def extract():
+        calls.append(1)
+        return X, y
+
+    path = str(tmp_path / "features.npz")
+    files = [str(tmp_path / f"ses{i}.wav") for i in range(len(y))]
+    for file in files:
+        with open(file, 'wb') as f:
+            f.write(file.encode())
+    first = training.load_or_extract(files, y, path, extract, {'sample_rate': 22050})
+    second = training.load_or_extract(files, y, path, extract, {'sample_rate': 22050})
+    assert len(calls) == 1, "Öznitelikler tekrar çıkarılmamalı"
+    assert np.array_equal(first[0], second[0]) and list(first[1]) == list(second[1])
+    training.load_or_extract(files, y, path, extract, {'sample_rate': 16000})
+    assert len(calls) == 2, "Parametreler değişince öznitelikler yeniden çıkarılmalı"
+
+    with open(files[0], 'ab') as f:
+        f.write(b"yeniden kaydedildi")
+    training.load_or_extract(files, y, path, extract, {'sample_rate': 16000})
+    assert len(calls) == 3, "Değişen ses dosyası için öznitelikler yeniden çıkarılmalı"
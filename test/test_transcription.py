@@ -0,0 +1,50 @@
+import threading
+import pytest
+import speech_recognition as sr
+from transcription import (StaticBackend, TranscriptionBackend, TranscriptionExecutor,
+                           TranscriptionTimeout, get_backend)
+
+
+class SlowBackend(TranscriptionBackend):
+    def __init__(self):
+        self.release = threading.Event()
+
+    def transcribe(self, audio_data):
+        self.release.wait(5)
+        return "geç metin"
+
+
+def test_static_backend_is_deterministic():
+    executor = TranscriptionExecutor(StaticBackend("merhaba dünya"))
+    assert executor.transcribe(None) == "merhaba dünya"
+    with pytest.raises(sr.UnknownValueError):
+        TranscriptionExecutor(StaticBackend("")).transcribe(None)
+
+
+def test_executor_times_out_without_blocking():
+    backend = SlowBackend()
+    executor = TranscriptionExecutor(backend, max_workers=1, timeout=0.05)
+    future = executor.submit(None)
+    with pytest.raises(TranscriptionTimeout):
+        executor.result(future)
+    backend.release.set()
+    executor.shutdown()
+
+
+def test_get_backend_from_environment(monkeypatch):
+    monkeypatch.setenv("SES_TRANSCRIBER", "static")
+    monkeypatch.setenv("SES_STATIC_TRANSCRIPT", "ortamdan metin")
+    assert isinstance(get_backend(), StaticBackend)
+    assert get_backend().transcribe(None) == "ortamdan metin", "Ortam değişkeni oluşturulurken okunmalı"
+    with pytest.raises(ValueError):
+        get_backend("yok")
+
+
+def test_google_request_timeout_is_bounded_by_executor_timeout():
+    from transcription import GoogleBackend
+
+    backend = GoogleBackend(operation_timeout=30)
+    assert TranscriptionExecutor(backend, timeout=5).backend.operation_timeout == 5, \
+        "Ağ isteği zaman aşımından uzun sürebilir"
+    assert TranscriptionExecutor(backend, timeout=10).backend.operation_timeout == 10
+    assert backend.operation_timeout == 30, "Çağıranın arka ucu değiştirilmemeli"
@@ -0,0 +1,161 @@
+import json
+import os
+import time
+from collections import Counter
+
+import numpy as np
+
+## @package training
+#  Çapraz doğrulamalı, paralel model seçimi
+#
+#  Öznitelik matrisi bir kez çıkarılır (dosya başına öznitelik önbelleği ve
+#  isteğe bağlı matris dosyası sayesinde tekrar eğitimlerde ses çözülmez);
+#  katmanlı k-katlı çapraz doğrulama ve çekirdek / C / ölçekleyici ızgara
+#  araması bu matris üzerinde tüm çekirdeklerde paralel yürütülür. En iyi
+#  aday tüm veriyle yeniden eğitilir; aday skorları, sınıf bazında metrikler
+#  ve karışıklık matrisi JSON raporuna yazılır. Katlar sabit tohumla
+#  karıştırıldığı için sonuçlar tekrarlanabilirdir.
+
+DEFAULT_FOLDS = 5
+DEFAULT_KERNELS = ('linear', 'rbf')
+DEFAULT_C = (0.1, 1.0, 10.0, 100.0)
+DEFAULT_SCALERS = ('standard', 'robust', 'none')
+SCORING = ('f1_macro', 'accuracy')
+
+
+def _scaler(name):
+    from sklearn.preprocessing import FunctionTransformer, MinMaxScaler, RobustScaler, StandardScaler
+
+    scalers = {'standard': StandardScaler, 'robust': RobustScaler, 'minmax': MinMaxScaler,
+               'none': FunctionTransformer}
+    if name not in scalers:
+        raise ValueError(f"Bilinmeyen ölçekleyici: {name}")
+    return scalers[name]()
+
+
+def _scaler_name(scaler):
+    return {'StandardScaler': 'standard', 'RobustScaler': 'robust', 'MinMaxScaler': 'minmax',
+            'FunctionTransformer': 'none'}.get(type(scaler).__name__, type(scaler).__name__)
+
+
+## Öznitelik matrisini dosyadan okur veya çıkarıp dosyaya yazar
+#  Dosyadaki yol/etiket listesi, dosya içerikleri veya öznitelik parametreleri
+#  istenenle aynı değilse matris yeniden çıkarılır; aynı yolda yeniden
+#  kaydedilen bir ses dosyası eski matrisin kullanılmasına yol açmaz.
+#  @param extract Argümansız, (X, y) döndüren fonksiyon
+#  @param params Öznitelik parametreleri (feature_params())
+#  @return (X, y)
+def load_or_extract(file_paths, labels, matrix_path, extract, params=None):
+    key = json.dumps({'files': [[str(path), _content_key(path)] for path in file_paths],
+                      'labels': [str(label) for label in labels],
+                      'feature_params': params}, ensure_ascii=False, sort_keys=True)
+    if matrix_path and os.path.exists(matrix_path):
+        with np.load(matrix_path, allow_pickle=False) as data:
+            if str(data['key']) == key:
+                return data['X'], data['y']
+    X, y = extract()
+    X, y = np.asarray(X, dtype=np.float64), np.asarray(y, dtype=str)
+    if matrix_path:
+        # Yarım kalan yazım önbelleği bozmasın diye geçici dosyaya yazılıp taşınır
+        tmp_path = matrix_path + '.tmp.npz'
+        np.savez(tmp_path, X=X, y=y, key=np.asarray(key))
+        os.replace(tmp_path, matrix_path)
+    return X, y
+
+
+def _content_key(path):
+    from feature_cache import file_key
+
+    try:
+        return file_key(path, {})
+    except OSError:
+        return None
+
+
+## Sınıf başına örnek sayısına göre kullanılabilecek kat sayısı
+def fold_count(y, folds=DEFAULT_FOLDS):
+    smallest = min(Counter(y).values())
+    if smallest < 2:
+        raise ValueError("Çapraz doğrulama için her konuşmacının en az 2 örneği olmalı")
+    return min(folds, smallest)
+
+
+## Izgara aramasını çalıştırır ve en iyi modeli tüm veriyle eğitir
+#  @param X Öznitelik matrisi
+#  @param y Etiketler
+#  @param folds Kat sayısı (en küçük sınıfın örnek sayısıyla sınırlanır)
+#  @param kernels, C, scalers Aranacak hiperparametreler
+#  @param n_jobs Paralel iş sayısı (-1: tüm çekirdekler)
+#  @param seed Katların karıştırılma tohumu
+#  @return (model, scaler, rapor sözlüğü)
+def search(X, y, folds=DEFAULT_FOLDS, kernels=DEFAULT_KERNELS, C=DEFAULT_C, scalers=DEFAULT_SCALERS,
+           n_jobs=-1, seed=0):
+    from sklearn.metrics import classification_report, confusion_matrix
+    from sklearn.model_selection import GridSearchCV, StratifiedKFold, cross_val_predict
+    from sklearn.pipeline import Pipeline
+    from sklearn.svm import SVC
+
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y)
+    n_folds = fold_count(y, folds)
+    cv = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=seed)
+    pipeline = Pipeline([('scaler', _scaler('standard')), ('svc', SVC())])
+    grid = {'scaler': [_scaler(name) for name in scalers], 'svc__kernel': list(kernels), 'svc__C': list(C)}
+
+    started = time.perf_counter()
+    grid_search = GridSearchCV(pipeline, grid, scoring=list(SCORING), refit=SCORING[0], cv=cv, n_jobs=n_jobs)
+    grid_search.fit(X, y)
+    best = grid_search.best_estimator_
+    # En iyi adayın katlardaki tahminleri (her örnek, eğitimde görmediği bir katta tahmin edilir)
+    predictions = cross_val_predict(best, X, y, cv=cv, n_jobs=n_jobs)
+    elapsed = time.perf_counter() - started
+
+    labels = [str(label) for label in best.classes_]
+    results = grid_search.cv_results_
+    candidates = []
+    for i, params in enumerate(results['params']):
+        candidate = {'scaler': _scaler_name(params['scaler']), 'kernel': params['svc__kernel'],
+                     'C': params['svc__C'], 'rank': int(results[f'rank_test_{SCORING[0]}'][i])}
+        for metric in SCORING:
+            candidate[metric] = float(results[f'mean_test_{metric}'][i])
+            candidate[f'{metric}_std'] = float(results[f'std_test_{metric}'][i])
+        candidates.append(candidate)
+    candidates.sort(key=lambda candidate: candidate['rank'])
+
+    best_params = grid_search.best_params_
+    report = {
+        'best': {'scaler': _scaler_name(best_params['scaler']), 'kernel': best_params['svc__kernel'],
+                 'C': best_params['svc__C'], SCORING[0]: float(grid_search.best_score_)},
+        'folds': n_folds,
+        'seed': seed,
+        'n_samples': int(len(y)),
+        'class_counts': {str(label): int(count) for label, count in sorted(Counter(y).items())},
+        'search_seconds': elapsed,
+        'candidates': candidates,
+        'cross_validated': {
+            'labels': labels,
+            'classification_report': classification_report(y, predictions, labels=best.classes_,
+                                                            output_dict=True, zero_division=0),
+            'confusion_matrix': confusion_matrix(y, predictions, labels=best.classes_).tolist(),
+        },
+    }
+    return best.named_steps['svc'], best.named_steps['scaler'], report
+
+
+## Raporu JSON dosyasına yazar
+def write_report(report, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+## Raporun özetini yazdırır
+def print_summary(report):
+    best = report['best']
+    print(f"En iyi model: ölçekleyici={best['scaler']}, çekirdek={best['kernel']}, C={best['C']}")
+    print(f"{report['folds']}-katlı çapraz doğrulama F1 (makro): {best['f1_macro']:.4f}")
+    print(f"Aranan aday sayısı: {len(report['candidates'])}, süre: {report['search_seconds']:.1f} sn")
+    cross_validated = report['cross_validated']['classification_report']
+    print("Model Doğruluğu:", cross_validated['accuracy'])
+    print("Model Precision (Kesinlik):", cross_validated['macro avg']['precision'])
+    print("Model Recall (Duyarlılık):", cross_validated['macro avg']['recall'])
+    print("Model F1 Skoru:", cross_validated['macro avg']['f1-score'])
@@ -0,0 +1,129 @@
+import contextvars
+import copy
+import os
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+import speech_recognition as sr
+
+from instrumentation import span
+
+## @package transcription
+#  Değiştirilebilir konuşma tanıma (ses → metin) arka uçları
+#
+#  Arka uç SES_TRANSCRIBER ortam değişkeniyle seçilir:
+#  - google: Google Web Speech (ağ gerektirir, varsayılan)
+#  - sphinx: CMU PocketSphinx ile çevrimdışı tanıma (pocketsphinx paketi gerekir)
+#  - static: testler için sabit metin döndüren deterministik arka uç
+#  Çağrılar sınırlı bir iş parçacığı havuzunda çalışır; böylece konuşmacı
+#  tanıma ile konuşma tanıma paralel ilerler ve yavaş bir istek zaman aşımı
+#  ile kesilir.
+
+DEFAULT_LANGUAGE = 'tr-TR'
+DEFAULT_TIMEOUT = float(os.environ.get("SES_TRANSCRIBE_TIMEOUT", "15"))
+
+
+class TranscriptionTimeout(Exception):
+    pass
+
+
+class TranscriptionBackend:
+    name = "base"
+
+    ## @param audio_data speech_recognition.AudioData
+    #  @return Metin; anlaşılamazsa sr.UnknownValueError, servis hatasında sr.RequestError
+    def transcribe(self, audio_data):
+        raise NotImplementedError
+
+
+class GoogleBackend(TranscriptionBackend):
+    name = "google"
+
+    def __init__(self, language=DEFAULT_LANGUAGE, operation_timeout=DEFAULT_TIMEOUT):
+        self.language = language
+        self.operation_timeout = operation_timeout
+
+    def transcribe(self, audio_data):
+        recognizer = sr.Recognizer()
+        recognizer.operation_timeout = self.operation_timeout
+        return recognizer.recognize_google(audio_data, language=self.language)
+
+
+class SphinxBackend(TranscriptionBackend):
+    name = "sphinx"
+
+    ## @param language PocketSphinx dil modeli (varsayılan olarak yalnızca en-US yüklüdür)
+    #  (None ise SES_SPHINX_LANGUAGE, o da yoksa en-US)
+    def __init__(self, language=None):
+        self.language = language or os.environ.get("SES_SPHINX_LANGUAGE", "en-US")
+
+    def transcribe(self, audio_data):
+        return sr.Recognizer().recognize_sphinx(audio_data, language=self.language)
+
+
+class StaticBackend(TranscriptionBackend):
+    name = "static"
+
+    ## @param text Döndürülecek metin veya AudioData alıp metin döndüren fonksiyon
+    #  (None ise SES_STATIC_TRANSCRIPT)
+    def __init__(self, text=None):
+        self.text = os.environ.get("SES_STATIC_TRANSCRIPT", "") if text is None else text
+
+    def transcribe(self, audio_data):
+        text = self.text(audio_data) if callable(self.text) else self.text
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+BACKENDS = {backend.name: backend for backend in (GoogleBackend, SphinxBackend, StaticBackend)}
+
+
+## Adı verilen (veya SES_TRANSCRIBER ile seçilen) arka ucu oluşturur
+def get_backend(name=None):
+    name = name or os.environ.get("SES_TRANSCRIBER", "google")
+    if name not in BACKENDS:
+        raise ValueError(f"Bilinmeyen konuşma tanıma arka ucu: {name}")
+    return BACKENDS[name]()
+
+
+class TranscriptionExecutor:
+    ## @param backend TranscriptionBackend nesnesi
+    #  @param max_workers Eşzamanlı en fazla konuşma tanıma isteği
+    #  @param timeout Sonuç için varsayılan bekleme süresi (saniye)
+    def __init__(self, backend, max_workers=2, timeout=DEFAULT_TIMEOUT):
+        self.timeout = timeout
+        # future.cancel() çalışmakta olan çağrıyı durduramaz; zaman aşımına uğrayan bir ağ isteği
+        # havuzdaki iş parçacığını bırakmadığı için arka ucun kendi süre sınırı beklemeden uzun olamaz.
+        # Çağıranın nesnesi değiştirilmez; sınır, yürütücüye ait bir kopyaya uygulanır.
+        # Süre sınırı olmayan arka uçlarda (sphinx) havuz terk edilen çağrılar için boyutlandırılmalıdır.
+        if getattr(backend, 'operation_timeout', None) is not None and backend.operation_timeout > timeout:
+            backend = copy.copy(backend)
+            backend.operation_timeout = timeout
+        self.backend = backend
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="transcribe")
+
+    ## Konuşma tanımayı arka planda başlatır
+    #  (çağıranın bağlamı taşınır; süre, isteğin zamanlama kaydına eklenir)
+    def submit(self, audio_data):
+        return self._executor.submit(contextvars.copy_context().run, self._transcribe, audio_data)
+
+    def _transcribe(self, audio_data):
+        with span("transcription"):
+            return self.backend.transcribe(audio_data)
+
+    ## Sonucu bekler; süre dolarsa TranscriptionTimeout fırlatır
+    def result(self, future, timeout=None):
+        try:
+            with span("transcription.wait"):
+                return future.result(self.timeout if timeout is None else timeout)
+        except FutureTimeoutError:
+            # Yalnızca henüz başlamamış çağrıyı iptal eder; çalışan çağrı operation_timeout ile sonlanır
+            future.cancel()
+            raise TranscriptionTimeout()
+
+    ## Konuşma tanımayı başlatır ve sonucu bekler
+    def transcribe(self, audio_data, timeout=None):
+        return self.result(self.submit(audio_data), timeout)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,39 +1,69 @@
+import contextlib
+import os
 import streamlit as st
-import joblib
 import numpy as np
-import librosa
 import speech_recognition as sr
-from sklearn.preprocessing import StandardScaler
-import matplotlib.pyplot as plt
-from textblob import TextBlob
-from transformers import pipeline
+import model_registry
+import instrumentation
+from instrumentation import span
+from audio_features import FeatureSpec, artifact_feature_params
+from decoded_audio import DecodedAudio
+from enrollment import enrollment_path
+from transcription import TranscriptionTimeout
+from streaming import MicrophoneSource, StreamingRecognizer
+from inference_service import ServiceClient, ServiceError
 
-# Model ve scaler dosyasını yükle
-model_tuple = joblib.load('VoiceRecognizeModel.joblib')
-svc_model = model_tuple[0]
-scaler = model_tuple[1]
+# SES_SERVICE_URL verilirse arayüz, çıkarım servisinin (inference_service.py) ince istemcisidir:
+# modeller bu süreçte yüklenmez; tanıma, konuşma tanıma, duygu analizi ve kayıt servise gider.
+service = ServiceClient(os.environ["SES_SERVICE_URL"]) if os.environ.get("SES_SERVICE_URL") else None
 
-# Transformers duygu analizi modeli
-emotion_classifier = pipeline("text-classification", model="bhadresh-savani/distilbert-base-uncased-emotion")
+if service is None:
+    # Model ve scaler (süreç başına bir kez yüklenir, yeniden çalıştırmalarda önbellekten gelir)
+    speaker_artifact = model_registry.get("speaker_model")
+    svc_model, scaler = speaker_artifact[:2]
+    # Tüm sesler modelin eğitildiği kanonik orana yeniden örneklenir ve
+    # öznitelikler modelle birlikte kaydedilen tanımla çıkarılır
+    MODEL_SAMPLE_RATE = artifact_feature_params(speaker_artifact)['sample_rate']
+    MODEL_SPEC = FeatureSpec.from_params(artifact_feature_params(speaker_artifact))
 
-# Gürültü azaltma fonksiyonu
-def reduce_noise(audio, sr):
-    return librosa.effects.remix(audio, intervals=librosa.effects.split(audio, top_db=30))
+# Tanıma sonucunda gösterilen en benzer kayıtlı konuşmacı sayısı
+TOP_MATCHES = 3
 
-# Öznitelik çıkarma fonksiyonu
-def extract_features_from_audio(audio, sample_rate):
-    try:
-        audio = reduce_noise(audio, sample_rate)
-        mfccs = librosa.feature.mfcc(y=audio, sr=sample_rate, n_mfcc=10)
-        mfccs_mean = np.mean(mfccs.T, axis=0)
-        return mfccs_mean
-    except Exception as e:
-        print("Error encountered while extracting features from audio")
-        return None
+# Konuşmacı tanıma: varsayılan olarak model dosyasındaki sınıflandırıcı kullanılır; sonradan kaydedilen
+# konuşmacılar kayıt deposundan denetlenir. SES_SPEAKER_BACKEND=index ile tüm tanıma depodan kurulan
+# vektörize konuşmacı indeksine geçer. Depo dosyası değiştiğinde indeks yeniden kurulur.
+# Dönüş: (tahmin, karar skorları, en benzer top_k kayıtlı konuşmacı); top_k=0 ise benzerler aranmaz
+def identify_speaker(features, top_k=TOP_MATCHES):
+    threshold = st.session_state.get("unknown_threshold") or None
+    if service is not None:
+        with span("service.identify"):
+            result = service.identify_features(features, threshold, top=top_k or None)
+        return _service_identification(result)
+    identifier = model_registry.speaker_identifier()
+    with span(f"identify.{identifier.backend}"):
+        prediction, decision_function, _ = identifier.identify(features, threshold=threshold)
+        matches = identifier.search(features, top_k=top_k) if top_k else []
+    return prediction, decision_function, matches
+
+# Servisin /identify yanıtından (tahmin, karar skorları, en benzerler)
+def _service_identification(result):
+    return (np.array([result['speaker']]), np.array(list(result['scores'].values())),
+            [tuple(match) for match in result.get('matches', [])])
+
+# En benzer kayıtlı konuşmacıları listeler (tanıma sonucundan, ek istek yapmadan)
+def show_top_matches(matches):
+    if len(matches) > 1:
+        st.write("En Benzer Konuşmacılar: " + ", ".join(f"{label} ({score:.2f})" for label, score in matches))
 
 # Duygu analizi fonksiyonları
 def analyze_emotions_with_transformers(text):
-    results = emotion_classifier(text, return_all_scores=True)[0]
+    # Transformers duygu analizi modeli (ilk çağrıda yüklenir; eşzamanlı istekler toplu işlenir,
+    # aynı metnin tekrar analizi önbellekten gelir)
+    if service is not None:
+        with span("service.emotion"):
+            return service.emotion(text)
+    with span("emotion"):
+        results = model_registry.get("emotion_batcher").classify(text)
     percentages = {result['label']: result['score'] * 100 for result in results}
     return percentages
 
@@ -41,90 +71,190 @@ def analyze_emotions_with_transformers(text):
 def plot_histogram(features, label):
     st.bar_chart(features)
 
-# Mel spektrogramı çizim fonksiyonu
-def plot_mel_spectrogram(audio, sr, label):
-    S = librosa.feature.melspectrogram(y=audio, sr=sr, n_mels=128)
-    S_DB = librosa.power_to_db(S, ref=np.max)
-    fig, ax = plt.subplots()
-    img = librosa.display.specshow(S_DB, sr=sr, x_axis='time', y_axis='mel', ax=ax)
-    fig.colorbar(img, ax=ax, format='%+2.0f dB')
-    ax.set(title=f"Mel-Frequency Spectrogram for {label}")
-    st.pyplot(fig)
-
-# Ses dosyasını metne dönüştürme fonksiyonu
-def transcribe_speech(audio_file):
-    recognizer = sr.Recognizer()
-    with sr.AudioFile(audio_file) as source:
-        audio_data = recognizer.record(source)
-        try:
-            text = recognizer.recognize_google(audio_data, language='tr-TR')
-            return text
-        except sr.UnknownValueError:
-            st.error("Google Web Speech herhangi bir şey anlamadı")
-        except sr.RequestError as e:
-            st.error(f"Google Web Speech hizmetinden sonuç alınamadı; {e}")
+# Mel spektrogramı çizim fonksiyonu (öznitelik çıkarırken hesaplanan analiz nesnesini kullanır)
+def plot_mel_spectrogram(analysis, label):
+    # İstemci modunda spektral analiz servistedir
+    if analysis is None:
+        return
+    import librosa.display
+    import matplotlib.pyplot as plt
+
+    with span("spectrogram"):
+        S_DB = analysis.mel_db()
+        fig, ax = plt.subplots()
+        img = librosa.display.specshow(S_DB, sr=analysis.sample_rate, hop_length=analysis.hop_length,
+                                       x_axis='time', y_axis='mel', ax=ax)
+        fig.colorbar(img, ax=ax, format='%+2.0f dB')
+        ax.set(title=f"Mel-Frequency Spectrogram for {label}")
+        st.pyplot(fig)
+
+# Konuşma tanımaya gönderilen sesin örnekleme oranı
+TRANSCRIPTION_SAMPLE_RATE = 16000
+
+# Çözülmüş sesi metne dönüştürmeyi arka planda başlatır (arka uç SES_TRANSCRIBER ile seçilir)
+def start_transcription(decoded):
+    return model_registry.get("transcriber").submit(decoded.audio_data(TRANSCRIPTION_SAMPLE_RATE))
+
+# Arka planda çalışan konuşma tanımanın sonucunu bekler; zaman aşımında sayfa beklemez
+def transcription_text(text_future):
+    if text_future is None:
+        return ""
+    try:
+        return model_registry.get("transcriber").result(text_future)
+    except sr.UnknownValueError:
+        st.error("Konuşma tanıma herhangi bir şey anlamadı")
+    except sr.RequestError as e:
+        st.error(f"Konuşma tanıma hizmetinden sonuç alınamadı; {e}")
+    except TranscriptionTimeout:
+        st.error("Konuşma tanıma zaman aşımına uğradı")
     return ""
 
 # Mikrofondan ses kaydetme fonksiyonu
+# Konuşma tanıma arka planda çalışırken öznitelikler çıkarılır
+# (öznitelikler, analiz, metin, servis modunda tanıma sonucu; yerelde tanıma sonucu None)
 def recognize_from_microphone():
     recognizer = sr.Recognizer()
     with sr.Microphone() as source:
         st.write("Konuşmanızı bekliyorum...")
-        audio_data = recognizer.listen(source)
-        try:
-            text = recognizer.recognize_google(audio_data, language='tr-TR')
-            st.write("Mikrofon Metin:", text)
-
-            # Anlık ses verisini işle
-            audio = np.frombuffer(audio_data.get_wav_data(), np.int16).astype(np.float32)
-            audio = librosa.util.buf_to_float(audio)
-            sample_rate = 16000  # Mikrofon örnekleme oranı (standart olarak 16000 Hz)
-
-            return audio, sample_rate, text
-        except sr.UnknownValueError:
-            st.write("Google Web Speech herhangi bir şey anlamadı")
-        except sr.RequestError as e:
-            st.write(f"Google Web Speech hizmetinden sonuç alınamadı; {e}")
-    return None, None, ""
+        with span("listen"):
+            audio_data = recognizer.listen(source)
+
+    if service is not None:
+        # Tek istek: öznitelikler, metin ve tanıma sonucu birlikte döner; sonuç yeniden kullanılır
+        result = _service_call(service.identify, audio_data.get_wav_data(), transcribe=True, features=True,
+                               threshold=st.session_state.get("unknown_threshold") or None, top=TOP_MATCHES)
+        if result is None:
+            return None, None, "", None
+        if result['text']:
+            st.write("Mikrofon Metin:", result['text'])
+        return np.array(result['features']), None, result['text'], _service_identification(result)
+
+    # Anlık ses verisi bir kez çözülür; konuşma tanıma özgün AudioData nesnesini kullanır
+    decoded = DecodedAudio.from_audio_data(audio_data)
+    text_future = model_registry.get("transcriber").submit(audio_data)
+    features, analysis = decoded.features_and_analysis(MODEL_SAMPLE_RATE, MODEL_SPEC)
+
+    text = transcription_text(text_future)
+    if text:
+        st.write("Mikrofon Metin:", text)
+    return features, analysis, text, None
+
+# Mikrofondan akışlı (canlı) konuşmacı tanıma fonksiyonu
+def recognize_from_microphone_streaming(duration):
+    if service is not None:
+        st.warning("Canlı tanıma yalnızca yerel modda (SES_SERVICE_URL olmadan) kullanılabilir.")
+        return ""
+    source = MicrophoneSource(sample_rate=MODEL_SAMPLE_RATE, duration=duration)
+    recognizer = StreamingRecognizer(lambda features: identify_speaker(features.reshape(1, -1), top_k=0)[0][0],
+                                     source.sample_rate, spec=MODEL_SPEC)
+    placeholder = st.empty()
+    prediction = ""
+    try:
+        for timestamp, prediction, latency in recognizer.run(source):
+            placeholder.write(f"[{timestamp:.1f} sn] Tahmin Edilen Konuşmacı: {prediction}")
+    finally:
+        source.close()
+    return prediction
 
 # Ses dosyasını model ile tahmin etme fonksiyonu
 def predict_from_file(uploaded_file):
-    audio_data, sample_rate = librosa.load(uploaded_file, sr=None)
-    features = extract_features_from_audio(audio_data, sample_rate)
+    if service is not None:
+        return predict_from_file_with_service(uploaded_file)
+    # Dosya bir kez, doğrudan modelin oranında çözülür; konuşma tanıma arka planda başlar,
+    # konuşmacı tanıma ile paralel ilerler
+    decoded = DecodedAudio.from_file(uploaded_file, MODEL_SAMPLE_RATE)
+    text_future = start_transcription(decoded)
+    features, analysis = decoded.features_and_analysis(spec=MODEL_SPEC)
     if features is not None:
         features = np.array(features).reshape(1, -1)
-        features_scaled = scaler.transform(features)
-        prediction = svc_model.predict(features_scaled)
+        prediction, decision_function, matches = identify_speaker(features)
         st.write(f"Tahmin Edilen Konuşmacı: {prediction[0]}")
-        # FM ve ACC değerlerini hesapla ve yazdır
-        decision_function = svc_model.decision_function(features_scaled)
+        # FM değerini hesapla ve yazdır
         fm = np.max(decision_function) - np.min(decision_function)
-        acc = np.mean(svc_model.predict(features_scaled) == prediction)
         st.write(f"FM Değeri: {fm}")
-        st.write(f"ACC Değeri: {acc}")
+        show_top_matches(matches)
 
         plot_histogram(features.flatten(), prediction[0])
-        plot_mel_spectrogram(audio_data, sample_rate, prediction[0])
+        plot_mel_spectrogram(analysis, prediction[0])
 
         # Duygu analizi
-        text = transcribe_speech(uploaded_file)
+        text = transcription_text(text_future)
         if text:
             emotion_percentages = analyze_emotions_with_transformers(text)
             st.write("Duygu Yüzdeleri:")
             for emotion, percentage in emotion_percentages.items():
                 st.write(f"{emotion}: {percentage:.2f}%")
 
-        return audio_data, sample_rate, prediction[0], text
+        return features.flatten(), analysis, prediction[0], text
     return None, None, "", ""
 
+# Servis çağrısı; hata (ör. aşırı yükte 503) sayfada gösterilir
+def _service_call(method, *args, **kwargs):
+    try:
+        with span(f"service.{method.__name__}"):
+            return method(*args, **kwargs)
+    except ServiceError as e:
+        if e.status == 503:
+            st.warning("Servis şu anda yoğun, lütfen biraz sonra tekrar deneyin.")
+        else:
+            st.error(f"Servis isteği başarısız: {e.message}")
+    return None
+
+# Dosyayı servise tek istekte gönderir: konuşmacı, skorlar, metin ve duygular birlikte döner
+def predict_from_file_with_service(uploaded_file):
+    result = _service_call(service.identify, uploaded_file.getvalue(), transcribe=True, emotion=True,
+                           features=True, threshold=st.session_state.get("unknown_threshold") or None,
+                           top=TOP_MATCHES)
+    if result is None:
+        return None, None, "", ""
+    prediction, decision_function, matches = _service_identification(result)
+    prediction = prediction[0]
+    st.write(f"Tahmin Edilen Konuşmacı: {prediction}")
+    st.write(f"FM Değeri: {np.max(decision_function) - np.min(decision_function)}")
+    show_top_matches(matches)
+    features = np.array(result['features'])
+    plot_histogram(features, prediction)
+    if result.get('emotions'):
+        st.write("Duygu Yüzdeleri:")
+        for emotion, percentage in result['emotions'].items():
+            st.write(f"{emotion}: {percentage:.2f}%")
+    return features, None, prediction, result.get('text', "")
+
+# İsteğin aşama sürelerini toplar; kenar çubuğundaki zamanlama paneli son isteği gösterir
+@contextlib.contextmanager
+def timed_request(name):
+    with instrumentation.trace(name) as spans:
+        yield
+    st.session_state.timings = (name, spans)
+
+# Zamanlama paneli (ölçüm kapalıyken yalnızca açıklama gösterir)
+def show_timing_panel():
+    with st.sidebar.expander("Zamanlama", expanded=False):
+        if not instrumentation.is_enabled():
+            st.caption("Ölçüm kapalı.")
+            return
+        timings = st.session_state.get("timings")
+        if not timings:
+            st.caption("Henüz ölçülmüş bir istek yok.")
+            return
+        name, spans = timings
+        st.caption(f"Son istek: {name}")
+        st.code("\n".join(instrumentation.format_trace(spans)))
+        counters = instrumentation.snapshot()['counters']
+        if counters:
+            st.caption(", ".join(f"{event}: {value}" for event, value in sorted(counters.items())))
+
 # Menü kısmı
 st.sidebar.header("Menu")
 page = st.sidebar.radio("Sayfalar", ["Ses Tanıma", "Ses Eğitimi", "Duygu Analizi"])
+st.sidebar.slider("Bilinmeyen konuşmacı eşiği (0 = kapalı, yalnızca indeks arka ucu)", 0.0, 1.0, 0.0, key="unknown_threshold")
+# Ölçüm süreç genelinde açılır/kapanır (varsayılan: SES_TIMING)
+instrumentation.enable(st.sidebar.checkbox("Aşama sürelerini ölç", value=instrumentation.is_enabled()))
 
 # Ses Tanıma Sayfası
 if page == "Ses Tanıma":
     st.header("Ses Tanıma")
-    option = st.selectbox("Bir seçenek belirleyin:", ["Bilgisayardan Ses Seç", "Mikrofondan Ses Al"])
+    option = st.selectbox("Bir seçenek belirleyin:", ["Bilgisayardan Ses Seç", "Mikrofondan Ses Al", "Mikrofondan Canlı Tanıma"])
 
     audio_data = None
     sample_rate = None
@@ -134,7 +264,8 @@ if page == "Ses Tanıma":
         uploaded_file = st.file_uploader("Bir ses dosyası seçin", type=["wav", "mp3", "m4a"])
         if uploaded_file is not None:
             if st.button("Tahmin Et"):
-                audio_data, sample_rate, prediction, text = predict_from_file(uploaded_file)
+                with timed_request("Dosyadan tanıma"):
+                    features, analysis, prediction, text = predict_from_file(uploaded_file)
                 if text:
                     st.write("Metin:", text)
                     word_count = len(text.split())
@@ -144,35 +275,39 @@ if page == "Ses Tanıma":
 
     elif option == "Mikrofondan Ses Al":
         if st.button("Kaydı Al"):
-            audio_data, sample_rate, text = recognize_from_microphone()
-            if text:
-                st.write("Metin:", text)
-                word_count = len(text.split())
-                st.write("Kelime Sayısı:", word_count)
-                features = extract_features_from_audio(audio_data, sample_rate)
-                if features is not None:
-                    features = np.array(features).reshape(1, -1)
-                    features_scaled = scaler.transform(features)
-                    prediction = svc_model.predict(features_scaled)
-                    st.write(f"Tahmin Edilen Konuşmacı: {prediction[0]}")
-
-                    # FM ve ACC değerlerini hesapla ve yazdır
-                    decision_function = svc_model.decision_function(features_scaled)
-                    fm = np.max(decision_function) - np.min(decision_function)
-                    acc = np.mean(svc_model.predict(features_scaled) == prediction)
-                    st.write(f"FM Değeri: {fm}")
-                    st.write(f"ACC Değeri: {acc}")
-
-                    plot_histogram(features.flatten(), "Mikrofon Kaydı")
-                    plot_mel_spectrogram(audio_data, sample_rate, "Mikrofon Kaydı")
-
-                    # Duygu analizi
-                    emotion_percentages = analyze_emotions_with_transformers(text)
-                    st.write("Duygu Yüzdeleri:")
-                    for emotion, percentage in emotion_percentages.items():
-                        st.write(f"{emotion}: {percentage:.2f}%")
-            else:
-                st.write("Metin:", "Ses metne dönüştürülemedi.")
+            with timed_request("Mikrofondan tanıma"):
+                features, analysis, text, identified = recognize_from_microphone()
+                if text:
+                    st.write("Metin:", text)
+                    word_count = len(text.split())
+                    st.write("Kelime Sayısı:", word_count)
+                    if features is not None:
+                        features = np.array(features).reshape(1, -1)
+                        # Servis modunda kayıt isteğinin tanıma sonucu kullanılır, yeniden istek yapılmaz
+                        prediction, decision_function, matches = identified or identify_speaker(features)
+                        st.write(f"Tahmin Edilen Konuşmacı: {prediction[0]}")
+
+                        # FM değerini hesapla ve yazdır
+                        fm = np.max(decision_function) - np.min(decision_function)
+                        st.write(f"FM Değeri: {fm}")
+                        show_top_matches(matches)
+
+                        plot_histogram(features.flatten(), "Mikrofon Kaydı")
+                        plot_mel_spectrogram(analysis, "Mikrofon Kaydı")
+
+                        # Duygu analizi
+                        emotion_percentages = analyze_emotions_with_transformers(text)
+                        st.write("Duygu Yüzdeleri:")
+                        for emotion, percentage in emotion_percentages.items():
+                            st.write(f"{emotion}: {percentage:.2f}%")
+                else:
+                    st.write("Metin:", "Ses metne dönüştürülemedi.")
+
+    elif option == "Mikrofondan Canlı Tanıma":
+        duration = st.slider("Dinleme süresi (saniye)", 1, 60, 10)
+        if st.button("Dinlemeye Başla"):
+            with timed_request("Canlı tanıma"):
+                recognize_from_microphone_streaming(duration)
 
 # Ses Eğitimi Sayfası
 elif page == "Ses Eğitimi":
@@ -181,12 +316,19 @@ elif page == "Ses Eğitimi":
 
     name = st.text_input("Ses Sahibinin İsmi:")
 
-    def send_to_training(audio_data, sample_rate, name):
-        features = extract_features_from_audio(audio_data, sample_rate)
+    def send_to_training(features, analysis, name):
         if features is not None:
+            # Konuşmacıyı kayıt deposuna ekle; tanıma bir sonraki istekte yeni konuşmacıyı görür
+            if service is not None:
+                if _service_call(service.enroll_features, name, features) is None:
+                    return
+            else:
+                store = model_registry.get("enrollment")
+                store.add(name, features)
+                store.save(enrollment_path(model_registry.MODEL_PATH))
             st.write(f"Ses sahibinin ismi: {name}")
             plot_histogram(features, name)
-            plot_mel_spectrogram(audio_data, sample_rate, name)
+            plot_mel_spectrogram(analysis, name)
             st.success("Ses eğitime başarıyla yollandı")
         else:
             st.warning("Özellik çıkarılamadı. Lütfen geçerli bir ses dosyası seçin.")
@@ -199,8 +341,9 @@ elif page == "Ses Eğitimi":
         if uploaded_file is not None:
             if st.button("Eğitime Yolla"):
                 if name:
-                    audio_data, sample_rate, prediction, text = predict_from_file(uploaded_file)
-                    send_to_training(audio_data, sample_rate, name)
+                    with timed_request("Eğitime yollama"):
+                        features, analysis, prediction, text = predict_from_file(uploaded_file)
+                        send_to_training(features, analysis, name)
                 else:
                     st.warning("Lütfen bir isim giriniz.")
         else:
@@ -208,23 +351,23 @@ elif page == "Ses Eğitimi":
 
     elif option == "Mikrofondan Ses Al":
         if st.button("Kaydı Al"):
-            audio_data, sample_rate, text = recognize_from_microphone()
+            with timed_request("Mikrofon kaydı"):
+                features, analysis, text, _ = recognize_from_microphone()
             if text:
                 st.write("Metin:", text)
                 word_count = len(text.split())
                 st.write("Kelime Sayısı:", word_count)
-                features = extract_features_from_audio(audio_data, sample_rate)
                 if features is not None:
-                    st.session_state.audio_data = audio_data
-                    st.session_state.sample_rate = sample_rate
+                    st.session_state.features = features
+                    st.session_state.analysis = analysis
                     st.session_state.text = text
                     plot_histogram(features, "Mikrofon Kaydı")
-                    plot_mel_spectrogram(audio_data, sample_rate, "Mikrofon Kaydı")
+                    plot_mel_spectrogram(analysis, "Mikrofon Kaydı")
             else:
                 st.write("Metin:", "Ses metne dönüştürülemedi.")
         if st.button("Eğitime Yolla"):
-            if name and 'audio_data' in st.session_state and st.session_state.audio_data is not None:
-                send_to_training(st.session_state.audio_data, st.session_state.sample_rate, name)
+            if name and 'features' in st.session_state and st.session_state.features is not None:
+                send_to_training(st.session_state.features, st.session_state.analysis, name)
             else:
                 if not name:
                     st.warning("Lütfen bir isim giriniz.")
@@ -237,7 +380,10 @@ elif page == "Duygu Analizi":
     text = st.text_area("Metin Girin:", placeholder="Bir cümle veya paragraf girin...")
     if text:
         st.subheader("Transformers ile Analiz")
-        emotion_percentages = analyze_emotions_with_transformers(text)
+        with timed_request("Duygu analizi"):
+            emotion_percentages = analyze_emotions_with_transformers(text)
         st.write("Duygu Yüzdeleri:")
         for emotion, percentage in emotion_percentages.items():
             st.write(f"{emotion}: {percentage:.2f}%")
+
+show_timing_panel()